@@ -8,7 +8,9 @@ This file centralizes:
 - Paths
 - Feature toggles
 
-Nothing in here should contain business logic.
+Nothing in here should contain business logic. Importing it only
+reads the environment: directories are created by the stores that
+write to them.
 """
 
 import os
@@ -19,7 +21,8 @@ from dotenv import load_dotenv
 # Environment
 # -------------------------------------------------------------------
 
-load_dotenv()
+# The project .env, without find_dotenv walking up the directory tree
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
 PROJECT_NAME = "Sentinel Media AI"
 ENVIRONMENT = os.getenv("ENVIRONMENT", "local")
@@ -29,12 +32,14 @@ ENVIRONMENT = os.getenv("ENVIRONMENT", "local")
 # -------------------------------------------------------------------
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = BASE_DIR / "data"
+# Runtime state (databases, caches, media); point smoke runs at a temp dir
+DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
 MEDIA_DIR = DATA_DIR / "media"
 TMP_DIR = DATA_DIR / "tmp"
-
-MEDIA_DIR.mkdir(parents=True, exist_ok=True)
-TMP_DIR.mkdir(parents=True, exist_ok=True)
+SUMMARY_DIR = DATA_DIR / "summaries"
+EMBEDDING_CACHE_DIR = DATA_DIR / "embeddings"
+VECTOR_DIR = DATA_DIR / "vectors"
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
 
 # -------------------------------------------------------------------
 # OpenAI / LLM Configuration
@@ -50,6 +55,15 @@ WHISPER_MODEL = os.getenv("WHISPER_MODEL", "medium")
 # Vision model (used by VideoAgent / multimodal reasoning)
 VISION_MODEL = os.getenv("VISION_MODEL", "gpt-5-mini")
 
+# Constrain agent responses to the JSON schema of their pydantic models
+STRUCTURED_OUTPUTS_ENABLED = (
+    os.getenv("STRUCTURED_OUTPUTS_ENABLED", "true").lower() == "true"
+)
+
+# Send a per-media prompt_cache_key so agents sharing a transcript
+# prefix hit the same provider-side prompt cache
+PROMPT_CACHE_ROUTING = os.getenv("PROMPT_CACHE_ROUTING", "true").lower() == "true"
+
 # -------------------------------------------------------------------
 # Chunking Configuration
 # -------------------------------------------------------------------
@@ -63,6 +77,25 @@ FRAME_SAMPLE_INTERVAL_SECONDS = int(
     os.getenv("FRAME_SAMPLE_INTERVAL_SECONDS", 5)
 )
 
+# -------------------------------------------------------------------
+# Storage Configuration
+# -------------------------------------------------------------------
+
+# Storage backend: "elasticsearch", "sqlite", or "auto"
+# (Elasticsearch when ELASTICSEARCH_URL is set, else SQLite/FTS5)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "auto")
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR / 'sentinel.db'}")
+SQLITE_DB_PATH = DATABASE_URL.removeprefix("sqlite:///")
+STORAGE_BATCH_SIZE = int(os.getenv("STORAGE_BATCH_SIZE", 500))
+
+# Chat session store: "sqlite", "redis" or "memory"
+SESSION_STORE = os.getenv("SESSION_STORE", "sqlite")
+# Any Redis-protocol server (Redis, Valkey, KeyDB, ...)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 16))
+# Idle chat sessions expire after this many seconds (0 = never)
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 7 * 24 * 3600))
+
 # -------------------------------------------------------------------
 # Elasticsearch Configuration
 # -------------------------------------------------------------------
@@ -72,9 +105,11 @@ ELASTICSEARCH_USER = os.getenv("ELASTICSEARCH_USER")
 ELASTICSEARCH_PASSWORD = os.getenv("ELASTICSEARCH_PASSWORD")
 
 # Index names
+MEDIA_RECORDS_INDEX = "sentinel_media_records"
 MEDIA_TRANSCRIPTS_INDEX = "sentinel_media_transcripts"
 MEDIA_SCENES_INDEX = "sentinel_media_scenes"
 MEDIA_INSIGHTS_INDEX = "sentinel_media_insights"
+MEDIA_VECTORS_INDEX = "sentinel_media_vectors"
 
 # -------------------------------------------------------------------
 # Agent Configuration
@@ -83,11 +118,85 @@ MEDIA_INSIGHTS_INDEX = "sentinel_media_insights"
 # Used for orchestration & logging
 AGENT_TIMEOUT_SECONDS = int(os.getenv("AGENT_TIMEOUT_SECONDS", 120))
 
+# Async orchestration: bounded pool for CPU-bound stages (Whisper,
+# frame work) and max concurrent media pipelines per event loop
+CPU_STAGE_WORKERS = int(os.getenv("CPU_STAGE_WORKERS", 2))
+ASYNC_PIPELINE_CONCURRENCY = int(os.getenv("ASYNC_PIPELINE_CONCURRENCY", 100))
+
+# Batch runs: worker processes per heavyweight stage, concurrent
+# LLM pipelines, and max items waiting between two stages
+BATCH_EXTRACT_WORKERS = int(os.getenv("BATCH_EXTRACT_WORKERS", 2))
+BATCH_SAMPLE_WORKERS = int(os.getenv("BATCH_SAMPLE_WORKERS", 2))
+BATCH_WHISPER_WORKERS = int(os.getenv("BATCH_WHISPER_WORKERS", 2))
+BATCH_AGENT_CONCURRENCY = int(os.getenv("BATCH_AGENT_CONCURRENCY", 16))
+BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", 4))
+
+# Background jobs: durable SQLite queue drained by worker processes
+JOB_QUEUE_DB_PATH = os.getenv("JOB_QUEUE_DB_PATH", str(DATA_DIR / "jobs.db"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", 5))
+# A running job whose worker missed heartbeats this long is retried
+JOB_HEARTBEAT_TIMEOUT_SECONDS = float(os.getenv("JOB_HEARTBEAT_TIMEOUT_SECONDS", 60))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 1))
+# Worker processes the Streamlit app starts itself (0 = run them separately)
+JOB_EMBEDDED_WORKERS = int(os.getenv("JOB_EMBEDDED_WORKERS", 1))
+
+# Scheduling: jobs without a duration estimate are costed at this many
+# seconds; every second waited lowers a job's cost by JOB_SJF_AGING_RATE
+# seconds, so long jobs still get through
+JOB_DEFAULT_TENANT = os.getenv("JOB_DEFAULT_TENANT", "default")
+JOB_DEFAULT_EXPECTED_SECONDS = float(os.getenv("JOB_DEFAULT_EXPECTED_SECONDS", 600))
+JOB_SJF_AGING_RATE = float(os.getenv("JOB_SJF_AGING_RATE", 1.0))
+# Max concurrently running jobs per tenant (0 = no cap)
+JOB_TENANT_MAX_RUNNING = int(os.getenv("JOB_TENANT_MAX_RUNNING", 0))
+# LLM tokens a tenant's jobs may use per rolling hour before its queued
+# jobs are held back (0 = no cap); below the cap, tenants that used
+# fewer tokens recently are served first
+JOB_TENANT_LLM_TOKENS_PER_HOUR = int(os.getenv("JOB_TENANT_LLM_TOKENS_PER_HOUR", 0))
+
+# Pipeline execution inside a job: "local" runs every stage in the job
+# worker, "distributed" publishes stage work items to the stage broker
+PIPELINE_EXECUTION = os.getenv("PIPELINE_EXECUTION", "local")
+# Stage broker: "local" (in-process stand-in, single node) or "redis"
+STAGE_BROKER = os.getenv("STAGE_BROKER", "local")
+# A leased work item not renewed for this long goes to another worker
+STAGE_LEASE_SECONDS = float(os.getenv("STAGE_LEASE_SECONDS", 60))
+STAGE_MAX_ATTEMPTS = int(os.getenv("STAGE_MAX_ATTEMPTS", 3))
+STAGE_POLL_SECONDS = float(os.getenv("STAGE_POLL_SECONDS", 0.5))
+# Stage worker threads a job worker starts for the local broker
+STAGE_LOCAL_WORKERS = int(os.getenv("STAGE_LOCAL_WORKERS", 2))
+# Work item size: audio seconds per transcription segment,
+# sampled frames per vision window
+TRANSCRIBE_SEGMENT_SECONDS = int(os.getenv("TRANSCRIBE_SEGMENT_SECONDS", 600))
+FRAME_WINDOW_SIZE = int(os.getenv("FRAME_WINDOW_SIZE", 12))
+# Intermediate artifacts shared by coordinator and stage workers;
+# every node must mount the same directory
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", DATA_DIR / "artifacts"))
+
 # Toggle agents on/off easily
 ENABLE_VIDEO_AGENT = True
 ENABLE_EMOTION_AGENT = True
 ENABLE_RISK_AGENT = True
 
+# Fused mode: Emotion + Tagging + Risk in a single call for
+# transcripts up to FUSED_TEXT_MAX_TOKENS tokens. The call runs before
+# ReasoningAgent (which needs its emotion and tagging output), so the
+# fused risk assessment is made without the reasoning conclusions that
+# the separate RiskAgent is given
+ENABLE_FUSED_TEXT_AGENT = os.getenv("ENABLE_FUSED_TEXT_AGENT", "false").lower() == "true"
+FUSED_TEXT_MAX_TOKENS = int(os.getenv("FUSED_TEXT_MAX_TOKENS", 12000))
+
+# Map-reduce analysis of long transcripts
+MAP_REDUCE_WINDOW_TOKENS = int(os.getenv("MAP_REDUCE_WINDOW_TOKENS", 3000))
+MAP_REDUCE_MAX_WORKERS = int(os.getenv("MAP_REDUCE_MAX_WORKERS", 4))
+
+# Hierarchical summary tree (windows per section summary)
+SUMMARY_SECTION_WINDOWS = int(os.getenv("SUMMARY_SECTION_WINDOWS", 4))
+
+# Incremental runs: reuse stored outputs whose input fingerprint
+# (upstream outputs, agent code, model, config) is unchanged
+ENABLE_INCREMENTAL_RUNS = os.getenv("ENABLE_INCREMENTAL_RUNS", "true").lower() == "true"
+
 # -------------------------------------------------------------------
 # RAG / Chat Configuration
 # -------------------------------------------------------------------
@@ -95,6 +204,58 @@ ENABLE_RISK_AGENT = True
 RAG_TOP_K = int(os.getenv("RAG_TOP_K", 6))
 MAX_CHAT_HISTORY = int(os.getenv("MAX_CHAT_HISTORY", 10))
 
+# Chat memory: recent turns are kept verbatim up to this many tokens,
+# older turns are folded into a rolling summary. The whole chat prompt
+# (history + retrieved context) is packed into CHAT_PROMPT_TOKEN_BUDGET.
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", 1500))
+CHAT_PROMPT_TOKEN_BUDGET = int(os.getenv("CHAT_PROMPT_TOKEN_BUDGET", 6000))
+
+# Per-media answer cache: exact match on the normalized question, plus
+# (optionally) embedding similarity >= ANSWER_CACHE_SIMILARITY
+ENABLE_ANSWER_CACHE = os.getenv("ENABLE_ANSWER_CACHE", "true").lower() == "true"
+ANSWER_CACHE_SEMANTIC = os.getenv("ANSWER_CACHE_SEMANTIC", "true").lower() == "true"
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", 0.95))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", 512))
+
+# Semantic retrieval: "openai" embeds with EMBEDDING_MODEL,
+# "hashing" is a deterministic offline stand-in
+ENABLE_SEMANTIC_RETRIEVAL = (
+    os.getenv("ENABLE_SEMANTIC_RETRIEVAL", "true").lower() == "true"
+)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+EMBEDDING_DIMS = int(os.getenv("EMBEDDING_DIMS", 1536))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 256))
+# Query vectors are kept in memory only (LRU), not in the on-disk
+# cache, which would otherwise grow with every question asked
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 1024))
+
+# Approximate kNN: HNSW candidates gathered per shard = top_k * factor
+KNN_NUM_CANDIDATES_FACTOR = int(os.getenv("KNN_NUM_CANDIDATES_FACTOR", 10))
+
+# Retrieval mode when Elasticsearch is available:
+# "hybrid" (BM25 + kNN fused with RRF, then MMR), "semantic" or "keyword"
+RAG_RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "hybrid")
+RAG_CANDIDATE_FACTOR = int(os.getenv("RAG_CANDIDATE_FACTOR", 4))
+RRF_K = int(os.getenv("RRF_K", 60))
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", 0.7))
+
+# Transcript chunks are merged into passages of ~N words for retrieval
+RAG_PASSAGE_WORDS = int(os.getenv("RAG_PASSAGE_WORDS", 120))
+
+# Local fallback indices (no Elasticsearch): BM25 parameters,
+# local vector index (exact below LOCAL_ANN_THRESHOLD passages,
+# HNSW above) and number of per-media indices kept in memory.
+# Exact search stays in the low milliseconds up to tens of thousands
+# of passages, while the pure-Python HNSW build takes minutes there
+LOCAL_ANN_THRESHOLD = int(os.getenv("LOCAL_ANN_THRESHOLD", 50000))
+BM25_K1 = float(os.getenv("BM25_K1", 1.5))
+BM25_B = float(os.getenv("BM25_B", 0.75))
+HNSW_M = int(os.getenv("HNSW_M", 16))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", 100))
+# recall@10 >= 0.9 against exact search on clustered embeddings
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", 160))
+RAG_INDEX_CACHE_SIZE = int(os.getenv("RAG_INDEX_CACHE_SIZE", 16))
+
 # -------------------------------------------------------------------
 # Logging
 # -------------------------------------------------------------------
@@ -10,12 +10,17 @@ Responsible for:
 This agent uses OpenAI Whisper via openai-whisper.
 """
 
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 import os
+import tempfile
+import threading
 
+import soundfile
 import whisper
 
 from src.agents.base_agent import BaseAgent
+from src.orchestration.executors import run_cpu_bound
 from src.schemas.agent_outputs import (
     AudioAnalysisOutput,
     TranscriptChunk,
@@ -37,6 +42,9 @@ class AudioAgent(BaseAgent):
         media_id: str,
         audio_path: str,
         config: dict | None = None,
+        whisper_model=None,
+        start_seconds: float = 0.0,
+        end_seconds: Optional[float] = None,
     ):
         super().__init__(
             agent_name="AudioAgent",
@@ -48,22 +56,43 @@ class AudioAgent(BaseAgent):
             raise ValueError(f"Invalid audio path: {audio_path}")
 
         self.audio_path = audio_path
+        self.whisper_model = whisper_model
+
+        # Transcribe only [start, end) of the file (one segment of a
+        # distributed transcription); timestamps stay absolute
+        self.start_seconds = start_seconds
+        self.end_seconds = end_seconds
+
+    def fingerprint_settings(self) -> dict:
+        return {
+            "whisper_model": WHISPER_MODEL,
+            "chunk_seconds": AUDIO_CHUNK_SECONDS,
+            "config": self.config,
+        }
 
     # ------------------------------------------------------------------
     # Core execution
     # ------------------------------------------------------------------
 
+    async def aexecute(self) -> AudioAnalysisOutput:
+        # Whisper is CPU/GPU-bound: run it on the bounded CPU executor
+        return await run_cpu_bound(self.execute)
+
     def execute(self) -> AudioAnalysisOutput:
         """
         Runs Whisper transcription and converts output
         into structured transcript chunks.
         """
 
-        model = whisper.load_model(WHISPER_MODEL)
+        if self.whisper_model is not None:
+            result = self._transcribe(self.whisper_model)
+        else:
+            # The process's cached model, one transcription at a time
+            with _process_whisper_lock:
+                result = self._transcribe(_process_whisper_model())
 
-        result = model.transcribe(self.audio_path)
-
-        if not result or not result.get("segments"):
+        # A silent stretch is fine inside a longer recording, not as all of it
+        if self.end_seconds is None and (not result or not result.get("segments")):
             raise RuntimeError(
                 "Whisper returned no transcription segments (audio may be silent or unsupported)"
             )
@@ -76,8 +105,8 @@ class AudioAgent(BaseAgent):
 
         for segment in segments:
             text = segment.get("text", "").strip()
-            start = float(segment.get("start", 0.0))
-            end = float(segment.get("end", 0.0))
+            start = float(segment.get("start", 0.0)) + self.start_seconds
+            end = float(segment.get("end", 0.0)) + self.start_seconds
 
             if not text:
                 continue
@@ -110,3 +139,71 @@ class AudioAgent(BaseAgent):
             transcript_chunks=transcript_chunks,
             full_transcript=full_transcript,
         )
+
+    def _transcribe(self, model) -> dict:
+        if self.end_seconds is None:
+            return model.transcribe(self.audio_path)
+        return self._transcribe_window(model)
+
+    def _transcribe_window(self, model) -> dict:
+        """
+        Cuts the window out of the audio file and transcribes it.
+        """
+        sample_rate = soundfile.info(self.audio_path).samplerate
+        samples, _ = soundfile.read(
+            self.audio_path,
+            start=int(self.start_seconds * sample_rate),
+            stop=int(self.end_seconds * sample_rate),
+        )
+        if len(samples) == 0:
+            return {"segments": []}
+
+        with tempfile.NamedTemporaryFile(suffix=".wav") as window:
+            soundfile.write(window.name, samples, sample_rate)
+            return model.transcribe(window.name)
+
+
+# ----------------------------------------------------------------------
+# Process-pool and stage-worker entry points
+# ----------------------------------------------------------------------
+
+_process_whisper_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _process_whisper_model():
+    # One model per process, shared by every AudioAgent without its
+    # own; Whisper models are not safe to share between concurrent
+    # transcriptions, hence _process_whisper_lock
+    return whisper.load_model(WHISPER_MODEL)
+
+
+def transcribe_audio(media_id: str, audio_path: str) -> str:
+    """
+    Runs AudioAgent in a worker process and returns its output
+    as JSON (agents themselves cannot be pickled).
+    """
+    agent = AudioAgent(
+        media_id=media_id,
+        audio_path=audio_path,
+    )
+    return agent.run().model_dump_json()
+
+
+def transcribe_window(
+    media_id: str,
+    audio_path: str,
+    start_seconds: float = 0.0,
+    end_seconds: Optional[float] = None,
+) -> AudioAnalysisOutput:
+    """
+    Transcribes one segment of a recording (the whole of it
+    without end_seconds) with the process's cached Whisper model.
+    """
+    agent = AudioAgent(
+        media_id=media_id,
+        audio_path=audio_path,
+        start_seconds=start_seconds,
+        end_seconds=end_seconds,
+    )
+    return agent.run()
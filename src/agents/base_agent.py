@@ -6,17 +6,32 @@ All agents MUST inherit from this class.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Type
 from datetime import datetime
+import asyncio
+import logging
+import threading
 import traceback
 import uuid
 
+from pydantic import BaseModel
+
+from src.agents.llm_client import get_async_client
+from src.agents.structured_output import response_format_for
 from src.schemas.agent_outputs import BaseAgentOutput
-from config.config import AGENT_TIMEOUT_SECONDS
+from config.config import (
+    AGENT_TIMEOUT_SECONDS,
+    PROMPT_CACHE_ROUTING,
+    MAP_REDUCE_WINDOW_TOKENS,
+    STRUCTURED_OUTPUTS_ENABLED,
+    TEXT_MODEL,
+)
 from typing import TypeVar
 
 T = TypeVar("T", bound=BaseAgentOutput)
 
+logger = logging.getLogger(__name__)
+
 
 class BaseAgent(ABC):
     """
@@ -29,6 +44,10 @@ class BaseAgent(ABC):
     - Return structured outputs only
     """
 
+    # Bump when behaviour changes outside the agent's own module
+    # (shared prompts, helpers), so incremental runs recompute it
+    version = "1"
+
     def __init__(
         self,
         agent_name: str,
@@ -44,6 +63,33 @@ class BaseAgent(ABC):
         self.started_at: Optional[datetime] = None
         self.finished_at: Optional[datetime] = None
 
+        # LLM token usage (map-reduce agents call from several threads)
+        self.llm_usage: Dict[str, int] = {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "completion_tokens": 0,
+        }
+        self._usage_lock = threading.Lock()
+
+    def fingerprint_settings(self) -> Dict[str, Any]:
+        """
+        Settings that affect this agent's output, hashed into its
+        incremental-run fingerprint. Agents using other models or
+        settings extend this.
+        """
+        return {
+            "model": TEXT_MODEL,
+            "structured_outputs": STRUCTURED_OUTPUTS_ENABLED,
+            "window_tokens": MAP_REDUCE_WINDOW_TOKENS,
+            "config": self.config,
+        }
+
+    @property
+    def async_client(self):
+        # Resolved lazily: async clients are bound to the running loop
+        return get_async_client()
+
     # ------------------------------------------------------------------
     # Public API (DO NOT override)
     # ------------------------------------------------------------------
@@ -58,27 +104,49 @@ class BaseAgent(ABC):
 
         try:
             result: T = self.execute()
+            return self._finalize(result)
 
-            self.finished_at = datetime.utcnow()
+        except Exception as e:
+            return self._fail(e)  # type: ignore
 
-            # Attach common metadata WITHOUT changing the object type
-            result.agent_name = self.agent_name
-            result.media_id = self.media_id
-            result.success = True
+    async def arun(self) -> T:
+        """
+        Async counterpart of run(), driven by aexecute().
 
-            result.metadata = result.metadata or {}
-            result.metadata.update(self._execution_metadata())
+        This method should NEVER be overridden by child classes.
+        """
+        self.started_at = datetime.utcnow()
 
-            return result
+        try:
+            result: T = await self.aexecute()
+            return self._finalize(result)
 
         except Exception as e:
-            self.finished_at = datetime.utcnow()
-            print(f"\n❌ AGENT FAILED: {self.agent_name}")
-            print("AudioAgent failed with:", e)
-            traceback.print_exc()
-            if "rate limit" in str(e).lower():
-                raise RuntimeError("LLM rate-limited, please retry after cooldown") from e
-            return self._handle_failure(e)  # type: ignore
+            return self._fail(e)  # type: ignore
+
+    def _finalize(self, result: T) -> T:
+        self.finished_at = datetime.utcnow()
+
+        # Attach common metadata WITHOUT changing the object type
+        result.agent_name = self.agent_name
+        result.media_id = self.media_id
+        result.success = True
+
+        result.metadata = result.metadata or {}
+        result.metadata.update(self._execution_metadata())
+
+        return result
+
+    def _fail(self, e: Exception) -> BaseAgentOutput:
+        """
+        Must be called from inside the `except` block so the
+        active traceback is captured.
+        """
+        self.finished_at = datetime.utcnow()
+        logger.exception("%s failed for media %s: %s", self.agent_name, self.media_id, e)
+        if "rate limit" in str(e).lower():
+            raise RuntimeError("LLM rate-limited, please retry after cooldown") from e
+        return self._handle_failure(e)
 
     # ------------------------------------------------------------------
     # Methods to be implemented by child agents
@@ -94,6 +162,112 @@ class BaseAgent(ABC):
         """
         raise NotImplementedError
 
+    async def aexecute(self) -> BaseAgentOutput:
+        """
+        Async core logic. Defaults to running execute() in a worker
+        thread; LLM agents override this with the async client and
+        CPU-bound agents with the shared CPU executor.
+        """
+        return await asyncio.to_thread(self.execute)
+
+    # ------------------------------------------------------------------
+    # LLM helpers
+    # ------------------------------------------------------------------
+
+    def _chat_completion(
+        self,
+        messages: List[dict],
+        response_model: Optional[Type[BaseModel]] = None,
+        model: str = TEXT_MODEL,
+    ) -> str:
+        """
+        Sends a chat completion using `self.client` and returns the
+        message content. When response_model is given, the response
+        is constrained to its JSON schema.
+        """
+        response = self.client.chat.completions.create(
+            **self._completion_kwargs(messages, response_model, model)
+        )
+        return self._completion_content(response)
+
+    async def _achat_completion(
+        self,
+        messages: List[dict],
+        response_model: Optional[Type[BaseModel]] = None,
+        model: str = TEXT_MODEL,
+    ) -> str:
+        """
+        Async counterpart of _chat_completion using `self.async_client`.
+        """
+        response = await self.async_client.chat.completions.create(
+            **self._completion_kwargs(messages, response_model, model)
+        )
+        return self._completion_content(response)
+
+    def _stream_chat_completion(
+        self,
+        messages: List[dict],
+        model: str = TEXT_MODEL,
+    ) -> Iterator[str]:
+        """
+        Streams a chat completion using `self.client`, yielding
+        content deltas as they arrive. Usage is recorded from the
+        final chunk.
+        """
+        kwargs = self._completion_kwargs(messages, None, model)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+        for chunk in self.client.chat.completions.create(**kwargs):
+            if getattr(chunk, "usage", None) is not None:
+                self._record_usage(chunk)
+
+            if not chunk.choices:
+                continue
+
+            delta = chunk.choices[0].delta
+            if getattr(delta, "refusal", None):
+                raise RuntimeError(f"LLM refused the request: {delta.refusal}")
+            if delta.content:
+                yield delta.content
+
+    def _completion_kwargs(
+        self,
+        messages: List[dict],
+        response_model: Optional[Type[BaseModel]],
+        model: str,
+    ) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"model": model, "messages": messages}
+        if response_model is not None and STRUCTURED_OUTPUTS_ENABLED:
+            kwargs["response_format"] = response_format_for(response_model)
+        if PROMPT_CACHE_ROUTING:
+            # Route all agents for one media to the same prompt cache
+            kwargs["extra_body"] = {"prompt_cache_key": f"sentinel-{self.media_id}"}
+        return kwargs
+
+    def _completion_content(self, response: Any) -> str:
+        self._record_usage(response)
+
+        message = response.choices[0].message
+        if getattr(message, "refusal", None):
+            raise RuntimeError(f"LLM refused the request: {message.refusal}")
+
+        return message.content or ""
+
+    def _record_usage(self, response: Any):
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+
+        with self._usage_lock:
+            self.llm_usage["calls"] += 1
+            self.llm_usage["prompt_tokens"] += usage.prompt_tokens or 0
+            self.llm_usage["cached_tokens"] += cached
+            self.llm_usage["completion_tokens"] += usage.completion_tokens or 0
+
     # ------------------------------------------------------------------
     # Failure handling
     # ------------------------------------------------------------------
@@ -118,6 +292,8 @@ class BaseAgent(ABC):
                 if self.finished_at
                 else None,
                 "traceback": error_trace,
+                # Tokens spent before the failure are still billed
+                "llm_usage": dict(self.llm_usage),
             },
         )
 
@@ -145,4 +321,5 @@ class BaseAgent(ABC):
             else None,
             "duration_seconds": duration_seconds,
             "timeout_seconds": AGENT_TIMEOUT_SECONDS,
+            "llm_usage": dict(self.llm_usage),
         }
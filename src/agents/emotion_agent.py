@@ -13,13 +13,17 @@ This agent operates purely on text (from AudioAgent output).
 from typing import List
 
 from src.agents.base_agent import BaseAgent
+from src.agents.llm_client import get_client
+from src.agents.prompt_assembler import build_messages
+from src.agents.structured_output import parse_structured
+from src.processing.transcript_windower import format_transcript
 from src.schemas.agent_outputs import (
     EmotionAnalysisOutput,
+    EmotionResponse,
     EmotionSpike,
     TranscriptChunk,
 )
 from config.config import TEXT_MODEL
-from openai import OpenAI
 
 
 class EmotionAgent(BaseAgent):
@@ -44,7 +48,7 @@ class EmotionAgent(BaseAgent):
             raise ValueError("Transcript chunks are required for EmotionAgent")
 
         self.transcript_chunks = transcript_chunks
-        self.client = OpenAI()
+        self.client = get_client()
 
     # ------------------------------------------------------------------
     # Core execution
@@ -55,25 +59,24 @@ class EmotionAgent(BaseAgent):
         Uses LLM reasoning to detect emotional tone
         and emotion spikes across the transcript.
         """
+        content = self._chat_completion(**self._build_request())
+        return self._to_output(content)
 
-        # Combine transcript with timestamps
-        transcript_text = "\n".join(
-            f"[{chunk.start_time:.1f}s - {chunk.end_time:.1f}s] {chunk.text}"
-            for chunk in self.transcript_chunks
-        )
+    async def aexecute(self) -> EmotionAnalysisOutput:
+        content = await self._achat_completion(**self._build_request())
+        return self._to_output(content)
 
-        prompt = self._build_prompt(transcript_text)
+    def _build_request(self) -> dict:
+        # Combine transcript with timestamps (shared, cacheable prefix)
+        transcript_text = format_transcript(self.transcript_chunks)
 
-        response = self.client.chat.completions.create(
-            model=TEXT_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an expert emotion analysis AI."},
-                {"role": "user", "content": prompt},
-            ]
-        )
-
-        content = response.choices[0].message.content
+        return {
+            "messages": build_messages(transcript_text, self._build_prompt()),
+            "response_model": EmotionResponse,
+            "model": TEXT_MODEL,
+        }
 
+    def _to_output(self, content: str) -> EmotionAnalysisOutput:
         # Parse response
         dominant_emotion, emotion_spikes = self._parse_response(content)
 
@@ -89,9 +92,11 @@ class EmotionAgent(BaseAgent):
     # Prompting
     # ------------------------------------------------------------------
 
-    def _build_prompt(self, transcript_text: str) -> str:
-        return f"""
-            Analyze the emotional tone of the following transcript.
+    def _build_prompt(self) -> str:
+        return """
+            Role: expert emotion analysis AI.
+
+            Analyze the emotional tone of the transcript above.
 
             Tasks:
             1. Identify the dominant overall emotion (single word).
@@ -105,20 +110,17 @@ class EmotionAgent(BaseAgent):
 
             Respond STRICTLY in JSON format:
 
-            {{
+            {
             "dominant_emotion": "<emotion>",
             "emotion_spikes": [
-                {{
+                {
                 "timestamp": 12.3,
                 "emotion": "anger",
                 "intensity": 0.8,
                 "evidence": "raised voice while discussing pricing"
-                }}
+                }
             ]
-            }}
-
-            Transcript:
-            {transcript_text}
+            }
         """
 
     # ------------------------------------------------------------------
@@ -130,25 +132,10 @@ class EmotionAgent(BaseAgent):
         Parses LLM JSON output into schema objects.
         """
 
-        import json
-
-        content = content.strip().strip("```json").strip("```")
-        data = json.loads(content)
-
-
-        dominant_emotion = data.get("dominant_emotion")
-        spikes_raw = data.get("emotion_spikes", [])
+        data = parse_structured(content, EmotionResponse)
 
-        emotion_spikes: List[EmotionSpike] = []
+        dominant_emotion = data.dominant_emotion
 
-        for spike in spikes_raw:
-            emotion_spikes.append(
-                EmotionSpike(
-                    timestamp=spike.get("timestamp"),
-                    emotion=spike.get("emotion"),
-                    intensity=spike.get("intensity"),
-                    evidence=spike.get("evidence"),
-                )
-            )
+        emotion_spikes: List[EmotionSpike] = list(data.emotion_spikes)
 
         return dominant_emotion, emotion_spikes
@@ -0,0 +1,54 @@
+"""
+LLM Client
+----------
+
+Process-wide OpenAI clients shared by all agents.
+
+The clients are thread-safe and keep their own connection
+pools, so creating one per agent only adds connection setup
+to every call. Async clients are bound to the event loop
+they are used from, so one is kept per running loop.
+
+The openai package is imported when the first client is
+created, keeping it out of the import path of every agent.
+"""
+
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_client() -> "OpenAI":
+    from openai import OpenAI
+
+    return OpenAI()
+
+
+def get_async_client() -> "AsyncOpenAI":
+    """
+    Returns the AsyncOpenAI client for the running event loop.
+    Must be called from inside a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+
+    with _async_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI()
+            _async_clients[loop] = client
+
+    return client
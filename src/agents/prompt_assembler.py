@@ -0,0 +1,61 @@
+"""
+Prompt Assembler
+----------------
+
+Builds agent chat messages in a cache-friendly layout:
+
+1. Shared system prompt        (static, identical for every agent)
+2. Transcript block            (per media, see format_transcript)
+3. Agent task instructions     (static per agent)
+4. Dynamic context / signals   (varies per call)
+
+Providers cache the longest common prompt prefix, so keeping
+blocks 1 and 2 byte-identical lets every agent working on the
+same media reuse the cached transcript tokens.
+"""
+
+import textwrap
+from typing import List, Optional
+
+
+SHARED_SYSTEM_PROMPT = textwrap.dedent(
+    """
+    You are Sentinel Media AI, an expert multimodal media analysis system.
+
+    You will receive content from a single media item, followed by a
+    specific analysis task.
+
+    Rules:
+    - Ground every answer in the provided content and signals
+    - Follow the task instructions exactly
+    - Respond in the output format the task requests
+    """
+).strip()
+
+
+# -------------------------------------------------------------------
+# Message assembly
+# -------------------------------------------------------------------
+
+def build_messages(
+    content: str,
+    instructions: str,
+    context: Optional[str] = None,
+    label: str = "Transcript",
+) -> List[dict]:
+    """
+    Assembles messages with the shared prefix first and
+    per-agent, per-call text last.
+    """
+    messages = [
+        {"role": "system", "content": SHARED_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{label}:\n{content.strip()}"},
+        {"role": "user", "content": textwrap.dedent(instructions).strip()},
+    ]
+
+    if context:
+        messages.append(
+            {"role": "user", "content": textwrap.dedent(context).strip()}
+        )
+
+    return messages
@@ -6,18 +6,20 @@ Responsible for:
 - Conversational Q&A over analyzed media
 - Retrieval-augmented generation (RAG)
 - Session-based memory handling
+- Token streaming for the chat UI
 
 This is the primary user-facing agent.
 """
 
-from typing import List
-
-from openai import OpenAI
+from datetime import datetime
+from typing import Iterator, List, Optional
 
 from src.agents.base_agent import BaseAgent
-from src.schemas.agent_outputs import RAGChatOutput
+from src.agents.llm_client import get_client
+from src.schemas.agent_outputs import BaseAgentOutput, RAGChatOutput
 from src.rag.prompt_templates import CHAT_SYSTEM_PROMPT
-from src.rag.memory_manager import MemoryManager
+from src.processing.token_counter import count_tokens
+from src.rag.memory_manager import MemoryManager, message_tokens
 from config.config import TEXT_MODEL
 
 
@@ -33,6 +35,7 @@ class RAGChatAgent(BaseAgent):
         session_id: str,
         retrieved_context: List[str],
         user_question: str,
+        media_summary: Optional[str] = None,
         config: dict | None = None,
     ):
         super().__init__(
@@ -47,24 +50,56 @@ class RAGChatAgent(BaseAgent):
         self.session_id = session_id
         self.retrieved_context = retrieved_context
         self.user_question = user_question
+        self.media_summary = media_summary
 
-        self.client = OpenAI()
+        self.client = get_client()
         self.memory_manager = MemoryManager(session_id=session_id)
 
+        # Set by stream() once the last token has been yielded
+        self.output: Optional[BaseAgentOutput] = None
+
     # ------------------------------------------------------------------
     # Core execution
     # ------------------------------------------------------------------
 
     def execute(self) -> RAGChatOutput:
-        messages = self._build_messages()
-
-        response = self.client.chat.completions.create(
+        answer = self._chat_completion(
+            messages=self._build_messages(),
             model=TEXT_MODEL,
-            messages=messages
         )
+        return self._to_output(answer)
 
-        answer = response.choices[0].message.content
-
+    async def aexecute(self) -> RAGChatOutput:
+        answer = await self._achat_completion(
+            messages=self._build_messages(),
+            model=TEXT_MODEL,
+        )
+        return self._to_output(answer)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Streaming counterpart of run(): yields answer tokens as they
+        arrive. When the generator is exhausted, `self.output` holds
+        the finalized RAGChatOutput (or the failure output) and
+        memory has been updated.
+        """
+        self.started_at = datetime.utcnow()
+        parts: List[str] = []
+
+        try:
+            for delta in self._stream_chat_completion(
+                messages=self._build_messages(),
+                model=TEXT_MODEL,
+            ):
+                parts.append(delta)
+                yield delta
+
+            self.output = self._finalize(self._to_output("".join(parts)))
+
+        except Exception as e:
+            self.output = self._fail(e)
+
+    def _to_output(self, answer: str) -> RAGChatOutput:
         # Persist conversation memory
         self.memory_manager.add_interaction(
             user_message=self.user_question,
@@ -83,8 +118,6 @@ class RAGChatAgent(BaseAgent):
     # ------------------------------------------------------------------
 
     def _build_messages(self) -> List[dict]:
-        context_block = "\n".join(self.retrieved_context)
-
         messages = [
             {
                 "role": "system",
@@ -92,16 +125,43 @@ class RAGChatAgent(BaseAgent):
             }
         ]
 
-        # Inject memory
-        messages.extend(self.memory_manager.get_conversation())
+        # Inject whole-media summary (from the summary tree)
+        if self.media_summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Media summary:\n{self.media_summary}",
+                }
+            )
+
+        # Fit memory and retrieval context into the prompt budget
+        reserved = sum(message_tokens(m) for m in messages) + count_tokens(
+            self.user_question
+        )
+        packed = self.memory_manager.pack(
+            self.retrieved_context,
+            reserved_tokens=reserved,
+        )
+
+        # Inject memory: rolling summary of older turns, then recent turns
+        if packed.summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Earlier conversation summary:\n{packed.summary}",
+                }
+            )
+        messages.extend(packed.history)
 
         # Inject retrieval context
-        messages.append(
-            {
-                "role": "system",
-                "content": f"Relevant context:\n{context_block}",
-            }
-        )
+        if packed.context:
+            context_block = "\n".join(packed.context)
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Relevant context:\n{context_block}",
+                }
+            )
 
         # User query
         messages.append(
@@ -12,10 +12,21 @@ This agent represents the "thinking" layer.
 
 from typing import Optional, List
 
-from openai import OpenAI
-
 from src.agents.base_agent import BaseAgent
-from src.schemas.agent_outputs import ReasoningOutput
+from src.agents.llm_client import get_client
+from src.agents.prompt_assembler import build_messages
+from src.agents.structured_output import parse_structured
+from src.orchestration.map_reduce import MapReduceEngine
+from src.processing.transcript_windower import (
+    TranscriptWindow,
+    TranscriptWindower,
+)
+from src.schemas.agent_outputs import (
+    ReasoningOutput,
+    ReasoningResponse,
+    SummaryTreeOutput,
+    TranscriptChunk,
+)
 from config.config import TEXT_MODEL
 
 
@@ -32,6 +43,8 @@ class ReasoningAgent(BaseAgent):
         emotions: Optional[List[str]] = None,
         topics: Optional[List[str]] = None,
         entities: Optional[List[str]] = None,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+        summary_tree: Optional[SummaryTreeOutput] = None,
         config: dict | None = None,
     ):
         super().__init__(
@@ -47,36 +60,58 @@ class ReasoningAgent(BaseAgent):
         self.emotions = emotions or []
         self.topics = topics or []
         self.entities = entities or []
+        self.transcript_chunks = transcript_chunks or []
+
+        # Prefer section summaries over raw transcript when available
+        if summary_tree and summary_tree.success:
+            self.transcript_chunks = summary_tree.level_chunks("section")
 
-        self.client = OpenAI()
+        self.client = get_client()
+        self.windower = TranscriptWindower()
+        self.engine = MapReduceEngine()
 
     # ------------------------------------------------------------------
     # Core execution
     # ------------------------------------------------------------------
 
     def execute(self) -> ReasoningOutput:
-        MAX_CHARS = 6000
-
-        transcript = self.transcript_text
-        if len(transcript) > MAX_CHARS:
-            transcript = transcript[:MAX_CHARS]
-
-        prompt = self._build_prompt(transcript)
-
-
-        response = self.client.chat.completions.create(
-            model=TEXT_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a senior analyst AI capable of deep reasoning.",
-                },
-                {"role": "user", "content": prompt},
-            ]
+        windows = self._windows()
+
+        if len(windows) == 1:
+            # Short media: single call with all signals
+            result = self._complete(self._single_messages(windows[0]))
+        else:
+            # Long media: analyze every window, then merge
+            result = self.engine.run(
+                windows,
+                self._map_window,
+                self._reduce_partials,
+            )
+
+        return self._to_output(result, windows)
+
+    async def aexecute(self) -> ReasoningOutput:
+        windows = self._windows()
+
+        if len(windows) == 1:
+            result = await self._acomplete(self._single_messages(windows[0]))
+        else:
+            result = await self.engine.arun(
+                windows,
+                self._amap_window,
+                self._areduce_partials,
+            )
+
+        return self._to_output(result, windows)
+
+    def _windows(self) -> List[TranscriptWindow]:
+        return self.windower.window(
+            self.transcript_text,
+            self.transcript_chunks,
         )
 
-        content = response.choices[0].message.content
-        insights, intent, conclusions = self._parse_response(content)
+    def _to_output(self, result, windows: List[TranscriptWindow]) -> ReasoningOutput:
+        insights, intent, conclusions = result
 
         return ReasoningOutput(
             agent_name=self.agent_name,
@@ -89,28 +124,85 @@ class ReasoningAgent(BaseAgent):
                 for insight in insights
             ],
             decisions=conclusions,
+            metadata={"transcript_windows": len(windows)},
         )
 
+    # ------------------------------------------------------------------
+    # Map-reduce steps
+    # ------------------------------------------------------------------
+
+    def _complete(self, messages: List[dict]):
+        content = self._chat_completion(
+            messages=messages,
+            response_model=ReasoningResponse,
+            model=TEXT_MODEL,
+        )
+        return self._parse_response(content)
+
+    async def _acomplete(self, messages: List[dict]):
+        content = await self._achat_completion(
+            messages=messages,
+            response_model=ReasoningResponse,
+            model=TEXT_MODEL,
+        )
+        return self._parse_response(content)
+
+    def _map_window(self, window: TranscriptWindow):
+        return self._complete(self._window_messages(window))
+
+    async def _amap_window(self, window: TranscriptWindow):
+        return await self._acomplete(self._window_messages(window))
+
+    def _reduce_partials(self, partials: list):
+        return self._complete(self._reduce_messages(partials))
+
+    async def _areduce_partials(self, partials: list):
+        return await self._acomplete(self._reduce_messages(partials))
 
     # ------------------------------------------------------------------
-    # Prompting
+    # Message assembly
     # ------------------------------------------------------------------
 
-    def _build_prompt(self, transcript) -> str:
-        return f"""
-            Analyze the following media content and agent signals.
+    def _single_messages(self, window: TranscriptWindow) -> List[dict]:
+        return build_messages(
+            window.text,
+            self._build_prompt(),
+            context=self._build_signals(),
+        )
 
-            Transcript:
-            {transcript}
+    def _window_messages(self, window: TranscriptWindow) -> List[dict]:
+        return build_messages(
+            window.text,
+            self._build_window_prompt(),
+            context=f"This excerpt covers {window.label}.",
+        )
 
-            Detected Emotions:
-            {self.emotions}
+    def _reduce_messages(self, partials: list) -> List[dict]:
+        partial_blocks = "\n\n".join(
+            f"Part {i + 1}:\n"
+            f"Intent: {intent}\n"
+            f"Insights: {insights}\n"
+            f"Conclusions: {conclusions}"
+            for i, (insights, intent, conclusions) in enumerate(partials)
+        )
 
-            Detected Topics:
-            {self.topics}
+        return build_messages(
+            partial_blocks,
+            self._build_reduce_prompt(),
+            context=self._build_signals(),
+            label="Partial analyses",
+        )
 
-            Detected Entities:
-            {self.entities}
+    # ------------------------------------------------------------------
+    # Prompting
+    # ------------------------------------------------------------------
+
+    def _build_prompt(self) -> str:
+        return """
+            Role: senior analyst AI capable of deep reasoning.
+
+            Analyze the media content above together with the
+            agent signals that follow.
 
             Tasks:
             1. Identify the PRIMARY INTENT of the speaker/content.
@@ -125,11 +217,76 @@ class ReasoningAgent(BaseAgent):
 
             Respond STRICTLY in JSON format:
 
-            {{
+            {
+            "intent": "string",
+            "key_insights": ["insight1", "insight2"],
+            "conclusions": ["conclusion1", "conclusion2"]
+            }
+        """
+
+    def _build_window_prompt(self) -> str:
+        return """
+            Role: senior analyst AI capable of deep reasoning.
+
+            The transcript above is an excerpt of a longer media item.
+
+            Tasks:
+            1. Identify the PRIMARY INTENT of the speaker in this excerpt.
+            2. Generate up to 5 KEY INSIGHTS from this excerpt.
+            3. Provide up to 3 CONCLUSIONS supported by this excerpt.
+
+            Rules:
+            - Be concise
+            - Be analytical
+            - Avoid repeating transcript verbatim
+            - No explanations
+
+            Respond STRICTLY in JSON format:
+
+            {
             "intent": "string",
             "key_insights": ["insight1", "insight2"],
             "conclusions": ["conclusion1", "conclusion2"]
-            }}
+            }
+        """
+
+    def _build_reduce_prompt(self) -> str:
+        return """
+            Role: senior analyst AI capable of deep reasoning.
+
+            The partial analyses above cover consecutive parts of one
+            media transcript, in chronological order.
+
+            Tasks:
+            1. Identify the PRIMARY INTENT of the content as a whole.
+            2. Merge the partial insights into 3–5 KEY INSIGHTS.
+            3. Provide 2–3 HIGH-LEVEL CONCLUSIONS for the whole content.
+
+            Rules:
+            - Be concise
+            - Be analytical
+            - Merge duplicates across parts
+            - No explanations
+
+            Respond STRICTLY in JSON format:
+
+            {
+            "intent": "string",
+            "key_insights": ["insight1", "insight2"],
+            "conclusions": ["conclusion1", "conclusion2"]
+            }
+        """
+
+    def _build_signals(self) -> str:
+        return f"""
+            Detected Emotions:
+            {self.emotions}
+
+            Detected Topics:
+            {self.topics}
+
+            Detected Entities:
+            {self.entities}
         """
 
     # ------------------------------------------------------------------
@@ -137,14 +294,10 @@ class ReasoningAgent(BaseAgent):
     # ------------------------------------------------------------------
 
     def _parse_response(self, content: str):
-        import json
-
-        content = content.strip().strip("```json").strip("```")
-        data = json.loads(content)
-
+        data = parse_structured(content, ReasoningResponse)
 
-        intent = data.get("intent", "")
-        key_insights = data.get("key_insights", [])
-        conclusions = data.get("conclusions", [])
+        intent = data.intent
+        key_insights = data.key_insights
+        conclusions = data.conclusions
 
         return key_insights, intent, conclusions
@@ -0,0 +1,46 @@
+"""
+Agent Registry
+--------------
+
+Maps agent names to the modules that define them, and imports
+an agent module (with its heavy dependencies such as Whisper)
+only when the agent is first used.
+
+Responsible for:
+- Keeping orchestration imports cheap: the Streamlit app and the
+  CLIs can import the runners without loading every agent
+- Resolving agent classes by name for the runners and stage workers
+"""
+
+import importlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Type
+
+if TYPE_CHECKING:
+    from src.agents.base_agent import BaseAgent
+
+
+# Agent name -> module defining the class of the same name
+AGENT_MODULES = {
+    "AudioAgent": "src.agents.audio_agent",
+    "EmotionAgent": "src.agents.emotion_agent",
+    "TaggingAgent": "src.agents.tagging_agent",
+    "SummaryAgent": "src.agents.summary_agent",
+    "VideoAgent": "src.agents.video_agent",
+    "ReasoningAgent": "src.agents.reasoning_agent",
+    "RiskAgent": "src.agents.risk_agent",
+    "TextAnalysisAgent": "src.agents.text_analysis_agent",
+    "RAGChatAgent": "src.agents.rag_chat_agent",
+}
+
+
+@lru_cache(maxsize=None)
+def get_agent_class(agent_name: str) -> Type["BaseAgent"]:
+    """
+    Imports the agent's module on first use and returns its class.
+    """
+    module_name = AGENT_MODULES.get(agent_name)
+    if module_name is None:
+        raise KeyError(f"Unknown agent: {agent_name}")
+
+    return getattr(importlib.import_module(module_name), agent_name)
@@ -10,16 +10,31 @@ Responsible for:
 Adds enterprise-grade intelligence.
 """
 
+import logging
 from typing import List, Optional
-import json
-from openai import OpenAI
 from src.schemas.agent_outputs import RiskFlag
 
 from src.agents.base_agent import BaseAgent
-from src.schemas.agent_outputs import RiskAssessmentOutput
+from src.agents.llm_client import get_client
+from src.agents.prompt_assembler import build_messages
+from src.agents.structured_output import parse_structured
+from src.orchestration.map_reduce import MapReduceEngine
+from src.processing.transcript_windower import (
+    TranscriptWindow,
+    TranscriptWindower,
+)
+from src.schemas.agent_outputs import (
+    RiskAssessmentOutput,
+    RiskResponse,
+    SummaryTreeOutput,
+    TranscriptChunk,
+)
 from config.config import TEXT_MODEL
 
 
+logger = logging.getLogger(__name__)
+
+
 class RiskAgent(BaseAgent):
     """
     Agent that evaluates content for risk, compliance,
@@ -33,6 +48,8 @@ class RiskAgent(BaseAgent):
         conclusions: Optional[List[str]] = None,
         topics: Optional[List[str]] = None,
         entities: Optional[List[str]] = None,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+        summary_tree: Optional[SummaryTreeOutput] = None,
         config: dict | None = None,
     ):
         super().__init__(
@@ -48,35 +65,63 @@ class RiskAgent(BaseAgent):
         self.conclusions = conclusions or []
         self.topics = topics or []
         self.entities = entities or []
+        self.transcript_chunks = transcript_chunks or []
 
-        self.client = OpenAI()
+        # Risk needs finer detail, so use window-level summaries
+        if summary_tree and summary_tree.success:
+            self.transcript_chunks = summary_tree.level_chunks("window")
+
+        self.client = get_client()
+        self.windower = TranscriptWindower()
+        self.engine = MapReduceEngine()
+        # Windows whose assessment could not be parsed, left out of the reduce
+        self.failed_windows: List[int] = []
 
     # ------------------------------------------------------------------
     # Core execution
     # ------------------------------------------------------------------
 
     def execute(self) -> RiskAssessmentOutput:
-        MAX_CHARS = 4000  # risk analysis can be smaller
+        windows = self._windows()
+
+        if len(windows) == 1:
+            result = self._complete(self._single_messages(windows[0]))
+        else:
+            # Long media: assess every window, then merge
+            result = self.engine.run(
+                windows,
+                self._map_window,
+                self._reduce_partials,
+            )
 
-        transcript = self.transcript_text
-        if len(transcript) > MAX_CHARS:
-            transcript = transcript[:MAX_CHARS]
+        return self._to_output(result, windows)
 
-        prompt = self._build_prompt(transcript)
+    async def aexecute(self) -> RiskAssessmentOutput:
+        windows = self._windows()
 
-        response = self.client.chat.completions.create(
-            model=TEXT_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an AI compliance and risk analysis expert.",
-                },
-                {"role": "user", "content": prompt},
-            ]
+        if len(windows) == 1:
+            result = await self._acomplete(self._single_messages(windows[0]))
+        else:
+            result = await self.engine.arun(
+                windows,
+                self._amap_window,
+                self._areduce_partials,
+            )
+
+        return self._to_output(result, windows)
+
+    def _windows(self) -> List[TranscriptWindow]:
+        return self.windower.window(
+            self.transcript_text,
+            self.transcript_chunks,
         )
 
-        content = response.choices[0].message.content
-        risk_level, categories, explanation, actions = self._parse_response(content)
+    def _to_output(
+        self,
+        result,
+        windows: List[TranscriptWindow],
+    ) -> RiskAssessmentOutput:
+        risk_level, categories, explanation, actions = result
 
         flags = []
 
@@ -96,27 +141,119 @@ class RiskAgent(BaseAgent):
             success=True,
             overall_risk_level=risk_level,
             risk_flags=flags,
+            metadata={
+                "transcript_windows": len(windows),
+                "failed_windows": sorted(self.failed_windows),
+            },
         )
 
     # ------------------------------------------------------------------
-    # Prompting
+    # Map-reduce steps
     # ------------------------------------------------------------------
 
-    def _build_prompt(self, transcript) -> str:
-        return f"""
-            Evaluate the following media content for potential risks.
+    def _complete(self, messages: List[dict]):
+        content = self._chat_completion(
+            messages=messages,
+            response_model=RiskResponse,
+            model=TEXT_MODEL,
+        )
+        return self._parse_response(content)
 
-            Transcript:
-            {transcript}
+    async def _acomplete(self, messages: List[dict]):
+        content = await self._achat_completion(
+            messages=messages,
+            response_model=RiskResponse,
+            model=TEXT_MODEL,
+        )
+        return self._parse_response(content)
 
-            Conclusions:
-            {self.conclusions}
+    def _map_window(self, window: TranscriptWindow):
+        try:
+            return self._complete(self._window_messages(window))
+        except ValueError as e:
+            return self._window_failed(window, e)
 
-            Topics:
-            {self.topics}
+    async def _amap_window(self, window: TranscriptWindow):
+        try:
+            return await self._acomplete(self._window_messages(window))
+        except ValueError as e:
+            return self._window_failed(window, e)
+
+    def _reduce_partials(self, partials: list):
+        assessed = self._assessed(partials)
+        if len(assessed) == 1:
+            return assessed[0]
+        return self._complete(self._reduce_messages(assessed))
+
+    async def _areduce_partials(self, partials: list):
+        assessed = self._assessed(partials)
+        if len(assessed) == 1:
+            return assessed[0]
+        return await self._acomplete(self._reduce_messages(assessed))
+
+    def _window_failed(self, window: TranscriptWindow, error: Exception):
+        # Not a verdict: a "low" placeholder could outvote real findings
+        logger.warning(
+            "%s could not assess %s of media %s: %s",
+            self.agent_name,
+            window.label,
+            self.media_id,
+            error,
+        )
+        self.failed_windows.append(window.index)
+        return None
 
-            Entities:
-            {self.entities}
+    def _assessed(self, partials: list) -> list:
+        assessed = [partial for partial in partials if partial is not None]
+        if not assessed:
+            raise ValueError("No transcript window could be assessed for risk")
+        return assessed
+
+    # ------------------------------------------------------------------
+    # Message assembly
+    # ------------------------------------------------------------------
+
+    def _single_messages(self, window: TranscriptWindow) -> List[dict]:
+        return build_messages(
+            window.text,
+            self._build_prompt(),
+            context=self._build_signals(),
+        )
+
+    def _window_messages(self, window: TranscriptWindow) -> List[dict]:
+        return build_messages(
+            window.text,
+            self._build_window_prompt(),
+            context=f"This excerpt covers {window.label}.",
+        )
+
+    def _reduce_messages(self, partials: list) -> List[dict]:
+        partial_blocks = "\n\n".join(
+            f"Part {i + 1}:\n"
+            f"Risk level: {level}\n"
+            f"Categories: {categories}\n"
+            f"Explanation: {explanation}\n"
+            f"Actions: {actions}"
+            for i, (level, categories, explanation, actions) in enumerate(partials)
+        )
+
+        return build_messages(
+            partial_blocks,
+            self._build_reduce_prompt(),
+            context=self._build_signals(),
+            label="Partial assessments",
+        )
+
+    # ------------------------------------------------------------------
+    # Prompting
+    # ------------------------------------------------------------------
+
+    def _build_prompt(self) -> str:
+        return """
+            Role: AI compliance and risk analysis expert.
+
+            Evaluate the media content above for potential risks,
+            together with the signals that follow.
 
             Risk Categories to consider:
             - compliance
@@ -140,12 +277,92 @@ class RiskAgent(BaseAgent):
 
             Respond STRICTLY in JSON format:
 
-            {{
+            {
             "risk_level": "low|medium|high",
             "risk_categories": ["category1", "category2"],
             "explanation": "string",
             "recommended_actions": ["action1", "action2"]
-            }}
+            }
+        """
+
+    def _build_window_prompt(self) -> str:
+        return """
+            Role: AI compliance and risk analysis expert.
+
+            The transcript above is an excerpt of a longer media item.
+            Evaluate it for potential risks.
+
+            Risk Categories to consider:
+            - compliance
+            - misinformation
+            - safety
+            - reputational
+            - ethical
+            - legal
+
+            Tasks:
+            1. Assign a RISK LEVEL for this excerpt: low, medium, or high.
+            2. Identify applicable RISK CATEGORIES.
+            3. Briefly explain the risk, citing timestamps where possible.
+            4. Suggest RECOMMENDED ACTIONS.
+
+            Rules:
+            - Be objective
+            - Be conservative
+            - Avoid speculation
+            - No moralizing
+
+            Respond STRICTLY in JSON format:
+
+            {
+            "risk_level": "low|medium|high",
+            "risk_categories": ["category1", "category2"],
+            "explanation": "string",
+            "recommended_actions": ["action1", "action2"]
+            }
+        """
+
+    def _build_reduce_prompt(self) -> str:
+        return """
+            Role: AI compliance and risk analysis expert.
+
+            The partial assessments above cover consecutive parts of
+            one media transcript, in chronological order.
+
+            Tasks:
+            1. Assign an OVERALL RISK LEVEL: low, medium, or high.
+               The overall level must not be lower than the highest
+               well-supported partial level.
+            2. Merge the applicable RISK CATEGORIES.
+            3. Briefly explain the combined risk.
+            4. Merge the RECOMMENDED ACTIONS, removing duplicates.
+
+            Rules:
+            - Be objective
+            - Be conservative
+            - Avoid speculation
+            - No moralizing
+
+            Respond STRICTLY in JSON format:
+
+            {
+            "risk_level": "low|medium|high",
+            "risk_categories": ["category1", "category2"],
+            "explanation": "string",
+            "recommended_actions": ["action1", "action2"]
+            }
+        """
+
+    def _build_signals(self) -> str:
+        return f"""
+            Conclusions:
+            {self.conclusions}
+
+            Topics:
+            {self.topics}
+
+            Entities:
+            {self.entities}
         """
 
     # ------------------------------------------------------------------
@@ -153,23 +370,19 @@ class RiskAgent(BaseAgent):
     # ------------------------------------------------------------------
 
     def _parse_response(self, content: str):
-
-        try:
-            cleaned = content.strip().strip("```json").strip("```")
-            data = json.loads(cleaned)
-        except Exception:
-            # Absolute fallback – never crash pipeline
-            return (
-                "low",
-                [],
-                "Unable to reliably assess risk from the content.",
-                [],
-            )
-
-        risk_level = data.get("risk_level", "low")
-        risk_categories = data.get("risk_categories", [])
-        explanation = data.get("explanation", "")
-        recommended_actions = data.get("recommended_actions", [])
+        """
+        Raises ValueError if the response cannot be parsed or states
+        no risk level: a made-up "low" verdict would understate the risk.
+        """
+        data = parse_structured(content, RiskResponse)
+        # Repaired truncated JSON can validate on defaults alone
+        if "risk_level" not in data.model_fields_set:
+            raise ValueError("Risk response states no risk level")
+
+        risk_level = data.risk_level
+        risk_categories = data.risk_categories
+        explanation = data.explanation
+        recommended_actions = data.recommended_actions
 
         # Final contract: ALWAYS return 4 values
         return (
@@ -0,0 +1,184 @@
+"""
+Structured Output
+-----------------
+
+Helpers for schema-constrained LLM responses:
+- Builds strict JSON-schema response formats from pydantic models
+- Parses responses into those models
+- Repairs truncated or prose-wrapped JSON as a fallback
+
+Agents should never call json.loads on raw model output directly.
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+M = TypeVar("M", bound=BaseModel)
+
+
+# -------------------------------------------------------------------
+# Response formats
+# -------------------------------------------------------------------
+
+def _strict_schema(schema: Any) -> Any:
+    """
+    Converts a pydantic JSON schema into the strict subset
+    accepted by OpenAI structured outputs:
+    - every property is required (optional ones stay nullable)
+    - no additional properties
+    - no defaults or titles
+    """
+    if isinstance(schema, list):
+        return [_strict_schema(item) for item in schema]
+
+    if not isinstance(schema, dict):
+        return schema
+
+    strict: Dict[str, Any] = {}
+    for key, value in schema.items():
+        if key in ("default", "title"):
+            continue
+        if key in ("properties", "$defs"):
+            # Keys here are field / definition names, not keywords
+            strict[key] = {
+                name: _strict_schema(sub) for name, sub in value.items()
+            }
+        else:
+            strict[key] = _strict_schema(value)
+
+    if strict.get("type") == "object" and "properties" in strict:
+        strict["required"] = list(strict["properties"])
+        strict["additionalProperties"] = False
+
+    return strict
+
+
+def response_format_for(model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Returns an OpenAI `response_format` constraining the
+    completion to the JSON schema of model_cls.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model_cls.__name__,
+            "schema": _strict_schema(model_cls.model_json_schema()),
+            "strict": True,
+        },
+    }
+
+
+# -------------------------------------------------------------------
+# Tolerant JSON repair
+# -------------------------------------------------------------------
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    if text.rstrip().endswith("```"):
+        text = text.rstrip()[:-3]
+    return text
+
+
+def _close(out: List[str], stack: List[str]) -> str:
+    text = "".join(out).rstrip().rstrip(",")
+    if text.endswith(":"):
+        text += " null"
+    return text + "".join(reversed(stack))
+
+
+def repair_candidates(text: str) -> Iterator[str]:
+    """
+    Yields progressively more conservative repairs of text.
+
+    Scans the first JSON value incrementally, ignoring any
+    prose around it. If the value is truncated, the open
+    string and containers are closed; if that is still
+    invalid, the value is cut back to the last complete
+    element and closed again.
+    """
+    text = _strip_fences(text or "")
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return
+
+    out: List[str] = []
+    stack: List[str] = []
+    checkpoints: List[Tuple[int, List[str]]] = []
+    in_string = False
+    escape = False
+
+    for ch in text[min(starts):]:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            if not stack:
+                break
+            # Drop trailing commas before closing
+            while out and out[-1] in " \n\r\t,":
+                out.pop()
+            out.append(stack.pop())
+            checkpoints.append((len(out), list(stack)))
+            if not stack:
+                break
+        elif ch == ",":
+            checkpoints.append((len(out), list(stack)))
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    if not stack and not in_string:
+        yield "".join(out)
+        return
+
+    # Truncated value: close the open string first
+    tail = list(out)
+    if in_string:
+        if escape:
+            tail.pop()
+        tail.append('"')
+    yield _close(tail, stack)
+
+    # Fall back to the last complete element
+    for position, open_stack in reversed(checkpoints):
+        yield _close(out[:position], open_stack)
+
+
+def parse_structured(content: str, model_cls: Type[M]) -> M:
+    """
+    Parses an LLM response into model_cls, repairing the JSON
+    if the response is not directly valid.
+    """
+    if content:
+        try:
+            return model_cls.model_validate_json(content)
+        except ValidationError:
+            pass
+
+    last_error: Exception = ValueError("No JSON object found in LLM response")
+
+    for candidate in repair_candidates(content):
+        try:
+            return model_cls.model_validate(json.loads(candidate))
+        except (ValueError, ValidationError) as e:
+            last_error = e
+
+    raise last_error
@@ -0,0 +1,282 @@
+"""
+SummaryAgent
+------------
+
+Responsible for:
+- Summarizing the transcript window by window
+- Rolling window summaries up into section summaries
+- Producing a single whole-media summary
+
+The resulting summary tree is built once per media and
+consumed by ReasoningAgent, RiskAgent and RAG chat
+instead of the raw transcript.
+"""
+
+from typing import List, Optional
+
+from src.agents.base_agent import BaseAgent
+from src.agents.llm_client import get_client
+from src.agents.prompt_assembler import build_messages
+from src.orchestration.map_reduce import MapReduceEngine
+from src.processing.transcript_windower import (
+    TranscriptWindow,
+    TranscriptWindower,
+)
+from src.schemas.agent_outputs import (
+    SummaryNode,
+    SummaryTreeOutput,
+    TranscriptChunk,
+)
+from config.config import TEXT_MODEL, SUMMARY_SECTION_WINDOWS
+
+
+class SummaryAgent(BaseAgent):
+    """
+    Agent that builds a hierarchical summary tree
+    (window -> section -> media) over a transcript.
+    """
+
+    def __init__(
+        self,
+        media_id: str,
+        transcript_text: str,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+        config: dict | None = None,
+    ):
+        super().__init__(
+            agent_name="SummaryAgent",
+            media_id=media_id,
+            config=config,
+        )
+
+        if not transcript_text.strip():
+            raise ValueError("Transcript text is required for SummaryAgent")
+
+        self.transcript_text = transcript_text
+        self.transcript_chunks = transcript_chunks or []
+
+        self.client = get_client()
+        self.windower = TranscriptWindower()
+        self.engine = MapReduceEngine()
+
+    def fingerprint_settings(self) -> dict:
+        return {
+            **super().fingerprint_settings(),
+            "section_windows": SUMMARY_SECTION_WINDOWS,
+        }
+
+    # ------------------------------------------------------------------
+    # Core execution
+    # ------------------------------------------------------------------
+
+    def execute(self) -> SummaryTreeOutput:
+        windows = self._windows()
+
+        # Level 1: one summary per transcript window
+        window_summaries = self._window_nodes(
+            windows,
+            self.engine.map(
+                windows,
+                lambda w: self._complete(self._window_messages(w)),
+            ),
+        )
+
+        # Level 2: group consecutive windows into sections
+        groups = self._group_sections(window_summaries)
+
+        if len(window_summaries) == 1:
+            # Short media: the single window summary is the section
+            section_texts = [window_summaries[0].summary]
+        else:
+            section_texts = self.engine.map(
+                groups,
+                lambda g: self._complete(self._section_messages(g)),
+            )
+
+        section_summaries = self._section_nodes(groups, section_texts)
+
+        # Level 3: whole-media summary
+        media_text = self._complete(self._media_messages(section_summaries))
+
+        return self._to_output(window_summaries, section_summaries, media_text)
+
+    async def aexecute(self) -> SummaryTreeOutput:
+        windows = self._windows()
+
+        window_summaries = self._window_nodes(
+            windows,
+            await self.engine.amap(
+                windows,
+                lambda w: self._acomplete(self._window_messages(w)),
+            ),
+        )
+
+        groups = self._group_sections(window_summaries)
+
+        if len(window_summaries) == 1:
+            section_texts = [window_summaries[0].summary]
+        else:
+            section_texts = await self.engine.amap(
+                groups,
+                lambda g: self._acomplete(self._section_messages(g)),
+            )
+
+        section_summaries = self._section_nodes(groups, section_texts)
+
+        media_text = await self._acomplete(
+            self._media_messages(section_summaries)
+        )
+
+        return self._to_output(window_summaries, section_summaries, media_text)
+
+    # ------------------------------------------------------------------
+    # Tree assembly
+    # ------------------------------------------------------------------
+
+    def _windows(self) -> List[TranscriptWindow]:
+        return self.windower.window(
+            self.transcript_text,
+            self.transcript_chunks,
+        )
+
+    def _window_nodes(
+        self,
+        windows: List[TranscriptWindow],
+        summaries: List[str],
+    ) -> List[SummaryNode]:
+        return [
+            SummaryNode(
+                level="window",
+                index=window.index,
+                summary=summary,
+                start_time=window.start_time,
+                end_time=window.end_time,
+            )
+            for window, summary in zip(windows, summaries)
+        ]
+
+    def _group_sections(
+        self,
+        window_summaries: List[SummaryNode],
+    ) -> List[List[SummaryNode]]:
+        return [
+            window_summaries[i : i + SUMMARY_SECTION_WINDOWS]
+            for i in range(0, len(window_summaries), SUMMARY_SECTION_WINDOWS)
+        ]
+
+    def _section_nodes(
+        self,
+        groups: List[List[SummaryNode]],
+        summaries: List[str],
+    ) -> List[SummaryNode]:
+        return [
+            SummaryNode(
+                level="section",
+                index=i,
+                summary=summary,
+                start_time=group[0].start_time,
+                end_time=group[-1].end_time,
+            )
+            for i, (group, summary) in enumerate(zip(groups, summaries))
+        ]
+
+    def _to_output(
+        self,
+        window_summaries: List[SummaryNode],
+        section_summaries: List[SummaryNode],
+        media_text: str,
+    ) -> SummaryTreeOutput:
+        media_summary = SummaryNode(
+            level="media",
+            index=0,
+            summary=media_text,
+            start_time=window_summaries[0].start_time,
+            end_time=window_summaries[-1].end_time,
+        )
+
+        return SummaryTreeOutput(
+            agent_name=self.agent_name,
+            media_id=self.media_id,
+            success=True,
+            window_summaries=window_summaries,
+            section_summaries=section_summaries,
+            media_summary=media_summary,
+        )
+
+    # ------------------------------------------------------------------
+    # Summarization steps
+    # ------------------------------------------------------------------
+
+    def _complete(self, messages: List[dict]) -> str:
+        return self._chat_completion(messages=messages, model=TEXT_MODEL).strip()
+
+    async def _acomplete(self, messages: List[dict]) -> str:
+        content = await self._achat_completion(messages=messages, model=TEXT_MODEL)
+        return content.strip()
+
+    def _window_messages(self, window: TranscriptWindow) -> List[dict]:
+        return build_messages(
+            window.text,
+            """
+            Role: expert media summarization AI.
+
+            Summarize the transcript excerpt above.
+
+            Rules:
+            - 3 to 6 sentences
+            - Keep named entities, figures and specific claims
+            - Keep any potentially sensitive, risky or disputed statements
+            - Plain text, no lists
+            """,
+            context=f"This excerpt covers {window.label}.",
+        )
+
+    def _section_messages(self, nodes: List[SummaryNode]) -> List[dict]:
+        return build_messages(
+            self._format_nodes(nodes),
+            """
+            Role: expert media summarization AI.
+
+            Merge the consecutive summaries above, which cover one
+            media section, into a single summary.
+
+            Rules:
+            - 4 to 8 sentences
+            - Keep chronological order
+            - Keep named entities and specific claims
+            - Plain text, no lists
+            """,
+            label="Summaries",
+        )
+
+    def _media_messages(self, nodes: List[SummaryNode]) -> List[dict]:
+        return build_messages(
+            self._format_nodes(nodes),
+            """
+            Role: expert media summarization AI.
+
+            Write an overall summary of the media item from the
+            section summaries above.
+
+            Rules:
+            - 1 short paragraph describing what the media is about
+            - Mention the main speakers, topics and conclusions
+            - Plain text, no lists
+            """,
+            label="Section summaries",
+        )
+
+    # ------------------------------------------------------------------
+    # Utilities
+    # ------------------------------------------------------------------
+
+    def _format_nodes(self, nodes: List[SummaryNode]) -> str:
+        lines = []
+        for node in nodes:
+            if node.start_time is None or node.end_time is None:
+                lines.append(node.summary)
+            else:
+                lines.append(
+                    f"[{node.start_time:.1f}s - {node.end_time:.1f}s] {node.summary}"
+                )
+        return "\n".join(lines)
@@ -10,12 +10,18 @@ Responsible for:
 Operates on transcript text.
 """
 
-from typing import List
-
-from openai import OpenAI
+from typing import List, Optional
 
 from src.agents.base_agent import BaseAgent
-from src.schemas.agent_outputs import TaggingOutput
+from src.agents.llm_client import get_client
+from src.agents.prompt_assembler import build_messages
+from src.agents.structured_output import parse_structured
+from src.processing.transcript_windower import format_transcript
+from src.schemas.agent_outputs import (
+    TaggingOutput,
+    TaggingResponse,
+    TranscriptChunk,
+)
 from config.config import TEXT_MODEL
 
 
@@ -29,6 +35,7 @@ class TaggingAgent(BaseAgent):
         self,
         media_id: str,
         transcript_text: str,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
         config: dict | None = None,
     ):
         super().__init__(
@@ -41,27 +48,37 @@ class TaggingAgent(BaseAgent):
             raise ValueError("Transcript text is required for TaggingAgent")
 
         self.transcript_text = transcript_text
-        self.client = OpenAI()
+        self.transcript_chunks = transcript_chunks or []
+        self.client = get_client()
 
     # ------------------------------------------------------------------
     # Core execution
     # ------------------------------------------------------------------
 
     def execute(self) -> TaggingOutput:
-        prompt = self._build_prompt(self.transcript_text)
-
-        response = self.client.chat.completions.create(
-            model=TEXT_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert information extraction AI.",
-                },
-                {"role": "user", "content": prompt},
-            ]
+        content = self._chat_completion(**self._build_request())
+        return self._to_output(content)
+
+    async def aexecute(self) -> TaggingOutput:
+        content = await self._achat_completion(**self._build_request())
+        return self._to_output(content)
+
+    def _build_request(self) -> dict:
+        # Timestamped chunks keep the transcript block identical
+        # to the other agents' prompts (shared, cacheable prefix)
+        transcript = (
+            format_transcript(self.transcript_chunks)
+            if self.transcript_chunks
+            else self.transcript_text
         )
 
-        content = response.choices[0].message.content
+        return {
+            "messages": build_messages(transcript, self._build_prompt()),
+            "response_model": TaggingResponse,
+            "model": TEXT_MODEL,
+        }
+
+    def _to_output(self, content: str) -> TaggingOutput:
         topics, entities, keywords = self._parse_response(content)
 
         return TaggingOutput(
@@ -77,9 +94,11 @@ class TaggingAgent(BaseAgent):
     # Prompting
     # ------------------------------------------------------------------
 
-    def _build_prompt(self, transcript_text: str) -> str:
-        return f"""
-            Extract structured metadata from the following transcript.
+    def _build_prompt(self) -> str:
+        return """
+            Role: expert information extraction AI.
+
+            Extract structured metadata from the transcript above.
 
             Tasks:
             1. Identify 5–8 high-level TOPICS.
@@ -94,14 +113,11 @@ class TaggingAgent(BaseAgent):
 
             Respond STRICTLY in JSON format:
 
-            {{
+            {
             "topics": ["topic1", "topic2"],
             "entities": ["entity1", "entity2"],
             "keywords": ["keyword1", "keyword2"]
-            }}
-
-            Transcript:
-            {transcript_text}
+            }
         """
 
     # ------------------------------------------------------------------
@@ -109,14 +125,10 @@ class TaggingAgent(BaseAgent):
     # ------------------------------------------------------------------
 
     def _parse_response(self, content: str):
-        import json
-
-        content = content.strip().strip("```json").strip("```")
-        data = json.loads(content)
-
+        data = parse_structured(content, TaggingResponse)
 
-        topics: List[str] = data.get("topics", [])
-        entities: List[str] = data.get("entities", [])
-        keywords: List[str] = data.get("keywords", [])
+        topics: List[str] = data.topics
+        entities: List[str] = data.entities
+        keywords: List[str] = data.keywords
 
         return topics, entities, keywords
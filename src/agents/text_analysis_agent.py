@@ -0,0 +1,200 @@
+"""
+TextAnalysisAgent
+-----------------
+
+Responsible for:
+- Emotion, tagging and risk analysis in a single LLM call
+- Splitting the combined result back into the standard
+  EmotionAnalysisOutput, TaggingOutput and RiskAssessmentOutput
+
+Used by WorkflowRunner in fused mode for short and medium
+transcripts, saving two transcript uploads and two round-trips.
+Unlike RiskAgent, the risk part does not see ReasoningAgent's
+conclusions: reasoning depends on this agent's own output.
+"""
+
+from typing import List
+
+from src.agents.base_agent import BaseAgent
+from src.agents.llm_client import get_client
+from src.agents.prompt_assembler import build_messages
+from src.agents.structured_output import parse_structured
+from src.processing.transcript_windower import format_transcript
+from src.schemas.agent_outputs import (
+    EmotionAnalysisOutput,
+    EmotionResponse,
+    FusedTextAnalysisOutput,
+    FusedTextResponse,
+    RiskAssessmentOutput,
+    RiskFlag,
+    RiskResponse,
+    TaggingOutput,
+    TaggingResponse,
+    TranscriptChunk,
+)
+from config.config import TEXT_MODEL
+
+
+class TextAnalysisAgent(BaseAgent):
+    """
+    Agent that produces emotion, tagging and risk outputs
+    from one completion over the transcript.
+    """
+
+    def __init__(
+        self,
+        media_id: str,
+        transcript_chunks: List[TranscriptChunk],
+        config: dict | None = None,
+    ):
+        super().__init__(
+            agent_name="TextAnalysisAgent",
+            media_id=media_id,
+            config=config,
+        )
+
+        if not transcript_chunks:
+            raise ValueError("Transcript chunks are required for TextAnalysisAgent")
+
+        self.transcript_chunks = transcript_chunks
+        self.client = get_client()
+
+    # ------------------------------------------------------------------
+    # Core execution
+    # ------------------------------------------------------------------
+
+    def execute(self) -> FusedTextAnalysisOutput:
+        content = self._chat_completion(**self._build_request())
+        return self._to_output(content)
+
+    async def aexecute(self) -> FusedTextAnalysisOutput:
+        content = await self._achat_completion(**self._build_request())
+        return self._to_output(content)
+
+    def _build_request(self) -> dict:
+        transcript_text = format_transcript(self.transcript_chunks)
+
+        return {
+            "messages": build_messages(transcript_text, self._build_prompt()),
+            "response_model": FusedTextResponse,
+            "model": TEXT_MODEL,
+        }
+
+    def _to_output(self, content: str) -> FusedTextAnalysisOutput:
+        data = self._parse_response(content)
+
+        return FusedTextAnalysisOutput(
+            agent_name=self.agent_name,
+            media_id=self.media_id,
+            success=True,
+            emotion=self._to_emotion(data.emotion),
+            tagging=self._to_tagging(data.tagging),
+            risk=self._to_risk(data.risk),
+        )
+
+    # ------------------------------------------------------------------
+    # Prompting
+    # ------------------------------------------------------------------
+
+    def _build_prompt(self) -> str:
+        return """
+            Role: expert media analysis AI covering emotion analysis,
+            information extraction and risk assessment.
+
+            Analyze the transcript above and perform three tasks.
+
+            EMOTION:
+            1. Identify the dominant overall emotion (single word).
+            2. Detect moments where emotion noticeably spikes, with
+               timestamp (seconds), emotion, intensity (0.0 to 1.0)
+               and short evidence.
+
+            TAGGING:
+            1. Identify 5–8 high-level TOPICS.
+            2. Identify important NAMED ENTITIES (people, companies, products, locations).
+            3. Identify concise SEARCH KEYWORDS.
+            Use lowercase and avoid duplicates.
+
+            RISK:
+            Consider compliance, misinformation, safety, reputational,
+            ethical and legal risks.
+            1. Assign an OVERALL RISK LEVEL: low, medium, or high.
+            2. Identify applicable RISK CATEGORIES.
+            3. Briefly explain the risk.
+            4. Suggest RECOMMENDED ACTIONS.
+            Be objective and conservative, avoid speculation.
+
+            Respond STRICTLY in JSON format:
+
+            {
+            "emotion": {
+                "dominant_emotion": "<emotion>",
+                "emotion_spikes": [
+                    {
+                    "timestamp": 12.3,
+                    "emotion": "anger",
+                    "intensity": 0.8,
+                    "evidence": "raised voice while discussing pricing"
+                    }
+                ]
+            },
+            "tagging": {
+                "topics": ["topic1", "topic2"],
+                "entities": ["entity1", "entity2"],
+                "keywords": ["keyword1", "keyword2"]
+            },
+            "risk": {
+                "risk_level": "low|medium|high",
+                "risk_categories": ["category1", "category2"],
+                "explanation": "string",
+                "recommended_actions": ["action1", "action2"]
+            }
+            }
+        """
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def _parse_response(self, content: str) -> FusedTextResponse:
+        return parse_structured(content, FusedTextResponse)
+
+    # ------------------------------------------------------------------
+    # Splitting into per-agent outputs
+    # ------------------------------------------------------------------
+
+    def _to_emotion(self, data: EmotionResponse) -> EmotionAnalysisOutput:
+        return EmotionAnalysisOutput(
+            agent_name="EmotionAgent",
+            media_id=self.media_id,
+            success=True,
+            dominant_emotion=data.dominant_emotion,
+            emotion_spikes=data.emotion_spikes,
+        )
+
+    def _to_tagging(self, data: TaggingResponse) -> TaggingOutput:
+        return TaggingOutput(
+            agent_name="TaggingAgent",
+            media_id=self.media_id,
+            success=True,
+            topics=data.topics,
+            entities=data.entities,
+            keywords=data.keywords,
+        )
+
+    def _to_risk(self, data: RiskResponse) -> RiskAssessmentOutput:
+        return RiskAssessmentOutput(
+            agent_name="RiskAgent",
+            media_id=self.media_id,
+            success=True,
+            overall_risk_level=data.risk_level,
+            risk_flags=[
+                RiskFlag(
+                    category=category,
+                    description=data.explanation,
+                    severity=data.risk_level,
+                    timestamp=None,
+                )
+                for category in data.risk_categories
+            ],
+        )
@@ -12,10 +12,11 @@ Uses sampled frames for efficiency.
 
 from typing import List
 
-from openai import OpenAI
-
 from src.agents.base_agent import BaseAgent
-from src.schemas.agent_outputs import VideoAnalysisOutput
+from src.agents.llm_client import get_client
+from src.agents.structured_output import parse_structured
+from src.orchestration.executors import run_cpu_bound
+from src.schemas.agent_outputs import VideoAnalysisOutput, VideoResponse
 from config import config
 
 
@@ -41,19 +42,31 @@ class VideoAgent(BaseAgent):
             raise ValueError("At least one frame path is required for VideoAgent")
 
         self.frame_paths = frame_paths
-        self.client = OpenAI()
+        self.client = get_client()
+
+    def fingerprint_settings(self) -> dict:
+        return {**super().fingerprint_settings(), "model": config.VISION_MODEL}
 
     # ------------------------------------------------------------------
     # Core execution
     # ------------------------------------------------------------------
 
     def execute(self) -> VideoAnalysisOutput:
+        content = self._chat_completion(**self._build_request())
+        return self._to_output(content)
+
+    async def aexecute(self) -> VideoAnalysisOutput:
+        # Reading and base64-encoding frames is CPU work, keep it
+        # off the event loop
+        request = await run_cpu_bound(self._build_request)
+        content = await self._achat_completion(**request)
+        return self._to_output(content)
 
+    def _build_request(self) -> dict:
         prompt = self._build_prompt()
 
-        response = self.client.chat.completions.create(
-            model=config.VISION_MODEL,
-            messages=[
+        return {
+            "messages": [
                 {
                     "role": "system",
                     "content": "You are an expert computer vision analyst.",
@@ -71,10 +84,12 @@ class VideoAgent(BaseAgent):
                         ],
                     ],
                 },
-            ]
-        )
+            ],
+            "response_model": VideoResponse,
+            "model": config.VISION_MODEL,
+        }
 
-        content = response.choices[0].message.content
+    def _to_output(self, content: str) -> VideoAnalysisOutput:
         scenes, tags, activities = self._parse_response(content)
 
         return VideoAnalysisOutput(
@@ -140,14 +155,10 @@ class VideoAgent(BaseAgent):
     # ------------------------------------------------------------------
 
     def _parse_response(self, content: str):
-        import json
-
-        content = content.strip().strip("```json").strip("```")
-        data = json.loads(content)
-
+        data = parse_structured(content, VideoResponse)
 
-        scenes = data.get("scene_summaries", [])
-        tags = data.get("visual_tags", [])
-        activities = data.get("detected_activities", [])
+        scenes = data.scene_summaries
+        tags = data.visual_tags
+        activities = data.detected_activities
 
         return scenes, tags, activities
@@ -1,37 +1,94 @@
 import streamlit as st
 
 from src.agents.rag_chat_agent import RAGChatAgent
-from src.rag.retriever import Retriever
+from src.app_pages.resources import get_retriever
+from src.app_pages.state import get_agent_context
+from src.rag.answer_cache import (
+    analysis_fingerprint,
+    conversation_fingerprint,
+    get_answer_cache,
+)
+from src.rag.memory_manager import MemoryManager
+from src.rag.summary_tree import SummaryTreeStore, is_overview_question
+from config.config import ENABLE_ANSWER_CACHE
 
 
 def render_chat_page():
     st.header("💬 Chat with Your Media")
 
-    if "agent_context" not in st.session_state:
+    if not get_agent_context():
         st.warning("Run AI analysis first.")
         return
 
     user_query = st.text_input("Ask a question")
 
     if user_query:
-        retriever = Retriever()
+        media_id = st.session_state.media_id
+        audio = st.session_state.agent_context["audio"]
+        media_summary = _get_media_summary()
 
-        transcript = st.session_state.agent_context["audio"].full_transcript
-        retrieved_context = retriever.retrieve(
-                                media_id=st.session_state.media_id,
-                                transcript_text=transcript,
-                                query=user_query,
-                            )
+        # Repeated questions are answered from the cache, but only
+        # within the same conversation state
+        cache = get_answer_cache() if ENABLE_ANSWER_CACHE else None
+        version = analysis_fingerprint(audio.transcript_version(), media_summary)
+        memory = MemoryManager(session_id=st.session_state.chat_session_id)
+        conversation = (
+            conversation_fingerprint(memory.get_summary(), memory.get_conversation())
+            if cache
+            else ""
+        )
+
+        cached_answer = (
+            cache.get(media_id, user_query, version, conversation) if cache else None
+        )
+        if cached_answer is not None:
+            # Recorded like a generated answer, so later turns see it
+            memory.add_interaction(user_query, cached_answer)
+            st.markdown("### 🤖 Answer")
+            st.write(cached_answer)
+            return
+
+        if media_summary and is_overview_question(user_query):
+            # Whole-media questions are answered from the summary tree
+            retrieved_context = []
+        else:
+            retrieved_context = get_retriever().retrieve(
+                media_id=media_id,
+                transcript_text=audio.full_transcript,
+                query=user_query,
+                transcript_chunks=audio.transcript_chunks,
+                transcript_version=audio.transcript_version(),
+            )
 
 
         agent = RAGChatAgent(
-            media_id=st.session_state.media_id,
+            media_id=media_id,
             session_id=st.session_state.chat_session_id,
             retrieved_context=retrieved_context,
             user_question=user_query,
+            media_summary=media_summary,
         )
 
-        response = agent.run()
-
+        # Render tokens as they arrive; the final output is
+        # assembled by the agent once the stream ends
         st.markdown("### 🤖 Answer")
-        st.write(response.answer)
+        st.write_stream(agent.stream())
+
+        response = agent.output
+
+        if not response.success:
+            st.error(f"Chat failed: {response.error_message}")
+        elif cache:
+            cache.put(media_id, user_query, response.answer, version, conversation)
+
+
+def _get_media_summary() -> str | None:
+    tree = st.session_state.agent_context.get("summary")
+
+    if not tree or not tree.success:
+        tree = SummaryTreeStore().load(st.session_state.media_id)
+
+    if tree and tree.media_summary:
+        return tree.media_summary.summary
+
+    return None
@@ -1,10 +1,12 @@
 import streamlit as st
 
+from src.app_pages.state import get_agent_context
+
 
 def render_insights_page():
     st.header("🧠 Insights")
 
-    context = st.session_state.get("agent_context")
+    context = get_agent_context()
     if not context:
         st.warning("Run AI analysis first.")
         return
@@ -12,6 +14,11 @@ def render_insights_page():
     reasoning = context.get("reasoning")
     emotion = context.get("emotion")
     risk = context.get("risk")
+    summary = context.get("summary")
+
+    if summary and summary.success and summary.media_summary:
+        st.subheader("📝 Media Summary")
+        st.markdown(summary.media_summary.summary)
 
     if reasoning and reasoning.success:
         st.subheader("📌 Key Insights")
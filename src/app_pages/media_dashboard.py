@@ -1,31 +1,152 @@
 import streamlit as st
+from uuid import uuid4
 
-from src.orchestration.workflow_runner import WorkflowRunner
+from src.app_pages.resources import invalidate_media
+from src.app_pages.state import get_agent_context
+from src.orchestration.checkpoint_store import CheckpointStore
+from src.orchestration.context_loader import load_context
+from src.jobs.handlers import submit_analysis
+from src.jobs.job_queue import FAILED, SUCCEEDED, get_job_queue
+from src.jobs.launcher import start_embedded_workers
+from src.storage.db.models import ChatSession
+from src.storage.db.session_store import get_session_store
+from src.storage.factory import get_storage_backend
+from config.config import JOB_DEFAULT_TENANT, JOB_POLL_SECONDS
 
 
 def render_media_dashboard():
     st.header("📊 Media Dashboard")
 
+    _render_previous_analyses()
+
     if "media_id" not in st.session_state:
         st.warning("No media uploaded yet.")
         return
 
     st.write(f"**Media ID:** {st.session_state.media_id}")
 
-    if st.button("🧠 Run AI Analysis"):
-        with st.spinner("Running agentic pipeline..."):
-            runner = WorkflowRunner(media_id=st.session_state.media_id)
+    if "audio_path" in st.session_state and st.button("🧠 Run AI Analysis"):
+        start_embedded_workers()
 
-            context = runner.run(
-                audio_path=st.session_state.audio_path,
-                frame_paths=st.session_state.frame_paths,
-            )
+        # Runs in a worker process: the session only polls the job
+        st.session_state.analysis_job_id = submit_analysis(
+            media_id=st.session_state.media_id,
+            audio_path=st.session_state.audio_path,
+            frame_paths=st.session_state.frame_paths,
+            # Pick up an interrupted run instead of starting over
+            run_id=CheckpointStore().resumable_run_id(st.session_state.media_id),
+            priority="interactive",
+            tenant=st.session_state.get("tenant_id", JOB_DEFAULT_TENANT),
+        )
+        st.session_state.pop("agent_context", None)
 
-            st.session_state.agent_context = context
+    if "analysis_job_id" in st.session_state:
+        _render_job_status()
 
-        st.success("✅ AI analysis completed!")
+    _render_queue_metrics()
 
-    if "agent_context" in st.session_state:
+    context = get_agent_context()
+    if context:
         st.subheader("Agent Outputs Available")
-        for key in st.session_state.agent_context.keys():
+        for key in context.keys():
             st.markdown(f"- **{key.capitalize()} Agent**")
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS * 2)
+def _render_job_status():
+    """
+    Polls the analysis job; survives browser refreshes because
+    the job id is all the session holds.
+    """
+    job = get_job_queue().get(st.session_state.analysis_job_id)
+    if job is None:
+        st.session_state.pop("analysis_job_id", None)
+        return
+
+    if not job.finished:
+        label = "Queued..." if job.status == "queued" else (job.message or "Running...")
+        if job.attempts > 1:
+            label += f" (attempt {job.attempts}/{job.max_attempts})"
+        st.progress(job.progress, text=f"🧠 {label}")
+        return
+
+    st.session_state.pop("analysis_job_id", None)
+
+    if job.status == SUCCEEDED:
+        invalidate_media(st.session_state.media_id)
+        st.session_state.agent_context = load_context(st.session_state.media_id)
+        st.success("✅ AI analysis completed!")
+    elif job.status == FAILED:
+        st.error(f"AI analysis failed: {job.error}")
+    else:
+        st.warning("AI analysis was cancelled.")
+
+    # Re-render the whole page with the new context
+    st.rerun()
+
+
+def _render_queue_metrics():
+    """
+    Queue wait per priority class over the last hour.
+    """
+    stats = get_job_queue().queue_wait_stats()
+    if not stats:
+        return
+
+    with st.expander("⏱️ Queue"):
+        st.table(
+            [
+                {
+                    "class": group,
+                    "started": s["started"],
+                    "wait p50 (s)": round(s["wait_p50"], 1),
+                    "wait p95 (s)": round(s["wait_p95"], 1),
+                    "queued": s["queued"],
+                    "oldest queued (s)": round(s["oldest_queued"], 1),
+                }
+                for group, s in stats.items()
+            ]
+        )
+
+
+def _render_previous_analyses():
+    """
+    Reopens a stored analysis without re-running the pipeline.
+    """
+    records = get_storage_backend().list_media()
+    if not records:
+        return
+
+    labels = {
+        f"{record.title or record.media_id} ({record.created_at:%Y-%m-%d %H:%M})": record.media_id
+        for record in records
+    }
+
+    with st.expander("📂 Open a previous analysis"):
+        choice = st.selectbox("Media", list(labels))
+
+        if st.button("Open"):
+            media_id = labels[choice]
+            context = load_context(media_id)
+
+            if not context:
+                st.warning("This media has not been analysed yet.")
+                return
+
+            # Drop the files of the previously loaded upload
+            cleanup_frames = st.session_state.pop("cleanup_frames", None)
+            if cleanup_frames:
+                cleanup_frames()
+            for key in ("audio_path", "video_path", "frame_paths"):
+                st.session_state.pop(key, None)
+
+            st.session_state.media_id = media_id
+            st.session_state.agent_context = context
+            st.session_state.chat_session_id = str(uuid4())
+
+            get_session_store().register_session(
+                ChatSession(
+                    session_id=st.session_state.chat_session_id,
+                    media_id=media_id,
+                )
+            )
@@ -0,0 +1,45 @@
+"""
+Shared Resources
+----------------
+
+Long-lived resources shared by every session of the Streamlit
+server process, instead of being rebuilt on each interaction.
+
+Responsible for:
+- Holding one Retriever per process, and with it the storage
+  backend (and its Elasticsearch client) and the embedding pipeline
+- Dropping a media item's cached answers and retrieval indexes
+  once it has been re-analysed
+
+The LLM client (src/agents/llm_client.py), the Whisper model every
+AudioAgent falls back to (src/agents/audio_agent.py) and the
+per-media BM25 and vector indexes the retriever builds are
+process-wide already.
+"""
+
+import streamlit as st
+
+from src.rag.answer_cache import get_answer_cache
+from src.rag.bm25_index import invalidate_bm25_index
+from src.rag.local_vector_index import invalidate_local_vector_index
+from src.rag.retriever import Retriever
+
+
+@st.cache_resource(show_spinner=False)
+def get_retriever() -> Retriever:
+    """
+    Created on the first question; holds no per-query state, so
+    concurrent sessions share it. Cleared with the app's cache.
+    """
+    return Retriever()
+
+
+def invalidate_media(media_id: str):
+    """
+    Drops what this process cached about a media item. Analyses
+    run in worker processes, so their own invalidation never
+    reaches the server's caches.
+    """
+    get_answer_cache().invalidate(media_id)
+    invalidate_bm25_index(media_id)
+    invalidate_local_vector_index(media_id)
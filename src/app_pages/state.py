@@ -0,0 +1,28 @@
+"""
+Page State
+----------
+
+Session-state helpers shared by the app pages.
+"""
+
+from typing import Any, Mapping, Optional
+
+import streamlit as st
+
+from src.orchestration.context_loader import load_context
+
+
+def get_agent_context() -> Optional[Mapping[str, Any]]:
+    """
+    Returns the agent context of the current media: from the
+    session, else reloaded from stored insights of a previous run.
+    """
+    context = st.session_state.get("agent_context")
+    if context or "media_id" not in st.session_state:
+        return context
+
+    context = load_context(st.session_state.media_id)
+    if context:
+        st.session_state.agent_context = context
+
+    return context
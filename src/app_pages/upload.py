@@ -1,10 +1,13 @@
 import streamlit as st
 from uuid import uuid4
 
-from src.ingestion.video_loader import VideoLoader
+from src.ingestion.video_loader import media_id_for_file
 from src.ingestion.youtube_loader import YouTubeLoader
 from src.ingestion.audio_extractor import AudioExtractor
 from src.processing.frame_sampler import FrameSampler
+from src.storage.db.models import ChatSession, MediaRecord
+from src.storage.db.session_store import get_session_store
+from src.storage.factory import get_storage_backend
 
 
 def render_upload_page():
@@ -26,7 +29,7 @@ def render_upload_page():
                 f.write(uploaded_file.read())
 
             if st.button("Process Video"):
-                _process_video(temp_path)
+                _process_video(temp_path, title=uploaded_file.name)
 
     else:
         youtube_url = st.text_input("Enter YouTube URL")
@@ -34,14 +37,32 @@ def render_upload_page():
         if youtube_url and st.button("Process YouTube Video"):
             yt_loader = YouTubeLoader()
             video_info = yt_loader.load(youtube_url)
-            _process_video(video_info["video_path"], video_info["media_id"])
-
-
-def _process_video(video_path: str, media_id: str | None = None):
+            _process_video(
+                video_info["video_path"],
+                video_info["media_id"],
+                source="youtube",
+                title=youtube_url,
+            )
+
+
+def _process_video(
+    video_path: str,
+    media_id: str | None = None,
+    source: str = "local",
+    title: str | None = None,
+):
     st.info("Processing video...")
 
+    # Same file, same media: a re-upload reuses the earlier
+    # extraction and stored analysis instead of starting over
     if not media_id:
-        media_id = str(uuid4())
+        media_id = media_id_for_file(video_path)
+
+    storage = get_storage_backend()
+    if storage.get_media(media_id) is None:
+        storage.upsert_media(
+            MediaRecord(media_id=media_id, title=title, source=source)
+        )
 
     audio_extractor = AudioExtractor()
     frame_sampler = FrameSampler()
@@ -65,6 +86,14 @@ def _process_video(video_path: str, media_id: str | None = None):
     st.session_state.frame_paths = frame_paths
     st.session_state.cleanup_frames = cleanup_frames
     st.session_state.chat_session_id = str(uuid4())
+    st.session_state.pop("agent_context", None)
+
+    get_session_store().register_session(
+        ChatSession(
+            session_id=st.session_state.chat_session_id,
+            media_id=media_id,
+        )
+    )
 
     st.success("✅ Media processed successfully!")
     st.info("Go to Media Dashboard →")
@@ -7,7 +7,6 @@ for speech-to-text processing.
 """
 
 import os
-from moviepy import VideoFileClip
 
 
 class AudioExtractor:
@@ -29,17 +28,29 @@ class AudioExtractor:
             self.output_dir, f"{media_id}.wav"
         )
 
+        # Extracted by an earlier attempt for the same media
+        if os.path.exists(audio_path):
+            return audio_path
+
+        # moviepy pulls in imageio and ffmpeg lookups, so load it on use
+        from moviepy import VideoFileClip
+
         clip = VideoFileClip(video_path)
 
         if clip.audio is None:
             raise RuntimeError("No audio track found in video")
 
+        # Written under a temporary name (keeping the extension
+        # ffmpeg picks the container from), then moved into place
+        tmp_path = os.path.join(self.output_dir, f"{media_id}.tmp.wav")
+
         # New moviepy-compatible call
         clip.audio.write_audiofile(
-            audio_path,
+            tmp_path,
             codec="pcm_s16le",
         )
 
         clip.close()
+        os.replace(tmp_path, audio_path)
 
         return audio_path
@@ -0,0 +1,56 @@
+"""
+Media Probe
+-----------
+
+Cheap duration lookups used to estimate how long
+processing a media item will take. OpenCV and soundfile
+are imported on the first probe.
+"""
+
+import os
+from typing import Optional
+
+from src.schemas.media_metadata import MediaMetadata
+
+
+AUDIO_EXTENSIONS = {".wav", ".flac", ".ogg", ".mp3"}
+
+
+def probe_duration_seconds(path: str) -> Optional[float]:
+    """
+    Reads the duration from the container headers only.
+    Returns None if the file cannot be probed.
+    """
+    try:
+        if os.path.splitext(path)[-1].lower() in AUDIO_EXTENSIONS:
+            import soundfile
+
+            return float(soundfile.info(path).duration)
+
+        import cv2
+
+        cap = cv2.VideoCapture(path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        finally:
+            cap.release()
+
+        return frames / fps if fps and frames else None
+
+    except Exception:
+        return None
+
+
+def media_duration(
+    metadata: Optional[MediaMetadata] = None,
+    path: Optional[str] = None,
+) -> Optional[float]:
+    """
+    Duration from metadata when known, else probed from the file.
+    """
+    if metadata is not None and metadata.duration_seconds:
+        return metadata.duration_seconds
+
+    path = path or (metadata.audio_path or metadata.media_path if metadata else None)
+    return probe_duration_seconds(path) if path else None
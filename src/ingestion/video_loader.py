@@ -6,9 +6,22 @@ Handles ingestion of local video files
 and standardizes storage paths.
 """
 
+import hashlib
 import os
 import shutil
-from uuid import uuid4
+from typing import Optional
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+
+def media_id_for_file(video_path: str) -> str:
+    """
+    Media id derived from the file content, so ingesting the same
+    video again (a retried job, a re-run batch) maps to the same
+    media instead of creating a new one.
+    """
+    with open(video_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return str(uuid5(NAMESPACE_URL, f"sentinel-media:{digest}"))
 
 
 class VideoLoader:
@@ -23,18 +36,27 @@ class VideoLoader:
 
     # --------------------------------------------------
 
-    def load(self, video_path: str) -> dict:
+    def load(self, video_path: str, media_id: Optional[str] = None) -> dict:
+        """
+        Copies the video into the workspace. With a known media_id
+        an earlier copy is reused.
+        """
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video not found: {video_path}")
 
-        media_id = str(uuid4())
+        media_id = media_id or str(uuid4())
         ext = os.path.splitext(video_path)[-1]
 
         dest_path = os.path.join(
             self.workspace_dir, f"{media_id}{ext}"
         )
 
-        shutil.copy(video_path, dest_path)
+        if not os.path.exists(dest_path):
+            # Copied under a temporary name, so a crash never
+            # leaves a truncated copy that would be reused
+            tmp_path = f"{dest_path}.tmp"
+            shutil.copy(video_path, tmp_path)
+            os.replace(tmp_path, dest_path)
 
         return {
             "media_id": media_id,
@@ -9,8 +9,6 @@ for ingestion into the pipeline.
 import os
 from uuid import uuid4
 
-from yt_dlp import YoutubeDL
-
 
 class YouTubeLoader:
     """
@@ -24,6 +22,8 @@ class YouTubeLoader:
     # --------------------------------------------------
 
     def load(self, youtube_url: str) -> dict:
+        from yt_dlp import YoutubeDL
+
         media_id = str(uuid4())
         output_path = os.path.join(self.workspace_dir, media_id)
 
@@ -0,0 +1,187 @@
+"""
+Job Handlers
+------------
+
+Functions executed by job workers, keyed by job kind,
+and the helpers that submit them.
+
+A handler receives the claimed Job and a `report(progress, message)`
+callback, and returns a JSON-serializable result dict. A handler
+that fails sets `llm_tokens` on the exception it raises, so the
+tokens it spent are still charged. The runners are imported by
+the handlers, so submitting jobs stays cheap.
+"""
+
+import os
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional
+
+from src.ingestion.audio_extractor import AudioExtractor
+from src.ingestion.media_probe import media_duration
+from src.ingestion.video_loader import VideoLoader, media_id_for_file
+from src.jobs.job_queue import Job, get_job_queue
+from src.processing.frame_sampler import FrameSampler
+from src.schemas.media_metadata import MediaMetadata
+from src.storage.db.models import MediaRecord
+from src.storage.factory import get_storage_backend
+from config.config import (
+    ENABLE_VIDEO_AGENT,
+    JOB_DEFAULT_TENANT,
+    PIPELINE_EXECUTION,
+    STAGE_BROKER,
+)
+
+
+ANALYSE_MEDIA = "analyse_media"
+PROCESS_VIDEO = "process_video"
+
+ProgressReporter = Callable[[float, str], None]
+
+
+# ----------------------------------------------------------------------
+# Handlers
+# ----------------------------------------------------------------------
+
+def analyse_media(job: Job, report: ProgressReporter) -> Dict[str, Any]:
+    """
+    Runs the agent pipeline for one media item. Unless the payload
+    names an interrupted run to resume, the job id doubles as the
+    checkpoint run id, so a retry after a worker died resumes from
+    the last completed agent instead of starting over.
+    """
+    payload = job.payload
+    run_id = payload.get("run_id") or job.job_id
+
+    def on_progress(agent_name: str, done: int, total: int):
+        report(done / total, f"{agent_name} done")
+
+    if PIPELINE_EXECUTION == "distributed":
+        from src.jobs.stage_worker import start_local_stage_workers
+        from src.orchestration.distributed_workflow_runner import (
+            DistributedWorkflowRunner,
+        )
+
+        # The local broker is only reachable from inside this process
+        if STAGE_BROKER == "local":
+            start_local_stage_workers()
+        runner_cls = DistributedWorkflowRunner
+    else:
+        from src.orchestration.workflow_runner import WorkflowRunner
+
+        runner_cls = WorkflowRunner
+
+    runner = runner_cls(
+        media_id=payload["media_id"],
+        run_id=run_id,
+        on_progress=on_progress,
+    )
+    try:
+        context = runner.run(
+            audio_path=payload["audio_path"],
+            frame_paths=payload.get("frame_paths"),
+            resume=job.attempts > 1 or run_id != job.job_id,
+        )
+    except Exception as e:
+        # Spent either way: the worker charges it to the tenant on failure
+        e.llm_tokens = runner.llm_tokens
+        raise
+
+    return {
+        "media_id": payload["media_id"],
+        "outputs": list(context),
+        "failed": [key for key, output in context.items() if not output.success],
+        # This attempt's usage only: earlier attempts were charged
+        # when they failed, and reused outputs cost nothing
+        "llm_tokens": runner.llm_tokens,
+    }
+
+
+def process_video(job: Job, report: ProgressReporter) -> Dict[str, Any]:
+    """
+    Ingests a video file (copy, audio, frames) and analyses it.
+    The media id is derived from the file's content, so a retried
+    attempt reuses what the first one ingested and resumes its run.
+    """
+    payload = job.payload
+
+    media_id = media_id_for_file(payload["video_path"])
+    info = VideoLoader().load(payload["video_path"], media_id)
+    audio_path = AudioExtractor().extract(info["video_path"], media_id)
+
+    storage = get_storage_backend()
+    if storage.get_media(media_id) is None:
+        storage.upsert_media(
+            MediaRecord(
+                media_id=media_id,
+                title=payload.get("title") or os.path.basename(payload["video_path"]),
+                source="local",
+            )
+        )
+    report(0.0, "media extracted")
+
+    frame_paths: List[str] = []
+    cleanup = None
+    if ENABLE_VIDEO_AGENT:
+        frame_paths, cleanup = FrameSampler().sample(info["video_path"])
+
+    analysis = replace(
+        job,
+        payload={"media_id": media_id, "audio_path": audio_path, "frame_paths": frame_paths},
+    )
+    try:
+        return analyse_media(analysis, report)
+    finally:
+        if cleanup:
+            cleanup()
+
+
+HANDLERS: Dict[str, Callable[[Job, ProgressReporter], Dict[str, Any]]] = {
+    ANALYSE_MEDIA: analyse_media,
+    PROCESS_VIDEO: process_video,
+}
+
+
+# ----------------------------------------------------------------------
+# Producers
+# ----------------------------------------------------------------------
+
+def submit_analysis(
+    media_id: str,
+    audio_path: str,
+    frame_paths: Optional[List[str]] = None,
+    run_id: Optional[str] = None,
+    priority: str = "interactive",
+    tenant: str = JOB_DEFAULT_TENANT,
+    metadata: Optional[MediaMetadata] = None,
+) -> str:
+    """
+    Queues an analysis of already-ingested media, costed by its
+    duration for shortest-job-first scheduling.
+    """
+    return get_job_queue().submit(
+        ANALYSE_MEDIA,
+        {
+            "media_id": media_id,
+            "audio_path": audio_path,
+            "frame_paths": frame_paths,
+            "run_id": run_id,
+        },
+        priority=priority,
+        tenant=tenant,
+        expected_seconds=media_duration(metadata, audio_path),
+    )
+
+
+def submit_video(
+    video_path: str,
+    title: Optional[str] = None,
+    priority: str = "batch",
+    tenant: str = JOB_DEFAULT_TENANT,
+) -> str:
+    return get_job_queue().submit(
+        PROCESS_VIDEO,
+        {"video_path": video_path, "title": title},
+        priority=priority,
+        tenant=tenant,
+        expected_seconds=media_duration(path=video_path),
+    )
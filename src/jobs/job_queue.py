@@ -0,0 +1,590 @@
+"""
+Job Queue
+---------
+
+Durable job queue on SQLite (WAL), shared by the app and
+any number of worker processes on the same host.
+
+Responsible for:
+- Submitting jobs and atomically claiming the next one
+- Heartbeats, progress and an append-only event log per job
+- Retrying jobs that failed or whose worker stopped heartbeating,
+  up to max_attempts
+- Queue-wait metrics per priority class (or tenant)
+- Per-tenant caps on running jobs and on LLM tokens per hour
+
+Claim order:
+1. Priority class (interactive > standard > batch)
+2. Tenant fair share: the tenant with the fewest running jobs,
+   then the one that used the fewest LLM tokens in the last hour,
+   then the one served least recently
+3. Shortest expected job first, with waiting time subtracted
+   from the expected cost so long jobs are not starved
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from uuid import uuid4
+
+from config.config import (
+    JOB_QUEUE_DB_PATH,
+    JOB_MAX_ATTEMPTS,
+    JOB_HEARTBEAT_TIMEOUT_SECONDS,
+    JOB_DEFAULT_TENANT,
+    JOB_DEFAULT_EXPECTED_SECONDS,
+    JOB_SJF_AGING_RATE,
+    JOB_TENANT_MAX_RUNNING,
+    JOB_TENANT_LLM_TOKENS_PER_HOUR,
+)
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# Priority classes, highest first
+PRIORITY_CLASSES = {
+    "interactive": 20,
+    "standard": 10,
+    "batch": 0,
+}
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id       TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    priority     INTEGER NOT NULL DEFAULT 0,
+    priority_class TEXT NOT NULL DEFAULT 'standard',
+    tenant       TEXT NOT NULL DEFAULT 'default',
+    expected_seconds REAL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker_id    TEXT,
+    progress     REAL NOT NULL DEFAULT 0,
+    message      TEXT,
+    result       TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    started_at   REAL,
+    heartbeat_at REAL,
+    finished_at  REAL,
+    queue_wait   REAL,
+    llm_tokens   INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim
+    ON jobs (status, priority DESC, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_tenant
+    ON jobs (tenant, status);
+
+CREATE TABLE IF NOT EXISTS job_events (
+    id       INTEGER PRIMARY KEY,
+    job_id   TEXT NOT NULL,
+    at       REAL NOT NULL,
+    event    TEXT NOT NULL,
+    progress REAL,
+    message  TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_events_job
+    ON job_events (job_id, id);
+
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id      INTEGER PRIMARY KEY,
+    job_id  TEXT NOT NULL,
+    tenant  TEXT NOT NULL,
+    at      REAL NOT NULL,
+    tokens  INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_usage_tenant
+    ON llm_usage (tenant, at);
+"""
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    payload: Dict[str, Any]
+    status: str
+    priority: int
+    priority_class: str
+    tenant: str
+    expected_seconds: Optional[float]
+    attempts: int
+    max_attempts: int
+    worker_id: Optional[str]
+    progress: float
+    message: Optional[str]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: float
+    started_at: Optional[float]
+    heartbeat_at: Optional[float]
+    finished_at: Optional[float]
+    queue_wait: Optional[float]
+    llm_tokens: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue. Safe to use from several threads
+    (one connection each) and several processes.
+    """
+
+    def __init__(self, path: str = JOB_QUEUE_DB_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self._local = threading.local()
+
+        with self._conn:
+            self._migrate()
+            self._conn.executescript(SCHEMA)
+
+    def _migrate(self):
+        # Scheduling columns added after the first queue release
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")
+        }
+        if not columns:
+            return
+
+        for name, ddl in (
+            ("priority_class", "TEXT NOT NULL DEFAULT 'standard'"),
+            ("tenant", "TEXT NOT NULL DEFAULT 'default'"),
+            ("expected_seconds", "REAL"),
+            ("queue_wait", "REAL"),
+            ("llm_tokens", "INTEGER NOT NULL DEFAULT 0"),
+        ):
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {ddl}")
+
+    # --------------------------------------------------
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are opened explicitly,
+            # with BEGIN IMMEDIATE where a read must precede a write
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+    def _event(self, job_id: str, event: str, progress=None, message=None):
+        self._conn.execute(
+            "INSERT INTO job_events (job_id, at, event, progress, message) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (job_id, time.time(), event, progress, message),
+        )
+
+    def _charge(self, job_id: str, tokens: int):
+        """
+        Records LLM tokens spent by an attempt of the job, against
+        its tenant's hourly budget from now on.
+        """
+        if tokens <= 0:
+            return
+
+        self._conn.execute(
+            "UPDATE jobs SET llm_tokens = llm_tokens + ? WHERE job_id = ?",
+            (tokens, job_id),
+        )
+        self._conn.execute(
+            "INSERT INTO llm_usage (job_id, tenant, at, tokens) "
+            "SELECT job_id, tenant, ?, ? FROM jobs WHERE job_id = ?",
+            (time.time(), tokens, job_id),
+        )
+
+    # --------------------------------------------------
+    # Producers
+    # --------------------------------------------------
+
+    def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        priority: Union[str, int] = "standard",
+        tenant: str = JOB_DEFAULT_TENANT,
+        expected_seconds: Optional[float] = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ) -> str:
+        """
+        Queues a job. `priority` is a PRIORITY_CLASSES name or a raw
+        number; `expected_seconds` (e.g. media duration) drives
+        shortest-job-first within a class.
+        """
+        if isinstance(priority, str):
+            priority_class = priority
+            priority = PRIORITY_CLASSES[priority]
+        else:
+            priority_class = _class_of(priority)
+
+        job_id = uuid4().hex
+
+        with self._transaction():
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, payload, status, priority, "
+                "priority_class, tenant, expected_seconds, max_attempts, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    json.dumps(payload),
+                    QUEUED,
+                    priority,
+                    priority_class,
+                    tenant,
+                    expected_seconds,
+                    max(max_attempts, 1),
+                    time.time(),
+                ),
+            )
+            self._event(job_id, QUEUED)
+
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancels a queued or running job. A running job's worker
+        notices on its next heartbeat and drops the result.
+        """
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? "
+                "WHERE job_id = ? AND status IN (?, ?)",
+                (CANCELLED, time.time(), job_id, QUEUED, RUNNING),
+            )
+            if cursor.rowcount:
+                self._event(job_id, CANCELLED)
+
+        return bool(cursor.rowcount)
+
+    # --------------------------------------------------
+    # Workers
+    # --------------------------------------------------
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """
+        Atomically moves the next queued job to running
+        and assigns it to the worker.
+        """
+        now = time.time()
+
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT j.job_id FROM jobs j "
+                "LEFT JOIN ("
+                "    SELECT tenant, "
+                "           SUM(status = ?) AS running, "
+                "           MAX(started_at) AS last_started "
+                "    FROM jobs GROUP BY tenant"
+                ") t ON t.tenant = j.tenant "
+                "LEFT JOIN ("
+                "    SELECT tenant, SUM(tokens) AS llm_tokens "
+                "    FROM llm_usage WHERE at >= ? GROUP BY tenant"
+                ") u ON u.tenant = j.tenant "
+                "WHERE j.status = ? "
+                "  AND (? <= 0 OR COALESCE(t.running, 0) < ?) "
+                "  AND (? <= 0 OR COALESCE(u.llm_tokens, 0) < ?) "
+                "ORDER BY j.priority DESC, "
+                "         COALESCE(t.running, 0), "
+                "         COALESCE(u.llm_tokens, 0), "
+                "         COALESCE(t.last_started, 0), "
+                "         COALESCE(j.expected_seconds, ?) - (? - j.created_at) * ?, "
+                "         j.created_at "
+                "LIMIT 1",
+                (
+                    RUNNING,
+                    now - 3600,
+                    QUEUED,
+                    JOB_TENANT_MAX_RUNNING,
+                    JOB_TENANT_MAX_RUNNING,
+                    JOB_TENANT_LLM_TOKENS_PER_HOUR,
+                    JOB_TENANT_LLM_TOKENS_PER_HOUR,
+                    JOB_DEFAULT_EXPECTED_SECONDS,
+                    now,
+                    JOB_SJF_AGING_RATE,
+                ),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ?, error = NULL, "
+                "queue_wait = COALESCE(queue_wait, ? - created_at) WHERE job_id = ?",
+                (RUNNING, worker_id, now, now, now, row["job_id"]),
+            )
+            self._event(row["job_id"], RUNNING, message=worker_id)
+
+        return self.get(row["job_id"])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Returns False once the worker no longer owns the job
+        (cancelled, or re-queued after a missed heartbeat).
+        """
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (time.time(), job_id, worker_id, RUNNING),
+            )
+        return bool(cursor.rowcount)
+
+    def report_progress(
+        self,
+        job_id: str,
+        worker_id: str,
+        progress: float,
+        message: Optional[str] = None,
+    ):
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET progress = ?, message = ?, heartbeat_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (progress, message, time.time(), job_id, worker_id, RUNNING),
+            )
+            if cursor.rowcount:
+                self._event(job_id, "progress", progress, message)
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]):
+        """
+        Marks the job succeeded. The result's "llm_tokens", if any,
+        count against the tenant's hourly LLM budget.
+        """
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, progress = 1, result = ?, finished_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (SUCCEEDED, json.dumps(result), time.time(), job_id, worker_id, RUNNING),
+            )
+            if cursor.rowcount:
+                self._charge(job_id, int(result.get("llm_tokens") or 0))
+                self._event(job_id, SUCCEEDED)
+
+    def fail(self, job_id: str, worker_id: str, error: str, llm_tokens: int = 0):
+        """
+        Re-queues the job if it has attempts left, else fails it.
+        The attempt's llm_tokens count against the tenant's hourly
+        LLM budget all the same.
+        """
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts FROM jobs "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (job_id, worker_id, RUNNING),
+            ).fetchone()
+            if row is None:
+                return
+
+            self._charge(job_id, llm_tokens)
+            self._retry_or_fail(job_id, row["attempts"], row["max_attempts"], error)
+
+    def reap_stale(
+        self,
+        timeout_seconds: float = JOB_HEARTBEAT_TIMEOUT_SECONDS,
+    ) -> int:
+        """
+        Retries (or fails) running jobs whose worker stopped
+        heartbeating, e.g. because its process died. The tokens
+        a dead attempt spent are unknown, so not charged.
+        """
+        with self._transaction():
+            rows = self._conn.execute(
+                "SELECT job_id, attempts, max_attempts, worker_id FROM jobs "
+                "WHERE status = ? AND heartbeat_at < ?",
+                (RUNNING, time.time() - timeout_seconds),
+            ).fetchall()
+
+            for row in rows:
+                self._retry_or_fail(
+                    row["job_id"],
+                    row["attempts"],
+                    row["max_attempts"],
+                    f"worker {row['worker_id']} stopped heartbeating",
+                )
+
+        return len(rows)
+
+    def _retry_or_fail(self, job_id: str, attempts: int, max_attempts: int, error: str):
+        if attempts < max_attempts:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, error = ? WHERE job_id = ?",
+                (QUEUED, error, job_id),
+            )
+            self._event(job_id, "retry", message=error)
+        else:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (FAILED, error, time.time(), job_id),
+            )
+            self._event(job_id, FAILED, message=error)
+
+    # --------------------------------------------------
+    # Status
+    # --------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._conn.execute(
+            "SELECT * FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        return _to_job(row) if row else None
+
+    def events(self, job_id: str, after_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        Events of a job newer than after_id, oldest first,
+        so pollers can fetch only what they have not seen.
+        """
+        rows = self._conn.execute(
+            "SELECT id, at, event, progress, message FROM job_events "
+            "WHERE job_id = ? AND id > ? ORDER BY id",
+            (job_id, after_id),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        if status is None:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        else:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status, limit),
+            ).fetchall()
+
+        return [_to_job(row) for row in rows]
+
+    # --------------------------------------------------
+    # Metrics
+    # --------------------------------------------------
+
+    def queue_wait_stats(
+        self,
+        window_seconds: float = 3600,
+        group_by: str = "priority_class",
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Time from submission to first start for jobs started within
+        the window, plus current backlog, grouped by priority class
+        or tenant.
+        """
+        if group_by not in ("priority_class", "tenant"):
+            raise ValueError(f"Cannot group queue metrics by {group_by}")
+
+        now = time.time()
+        waits: Dict[str, List[float]] = {}
+        backlog: Dict[str, List[float]] = {}
+
+        for row in self._conn.execute(
+            f"SELECT {group_by} AS grp, queue_wait FROM jobs "
+            "WHERE queue_wait IS NOT NULL AND created_at + queue_wait >= ?",
+            (now - window_seconds,),
+        ):
+            waits.setdefault(row["grp"], []).append(row["queue_wait"])
+
+        for row in self._conn.execute(
+            f"SELECT {group_by} AS grp, ? - created_at AS waiting FROM jobs "
+            "WHERE status = ? AND queue_wait IS NULL",
+            (now, QUEUED),
+        ):
+            backlog.setdefault(row["grp"], []).append(row["waiting"])
+
+        stats = {}
+        for group in sorted(waits.keys() | backlog.keys()):
+            values = sorted(waits.get(group, []))
+            queued = backlog.get(group, [])
+            stats[group] = {
+                "started": len(values),
+                "wait_mean": sum(values) / len(values) if values else 0.0,
+                "wait_p50": _percentile(values, 0.50),
+                "wait_p95": _percentile(values, 0.95),
+                "wait_max": values[-1] if values else 0.0,
+                "queued": len(queued),
+                "oldest_queued": max(queued, default=0.0),
+            }
+
+        return stats
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    return JobQueue()
+
+
+# ----------------------------------------------------------------------
+# Utilities
+# ----------------------------------------------------------------------
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT / ROLLBACK. Taking the write lock up
+    front makes read-then-write sequences (claim, retry) atomic
+    across processes.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def _class_of(priority: int) -> str:
+    # Highest class whose level the raw priority reaches
+    for name, level in sorted(PRIORITY_CLASSES.items(), key=lambda kv: -kv[1]):
+        if priority >= level:
+            return name
+    return "batch"
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(math.ceil(q * len(sorted_values)) - 1, len(sorted_values) - 1)
+    return sorted_values[max(index, 0)]
+
+
+def _to_job(row: sqlite3.Row) -> Job:
+    data = dict(row)
+    data["payload"] = json.loads(data["payload"])
+    data["result"] = json.loads(data["result"]) if data["result"] else None
+    return Job(**data)
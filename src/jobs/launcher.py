@@ -0,0 +1,33 @@
+"""
+Worker Launcher
+---------------
+
+Starts job worker processes alongside the Streamlit app, so a
+single `streamlit run` works without a separate worker command.
+"""
+
+import subprocess
+import sys
+from functools import lru_cache
+from typing import Optional
+
+from config.config import BASE_DIR, JOB_EMBEDDED_WORKERS
+
+
+@lru_cache(maxsize=1)
+def start_embedded_workers(count: int = JOB_EMBEDDED_WORKERS) -> Optional[subprocess.Popen]:
+    """
+    Launches the worker supervisor once per app process. It exits
+    with the app; jobs it was running are retried by other workers.
+    """
+    if count <= 0:
+        return None
+
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "src.jobs.worker",
+            "--processes", str(count),
+            "--exit-with-parent",
+        ],
+        cwd=BASE_DIR,
+    )
@@ -0,0 +1,274 @@
+"""
+Redis Stage Broker
+------------------
+
+StageBroker on any Redis-protocol server, shared by the
+coordinators and stage workers of every node.
+
+- Keys: {sentinel:stage}:item:<id> (hash of kind, payload, status,
+  attempts, lease token, result, error), {sentinel:stage}:ready:<kind>
+  (list of pending ids) and {sentinel:stage}:leases (sorted set of
+  leased ids by lease expiry)
+- Every state transition is one Lua script, so it is atomic across
+  workers and costs a single round trip
+- Redis Cluster: the reap and lease scripts build item (and ready
+  list) keys from ids they pop, which cannot be declared in KEYS
+  up front. The {sentinel:stage} hash tag puts every key in one
+  slot, so the scripts only touch keys on the node that runs them;
+  the price is that all stage traffic lands on that one shard
+- Lease expiry is compared against the callers' clocks; keep the
+  nodes NTP-synced
+"""
+
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import uuid4
+
+import redis
+
+from src.jobs.stage_broker import ItemStatus, StageBroker, WorkItem
+from config.config import (
+    REDIS_URL,
+    REDIS_MAX_CONNECTIONS,
+    STAGE_LEASE_SECONDS,
+    STAGE_MAX_ATTEMPTS,
+)
+
+
+# The braces are a hash tag: every key maps to the same cluster slot
+KEY_PREFIX = "{sentinel:stage}"
+LEASES_KEY = f"{KEY_PREFIX}:leases"
+
+# Finished items are kept this long for the coordinator to collect
+RESULT_TTL_SECONDS = 24 * 3600
+
+_PUBLISH = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'kind', ARGV[1], 'payload', ARGV[2],
+           'status', 'pending', 'attempts', 0)
+redis.call('RPUSH', KEYS[2], ARGV[3])
+return 1
+"""
+
+# KEYS: leases; ARGV: now, max_attempts, key prefix, result ttl
+_REAP = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], id)
+    local key = ARGV[3] .. ':item:' .. id
+    local fields = redis.call('HMGET', key, 'status', 'kind', 'attempts')
+    if fields[1] == 'leased' then
+        if tonumber(fields[3]) >= tonumber(ARGV[2]) then
+            redis.call('HSET', key, 'status', 'failed', 'token', '',
+                       'error', 'lease expired')
+            redis.call('EXPIRE', key, ARGV[4])
+        else
+            redis.call('HSET', key, 'status', 'pending', 'token', '',
+                       'error', 'lease expired')
+            redis.call('RPUSH', ARGV[3] .. ':ready:' .. fields[2], id)
+        end
+    end
+end
+return #expired
+"""
+
+# KEYS: ready list, leases; ARGV: key prefix, token, expires_at
+_LEASE = """
+while true do
+    local id = redis.call('LPOP', KEYS[1])
+    if not id then
+        return nil
+    end
+    local key = ARGV[1] .. ':item:' .. id
+    -- Skip ids completed by a late worker while waiting for a retry
+    if redis.call('HGET', key, 'status') == 'pending' then
+        local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('HSET', key, 'status', 'leased', 'token', ARGV[2])
+        redis.call('ZADD', KEYS[2], ARGV[3], id)
+        return {id, redis.call('HGET', key, 'payload'), attempts}
+    end
+end
+"""
+
+# KEYS: item, leases; ARGV: token, expires_at, id
+_RENEW = """
+local fields = redis.call('HMGET', KEYS[1], 'status', 'token')
+if fields[1] ~= 'leased' or fields[2] ~= ARGV[1] then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+return 1
+"""
+
+# KEYS: item, leases; ARGV: result, id, result ttl
+_COMPLETE = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if not status or status == 'done' or status == 'failed' then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', 'done', 'token', '', 'result', ARGV[1], 'error', '')
+redis.call('ZREM', KEYS[2], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# KEYS: item, leases, ready list; ARGV: token, error, id, max_attempts, result ttl
+_FAIL = """
+local fields = redis.call('HMGET', KEYS[1], 'status', 'token', 'attempts')
+if fields[1] ~= 'leased' or fields[2] ~= ARGV[1] then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[3])
+if tonumber(fields[3]) >= tonumber(ARGV[4]) then
+    redis.call('HSET', KEYS[1], 'status', 'failed', 'token', '', 'error', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+else
+    redis.call('HSET', KEYS[1], 'status', 'pending', 'token', '', 'error', ARGV[2])
+    redis.call('RPUSH', KEYS[3], ARGV[3])
+end
+return 1
+"""
+
+
+class RedisStageBroker(StageBroker):
+    """
+    Stage work items in Redis.
+    """
+
+    def __init__(
+        self,
+        url: str = REDIS_URL,
+        max_connections: int = REDIS_MAX_CONNECTIONS,
+        max_attempts: int = STAGE_MAX_ATTEMPTS,
+    ):
+        super().__init__(max_attempts=max_attempts)
+        self.pool = redis.ConnectionPool.from_url(
+            url,
+            max_connections=max_connections,
+            decode_responses=True,
+        )
+        self.client = redis.Redis(connection_pool=self.pool)
+
+        self._publish = self.client.register_script(_PUBLISH)
+        self._reap = self.client.register_script(_REAP)
+        self._lease = self.client.register_script(_LEASE)
+        self._renew = self.client.register_script(_RENEW)
+        self._complete = self.client.register_script(_COMPLETE)
+        self._fail = self.client.register_script(_FAIL)
+
+    # --------------------------------------------------
+
+    @staticmethod
+    def _item_key(item_id: str) -> str:
+        return f"{KEY_PREFIX}:item:{item_id}"
+
+    @staticmethod
+    def _ready_key(kind: str) -> str:
+        return f"{KEY_PREFIX}:ready:{kind}"
+
+    # --------------------------------------------------
+
+    def publish(self, item_id: str, kind: str, payload: Dict[str, Any]) -> bool:
+        return bool(
+            self._publish(
+                keys=[self._item_key(item_id), self._ready_key(kind)],
+                args=[kind, json.dumps(payload), item_id],
+            )
+        )
+
+    def status(self, item_id: str) -> Optional[ItemStatus]:
+        return self.statuses([item_id])[item_id]
+
+    def statuses(self, item_ids: Iterable[str]) -> Dict[str, Optional[ItemStatus]]:
+        item_ids = list(item_ids)
+        self._reap_expired()
+
+        pipe = self.client.pipeline(transaction=False)
+        for item_id in item_ids:
+            pipe.hmget(self._item_key(item_id), "status", "attempts", "result", "error")
+
+        statuses: Dict[str, Optional[ItemStatus]] = {}
+        for item_id, (status, attempts, result, error) in zip(item_ids, pipe.execute()):
+            statuses[item_id] = (
+                None
+                if status is None
+                else ItemStatus(
+                    status=status,
+                    attempts=int(attempts or 0),
+                    result=json.loads(result) if result else None,
+                    error=error or None,
+                )
+            )
+
+        return statuses
+
+    # --------------------------------------------------
+
+    def lease(
+        self,
+        worker_id: str,
+        kinds: List[str],
+        lease_seconds: float = STAGE_LEASE_SECONDS,
+    ) -> Optional[WorkItem]:
+        self._reap_expired()
+
+        for kind in kinds:
+            token = uuid4().hex
+            leased = self._lease(
+                keys=[self._ready_key(kind), LEASES_KEY],
+                args=[KEY_PREFIX, token, time.time() + lease_seconds],
+            )
+            if leased:
+                item_id, payload, attempts = leased
+                return WorkItem(
+                    item_id=item_id,
+                    kind=kind,
+                    payload=json.loads(payload),
+                    attempts=int(attempts),
+                    lease_token=token,
+                )
+
+        return None
+
+    def renew(self, item: WorkItem, lease_seconds: float = STAGE_LEASE_SECONDS) -> bool:
+        return bool(
+            self._renew(
+                keys=[self._item_key(item.item_id), LEASES_KEY],
+                args=[item.lease_token, time.time() + lease_seconds, item.item_id],
+            )
+        )
+
+    def complete(self, item: WorkItem, result: Dict[str, Any]) -> bool:
+        return bool(
+            self._complete(
+                keys=[self._item_key(item.item_id), LEASES_KEY],
+                args=[json.dumps(result), item.item_id, RESULT_TTL_SECONDS],
+            )
+        )
+
+    def fail(self, item: WorkItem, error: str):
+        self._fail(
+            keys=[
+                self._item_key(item.item_id),
+                LEASES_KEY,
+                self._ready_key(item.kind),
+            ],
+            args=[
+                item.lease_token,
+                error,
+                item.item_id,
+                self.max_attempts,
+                RESULT_TTL_SECONDS,
+            ],
+        )
+
+    # --------------------------------------------------
+
+    def _reap_expired(self):
+        self._reap(
+            keys=[LEASES_KEY],
+            args=[time.time(), self.max_attempts, KEY_PREFIX, RESULT_TTL_SECONDS],
+        )
@@ -0,0 +1,296 @@
+"""
+Stage Broker
+------------
+
+Work items for individual pipeline stages (transcribe segment N,
+analyze frame window M, run agent X for media Y), pulled by stage
+workers on any number of nodes.
+
+- StageBroker defines the interface
+- LocalStageBroker: in-process stand-in for a single node and tests
+- RedisStageBroker (redis_stage_broker.py): shared by every node
+
+Semantics:
+- publish() is idempotent: an item id is published at most once,
+  so a resumed coordinator can republish its whole plan
+- lease() hands an item to one worker for lease_seconds; a worker
+  that stops renewing loses it and the item is leased again, up to
+  max_attempts times
+- complete() is idempotent: the first completion wins and later
+  ones (e.g. from a worker whose lease had expired) are ignored
+"""
+
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterable, List, Optional
+from uuid import uuid4
+
+from config.config import STAGE_BROKER, STAGE_LEASE_SECONDS, STAGE_MAX_ATTEMPTS
+
+
+# Item states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+FINISHED_STATES = (DONE, FAILED)
+
+
+@dataclass
+class WorkItem:
+    """
+    A leased work item; lease_token identifies this particular lease.
+    """
+    item_id: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease_token: str
+
+
+@dataclass
+class ItemStatus:
+    status: str
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+
+class StageBroker(ABC):
+    """
+    Abstract stage work-item broker.
+    """
+
+    def __init__(self, max_attempts: int = STAGE_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+
+    # --------------------------------------------------
+    # Producers
+    # --------------------------------------------------
+
+    @abstractmethod
+    def publish(self, item_id: str, kind: str, payload: Dict[str, Any]) -> bool:
+        """
+        Publishes an item. Returns False if the id already exists.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def status(self, item_id: str) -> Optional[ItemStatus]:
+        raise NotImplementedError
+
+    def statuses(self, item_ids: Iterable[str]) -> Dict[str, Optional[ItemStatus]]:
+        return {item_id: self.status(item_id) for item_id in item_ids}
+
+    # --------------------------------------------------
+    # Workers
+    # --------------------------------------------------
+
+    @abstractmethod
+    def lease(
+        self,
+        worker_id: str,
+        kinds: List[str],
+        lease_seconds: float = STAGE_LEASE_SECONDS,
+    ) -> Optional[WorkItem]:
+        """
+        Leases the oldest pending item of the first kind (in the
+        given order) that has one.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew(self, item: WorkItem, lease_seconds: float = STAGE_LEASE_SECONDS) -> bool:
+        """
+        Extends a lease. Returns False if the lease was lost.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, item: WorkItem, result: Dict[str, Any]) -> bool:
+        """
+        Records the result. Returns False if the item was already finished.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, item: WorkItem, error: str):
+        """
+        Releases the item for a retry, or fails it for good
+        after max_attempts.
+        """
+        raise NotImplementedError
+
+
+# ----------------------------------------------------------------------
+# Local broker
+# ----------------------------------------------------------------------
+
+@dataclass
+class _Record:
+    kind: str
+    payload: str
+    status: str = PENDING
+    attempts: int = 0
+    token: Optional[str] = None
+    expires_at: float = 0.0
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+
+class LocalStageBroker(StageBroker):
+    """
+    Thread-safe in-process broker. Payloads and results are
+    round-tripped through JSON, as they would be over the wire.
+    """
+
+    def __init__(self, max_attempts: int = STAGE_MAX_ATTEMPTS):
+        super().__init__(max_attempts=max_attempts)
+        self._lock = threading.Lock()
+        self._items: Dict[str, _Record] = {}
+        self._ready: Dict[str, Deque[str]] = defaultdict(deque)
+        self._leased: Dict[str, _Record] = {}
+
+    # --------------------------------------------------
+
+    def publish(self, item_id: str, kind: str, payload: Dict[str, Any]) -> bool:
+        with self._lock:
+            if item_id in self._items:
+                return False
+
+            self._items[item_id] = _Record(kind=kind, payload=json.dumps(payload))
+            self._ready[kind].append(item_id)
+            return True
+
+    def status(self, item_id: str) -> Optional[ItemStatus]:
+        with self._lock:
+            self._reap_expired(time.time())
+
+            record = self._items.get(item_id)
+            if record is None:
+                return None
+
+            return ItemStatus(
+                status=record.status,
+                attempts=record.attempts,
+                result=json.loads(record.result) if record.result else None,
+                error=record.error,
+            )
+
+    # --------------------------------------------------
+
+    def lease(
+        self,
+        worker_id: str,
+        kinds: List[str],
+        lease_seconds: float = STAGE_LEASE_SECONDS,
+    ) -> Optional[WorkItem]:
+        now = time.time()
+
+        with self._lock:
+            self._reap_expired(now)
+
+            for kind in kinds:
+                ready = self._ready[kind]
+                while ready:
+                    item_id = ready.popleft()
+                    record = self._items[item_id]
+
+                    # Completed by a late worker while waiting for a retry
+                    if record.status != PENDING:
+                        continue
+
+                    record.status = LEASED
+                    record.attempts += 1
+                    record.token = uuid4().hex
+                    record.expires_at = now + lease_seconds
+                    self._leased[item_id] = record
+
+                    return WorkItem(
+                        item_id=item_id,
+                        kind=kind,
+                        payload=json.loads(record.payload),
+                        attempts=record.attempts,
+                        lease_token=record.token,
+                    )
+
+        return None
+
+    def renew(self, item: WorkItem, lease_seconds: float = STAGE_LEASE_SECONDS) -> bool:
+        with self._lock:
+            record = self._held(item)
+            if record is None:
+                return False
+
+            record.expires_at = time.time() + lease_seconds
+            return True
+
+    def complete(self, item: WorkItem, result: Dict[str, Any]) -> bool:
+        with self._lock:
+            record = self._items.get(item.item_id)
+            if record is None or record.status in FINISHED_STATES:
+                return False
+
+            record.status = DONE
+            record.token = None
+            record.error = None
+            self._leased.pop(item.item_id, None)
+            record.result = json.dumps(result)
+            return True
+
+    def fail(self, item: WorkItem, error: str):
+        with self._lock:
+            record = self._held(item)
+            if record is not None:
+                self._retry_or_fail(item.item_id, record, error)
+
+    # --------------------------------------------------
+
+    def _held(self, item: WorkItem) -> Optional[_Record]:
+        record = self._items.get(item.item_id)
+        if record is None or record.status != LEASED or record.token != item.lease_token:
+            return None
+        return record
+
+    def _reap_expired(self, now: float):
+        for item_id, record in list(self._leased.items()):
+            if record.expires_at <= now:
+                self._retry_or_fail(item_id, record, "lease expired")
+
+    def _retry_or_fail(self, item_id: str, record: _Record, error: str):
+        record.token = None
+        record.error = error
+        self._leased.pop(item_id, None)
+
+        if record.attempts >= self.max_attempts:
+            record.status = FAILED
+        else:
+            record.status = PENDING
+            self._ready[record.kind].append(item_id)
+
+
+@lru_cache(maxsize=1)
+def get_stage_broker() -> StageBroker:
+    """
+    Process-wide broker selected by STAGE_BROKER ("local" or "redis").
+    """
+    if STAGE_BROKER == "local":
+        return LocalStageBroker()
+
+    if STAGE_BROKER == "redis":
+        # redis is only required when this broker is selected
+        from src.jobs.redis_stage_broker import RedisStageBroker
+
+        return RedisStageBroker()
+
+    raise ValueError(f"Unknown stage broker: {STAGE_BROKER}")
@@ -0,0 +1,174 @@
+"""
+Stage Worker
+------------
+
+Worker processes that pull stage work items from the stage
+broker. Start any number of them on any number of nodes; each
+node needs the same STAGE_BROKER and a mount of ARTIFACT_DIR.
+
+Each worker leases one item at a time, renews the lease from a
+background thread while the stage runs, and records the result.
+A worker that dies simply stops renewing, and the item is leased
+to another worker once the lease expires.
+
+Usage:
+    python -m src.jobs.stage_worker --processes 4
+    python -m src.jobs.stage_worker --kinds transcribe_segment   # e.g. on GPU nodes
+"""
+
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+from functools import lru_cache
+from typing import List, Optional
+
+from src.jobs.stage_broker import StageBroker, WorkItem, get_stage_broker
+from src.jobs.stages import STAGE_HANDLERS, TRANSCRIBE_SEGMENT
+from src.storage.artifact_store import ArtifactStore
+from config.config import STAGE_LEASE_SECONDS, STAGE_LOCAL_WORKERS, STAGE_POLL_SECONDS
+
+
+class StageWorker:
+    """
+    Single-threaded stage consumer; run several processes for parallelism.
+    """
+
+    def __init__(
+        self,
+        broker: Optional[StageBroker] = None,
+        artifacts: Optional[ArtifactStore] = None,
+        kinds: Optional[List[str]] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = STAGE_LEASE_SECONDS,
+        poll_seconds: float = STAGE_POLL_SECONDS,
+    ):
+        self.broker = broker or get_stage_broker()
+        self.artifacts = artifacts or ArtifactStore()
+        # Listed first, leased first
+        self.kinds = kinds or list(STAGE_HANDLERS)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run_forever(self, stop: Optional[threading.Event] = None):
+        """
+        Polls for work items until interrupted or `stop` is set.
+        """
+        while stop is None or not stop.is_set():
+            if not self.run_once():
+                time.sleep(self.poll_seconds)
+
+    def run_once(self) -> bool:
+        """
+        Executes at most one work item. Returns False if none was pending.
+        """
+        item = self.broker.lease(self.worker_id, self.kinds, self.lease_seconds)
+        if item is None:
+            return False
+
+        self._execute(item)
+        return True
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _execute(self, item: WorkItem):
+        stop = threading.Event()
+
+        def renew():
+            # Renew well before expiry; stop once the lease is lost
+            while not stop.wait(self.lease_seconds / 3):
+                if not self.broker.renew(item, self.lease_seconds):
+                    return
+
+        renewer = threading.Thread(target=renew, daemon=True)
+        renewer.start()
+
+        try:
+            handler = STAGE_HANDLERS.get(item.kind)
+            if handler is None:
+                raise ValueError(f"Unknown stage: {item.kind}")
+
+            self.broker.complete(item, handler(item, self.artifacts))
+
+        except Exception as e:
+            traceback.print_exc()
+            self.broker.fail(item, f"{type(e).__name__}: {e}")
+
+        finally:
+            stop.set()
+            renewer.join()
+
+
+@lru_cache(maxsize=1)
+def start_local_stage_workers(count: int = STAGE_LOCAL_WORKERS) -> List[threading.Thread]:
+    """
+    Stage worker threads in this process, for the local broker
+    that other processes cannot reach. Started once per process.
+    """
+    all_kinds = list(STAGE_HANDLERS)
+    # The cached Whisper model is not thread-safe: one thread transcribes
+    other_kinds = [kind for kind in all_kinds if kind != TRANSCRIBE_SEGMENT]
+
+    threads = []
+    for i in range(max(count, 1)):
+        worker = StageWorker(
+            kinds=all_kinds if i == 0 else other_kinds,
+            worker_id=f"{socket.gethostname()}:{os.getpid()}:{i}",
+        )
+        thread = threading.Thread(target=worker.run_forever, daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    return threads
+
+
+# ----------------------------------------------------------------------
+# Entry point
+# ----------------------------------------------------------------------
+
+def _worker_main(kinds: Optional[List[str]]):
+    StageWorker(kinds=kinds).run_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=list(STAGE_HANDLERS),
+        help="stages this node runs (default: all)",
+    )
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _worker_main(args.kinds)
+        return
+
+    processes = [
+        multiprocessing.Process(target=_worker_main, args=(args.kinds,))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
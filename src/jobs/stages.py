@@ -0,0 +1,91 @@
+"""
+Stage Handlers
+--------------
+
+Pipeline stages executed by stage workers, keyed by work item kind.
+
+A handler receives the leased WorkItem and the shared ArtifactStore,
+reads its inputs from the store, writes its output to the artifact
+key named in the payload and returns a small JSON result. Outputs
+go to fixed keys, so running a stage twice is harmless.
+"""
+
+from typing import Any, Callable, Dict
+
+from src.agents.registry import get_agent_class
+from src.jobs.stage_broker import WorkItem
+from src.orchestration.context_loader import OUTPUT_SCHEMAS
+from src.orchestration.workflow_runner import build_agent
+from src.schemas.agent_outputs import BaseAgentOutput
+from src.storage.artifact_store import ArtifactStore
+
+
+TRANSCRIBE_SEGMENT = "transcribe_segment"
+ANALYZE_FRAMES = "analyze_frames"
+RUN_AGENT = "run_agent"
+
+
+def transcribe_segment(item: WorkItem, artifacts: ArtifactStore) -> Dict[str, Any]:
+    """
+    Transcribes [start, end) seconds of the media's audio.
+    """
+    # Loads Whisper, so only on nodes that actually transcribe
+    from src.agents.audio_agent import transcribe_window
+
+    payload = item.payload
+    output = transcribe_window(
+        payload["media_id"],
+        str(artifacts.path(payload["audio"])),
+        payload["start"],
+        payload["end"],
+    )
+    return _put_output(artifacts, payload["output"], output)
+
+
+def analyze_frames(item: WorkItem, artifacts: ArtifactStore) -> Dict[str, Any]:
+    """
+    Runs the vision analysis over one window of sampled frames.
+    """
+    payload = item.payload
+    output = get_agent_class("VideoAgent")(
+        media_id=payload["media_id"],
+        frame_paths=[str(artifacts.path(key)) for key in payload["frames"]],
+    ).run()
+    return _put_output(artifacts, payload["output"], output)
+
+
+def run_agent(item: WorkItem, artifacts: ArtifactStore) -> Dict[str, Any]:
+    """
+    Runs one downstream agent from its upstream outputs.
+    """
+    payload = item.payload
+    context = {
+        key: artifacts.get_model(artifact, OUTPUT_SCHEMAS[key])
+        for key, artifact in payload["context"].items()
+    }
+
+    agent = build_agent(payload["agent_name"], payload["media_id"], context)
+    if agent is None:
+        raise ValueError(f"Agent {payload['agent_name']} is disabled")
+
+    return _put_output(artifacts, payload["output"], agent.run())
+
+
+STAGE_HANDLERS: Dict[str, Callable[[WorkItem, ArtifactStore], Dict[str, Any]]] = {
+    TRANSCRIBE_SEGMENT: transcribe_segment,
+    ANALYZE_FRAMES: analyze_frames,
+    RUN_AGENT: run_agent,
+}
+
+
+# ----------------------------------------------------------------------
+# Utilities
+# ----------------------------------------------------------------------
+
+def _put_output(
+    artifacts: ArtifactStore,
+    key: str,
+    output: BaseAgentOutput,
+) -> Dict[str, Any]:
+    artifacts.put_model(key, output)
+    return {"output": key, "success": output.success}
@@ -0,0 +1,159 @@
+"""
+Job Worker
+----------
+
+Worker processes that drain the job queue.
+
+Each worker claims one job at a time, heartbeats from a
+background thread while the handler runs, and records the
+result or error. Every poll also re-queues jobs whose worker
+stopped heartbeating, so a crashed worker's job is retried.
+
+Usage:
+    python -m src.jobs.worker --processes 2
+"""
+
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+from typing import Optional
+
+from src.jobs.handlers import HANDLERS
+from src.jobs.job_queue import Job, JobQueue
+from config.config import JOB_HEARTBEAT_SECONDS, JOB_POLL_SECONDS
+
+
+class JobWorker:
+    """
+    Single-threaded job consumer; run several processes for parallelism.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        worker_id: Optional[str] = None,
+        poll_seconds: float = JOB_POLL_SECONDS,
+        heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+    ):
+        self.queue = queue or JobQueue()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run_forever(self, parent_pid: Optional[int] = None):
+        """
+        Polls for jobs until interrupted, or until parent_pid
+        exits when the worker was started by the app.
+        """
+        while parent_pid is None or os.getppid() == parent_pid:
+            if not self.run_once():
+                time.sleep(self.poll_seconds)
+
+    def run_once(self) -> bool:
+        """
+        Executes at most one job. Returns False if the queue was empty.
+        """
+        self.queue.reap_stale()
+
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+
+        self._execute(job)
+        return True
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def _execute(self, job: Job):
+        stop = threading.Event()
+        owned = threading.Event()
+        owned.set()
+
+        def heartbeat():
+            # A separate connection per thread, handled by JobQueue
+            while not stop.wait(self.heartbeat_seconds):
+                if not self.queue.heartbeat(job.job_id, self.worker_id):
+                    owned.clear()
+                    return
+
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+
+        def report(progress: float, message: str):
+            if owned.is_set():
+                self.queue.report_progress(job.job_id, self.worker_id, progress, message)
+
+        try:
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job.kind}")
+
+            result = handler(job, report)
+            self.queue.complete(job.job_id, self.worker_id, result)
+
+        except Exception as e:
+            traceback.print_exc()
+            self.queue.fail(
+                job.job_id,
+                self.worker_id,
+                f"{type(e).__name__}: {e}",
+                llm_tokens=getattr(e, "llm_tokens", 0),
+            )
+
+        finally:
+            stop.set()
+            beat.join()
+
+
+# ----------------------------------------------------------------------
+# Entry point
+# ----------------------------------------------------------------------
+
+def _worker_main(parent_pid: Optional[int]):
+    JobWorker().run_forever(parent_pid=parent_pid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--exit-with-parent",
+        action="store_true",
+        help="stop when the launching process exits",
+    )
+    args = parser.parse_args()
+
+    parent_pid = os.getppid() if args.exit_with_parent else None
+
+    if args.processes <= 1:
+        _worker_main(parent_pid)
+        return
+
+    # Children stop when this supervisor exits, the supervisor with its parent
+    processes = [
+        multiprocessing.Process(target=_worker_main, args=(os.getpid(),))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        while parent_pid is None or os.getppid() == parent_pid:
+            time.sleep(JOB_POLL_SECONDS)
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
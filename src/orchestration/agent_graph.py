@@ -7,7 +7,7 @@ between agents in the system.
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Set
 
 
 @dataclass
@@ -43,6 +43,10 @@ class AgentGraph:
                 name="TaggingAgent",
                 depends_on=["AudioAgent"],
             ),
+            "SummaryAgent": AgentNode(
+                name="SummaryAgent",
+                depends_on=["AudioAgent"],
+            ),
             "VideoAgent": AgentNode(
                 name="VideoAgent",
                 depends_on=[],
@@ -52,6 +56,7 @@ class AgentGraph:
                 depends_on=[
                     "EmotionAgent",
                     "TaggingAgent",
+                    "SummaryAgent",
                     "VideoAgent",
                 ],
             ),
@@ -84,3 +89,18 @@ class AgentGraph:
 
         return order
 
+    def ancestors(self, node_name: str) -> Set[str]:
+        """
+        Returns every node the given node depends on,
+        directly or transitively.
+        """
+        result: Set[str] = set()
+        stack = list(self.nodes[node_name].depends_on)
+
+        while stack:
+            dep = stack.pop()
+            if dep not in result:
+                result.add(dep)
+                stack.extend(self.nodes[dep].depends_on)
+
+        return result
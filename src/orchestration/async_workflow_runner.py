@@ -0,0 +1,203 @@
+"""
+Async Workflow Runner
+---------------------
+
+asyncio-based counterpart of WorkflowRunner.
+
+- Runs each agent as soon as its dependencies finish, so
+  independent agents (e.g. Emotion, Tagging, Summary, Video)
+  overlap instead of running one after another
+- LLM agents use the async OpenAI client; Whisper and frame
+  work are offloaded to the bounded CPU executor
+- Many media pipelines can share one event loop
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.orchestration.workflow_runner import (
+    FUSED_CONTEXT_KEYS,
+    WorkflowRunner,
+)
+from src.orchestration.fingerprint import stamp_fingerprint
+from src.schemas.agent_outputs import AudioAnalysisOutput
+from config.config import ASYNC_PIPELINE_CONCURRENCY
+
+
+class AsyncWorkflowRunner(WorkflowRunner):
+    """
+    Executes the agent graph for one media item on an event loop.
+    """
+
+    def __init__(
+        self,
+        media_id: str,
+        run_id: Optional[str] = None,
+        on_progress: Optional[Callable[[str, int, int], None]] = None,
+    ):
+        super().__init__(media_id=media_id, run_id=run_id, on_progress=on_progress)
+        self._fused_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def arun(
+        self,
+        audio_path: str,
+        frame_paths: list[str] | None = None,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Executes the full agent pipeline, running every node
+        once all of its dependencies have completed.
+        """
+        if resume:
+            await asyncio.to_thread(self._restore_checkpoints)
+
+        tasks: Dict[str, asyncio.Task] = {}
+        finished: List[str] = []
+
+        async def run_node(agent_name: str):
+            if agent_name not in self._completed:
+                dependencies = self.graph.nodes[agent_name].depends_on
+                await asyncio.gather(*(tasks[dep] for dep in dependencies))
+                await self._arun_agent(agent_name, audio_path, frame_paths)
+
+            finished.append(agent_name)
+            self._report_progress(agent_name, len(finished), len(tasks))
+
+        # execution_order() is topological, so dependency tasks
+        # always exist before their dependents are created
+        for agent_name in self.graph.execution_order():
+            tasks[agent_name] = asyncio.create_task(run_node(agent_name))
+
+        await asyncio.gather(*tasks.values())
+
+        self._finish_run()
+        return self.context
+
+    async def atranscribe(
+        self,
+        audio_path: str,
+        executor: Optional[Executor] = None,
+    ) -> AudioAnalysisOutput:
+        """
+        Runs only the AudioAgent node, optionally in a process pool,
+        and marks it done so a following arun() skips it.
+        """
+        agent = self._build_agent("AudioAgent", audio_path, None)
+        fingerprint, output = await asyncio.to_thread(
+            self._memoized, agent, audio_path, None
+        )
+
+        if output is not None:
+            await asyncio.to_thread(self._store_reused, [output])
+
+        else:
+            if executor is None:
+                output = await agent.arun()
+            else:
+                # Whisper is only loaded when transcription runs here
+                from src.agents.audio_agent import transcribe_audio
+
+                loop = asyncio.get_running_loop()
+                output = AudioAnalysisOutput.model_validate_json(
+                    await loop.run_in_executor(
+                        executor, transcribe_audio, self.media_id, audio_path
+                    )
+                )
+
+            stamp_fingerprint(output, fingerprint)
+            await asyncio.to_thread(self._store_output, "AudioAgent", output)
+
+        self._completed.add("AudioAgent")
+        return output
+
+    # ------------------------------------------------------------------
+    # Agent execution
+    # ------------------------------------------------------------------
+
+    async def _arun_agent(
+        self,
+        agent_name: str,
+        audio_path: str,
+        frame_paths: list[str] | None,
+    ):
+        # --------------------------------------------------
+        # Fused text analysis (Emotion + Tagging + Risk)
+        # --------------------------------------------------
+        if agent_name in FUSED_CONTEXT_KEYS:
+            # Emotion and Tagging start together: the first one
+            # launches the fused call, the other awaits it
+            if self._fused_task is None and self._should_fuse():
+                self._fused_attempted = True
+                self._fused_task = asyncio.create_task(self._arun_fused())
+
+            if self._fused_task is not None:
+                await self._fused_task
+
+            # Already produced by the fused agent
+            if FUSED_CONTEXT_KEYS[agent_name] in self.context:
+                return
+
+        agent = self._build_agent(agent_name, audio_path, frame_paths)
+        if agent is None:
+            return
+
+        # File hashing and the stored-output lookup block, keep them off the loop
+        fingerprint, reused = await asyncio.to_thread(
+            self._memoized, agent, audio_path, frame_paths
+        )
+        if reused is not None:
+            await asyncio.to_thread(self._store_reused, [reused])
+            return
+
+        output = await agent.arun()
+        stamp_fingerprint(output, fingerprint)
+
+        # Persistence uses blocking clients, keep it off the loop
+        await asyncio.to_thread(self._store_output, agent_name, output)
+
+    async def _arun_fused(self):
+        agent = self._build_fused_agent()
+        fingerprint, reused = await asyncio.to_thread(self._memoized_fused, agent)
+        if reused:
+            await asyncio.to_thread(self._store_reused, reused)
+            return
+
+        output = await agent.arun()
+        await asyncio.to_thread(self._store_fused_output, agent, output, fingerprint)
+
+
+# ----------------------------------------------------------------------
+# Multi-media helper
+# ----------------------------------------------------------------------
+
+async def run_pipelines(
+    items: List[Dict[str, Any]],
+    concurrency: int = ASYNC_PIPELINE_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """
+    Runs many media pipelines on the current event loop.
+
+    Each item needs `media_id` and `audio_path`, and may include
+    `frame_paths` and the `run_id` of an interrupted run to resume.
+    Returns the context of each pipeline, in order.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def run_one(item: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            runner = AsyncWorkflowRunner(
+                media_id=item["media_id"],
+                run_id=item.get("run_id"),
+            )
+            return await runner.arun(
+                audio_path=item["audio_path"],
+                frame_paths=item.get("frame_paths"),
+                resume=item.get("run_id") is not None,
+            )
+
+    return list(await asyncio.gather(*(run_one(item) for item in items)))
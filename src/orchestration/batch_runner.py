@@ -0,0 +1,265 @@
+"""
+Batch Runner
+------------
+
+Pipelines many media items through the processing stages
+on one event loop:
+
+    extract -> sample -> transcribe -> agents
+
+- extract (copy + audio), sample (frames) and transcribe (Whisper)
+  each run in their own process pool
+- the LLM agents of each item run as coroutines, with at most
+  BATCH_AGENT_CONCURRENCY media pipelines in flight
+- stages are connected by bounded queues: a full queue blocks the
+  stage feeding it, so memory stays bounded while every stage is kept busy
+- media ids derive from the video content, so re-running a batch after
+  a crash reuses the ingested media and every stored agent output
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from src.ingestion.audio_extractor import AudioExtractor
+from src.ingestion.video_loader import VideoLoader, media_id_for_file
+from src.orchestration.async_workflow_runner import AsyncWorkflowRunner
+from src.processing.frame_sampler import FrameSampler
+from src.storage.db.models import MediaRecord
+from src.storage.factory import get_storage_backend
+from config.config import (
+    ENABLE_VIDEO_AGENT,
+    BATCH_EXTRACT_WORKERS,
+    BATCH_SAMPLE_WORKERS,
+    BATCH_WHISPER_WORKERS,
+    BATCH_AGENT_CONCURRENCY,
+    BATCH_QUEUE_SIZE,
+)
+
+
+@dataclass
+class BatchItem:
+    video_path: str
+    title: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    video_path: str
+    media_id: Optional[str] = None
+    success: bool = False
+    error: Optional[str] = None
+    outputs: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+@dataclass
+class _Job:
+    item: BatchItem
+    result: BatchResult
+    started: float = field(default_factory=time.perf_counter)
+    video_path: Optional[str] = None
+    audio_path: Optional[str] = None
+    frame_paths: List[str] = field(default_factory=list)
+    runner: Optional[AsyncWorkflowRunner] = None
+
+
+# ----------------------------------------------------------------------
+# Process-pool entry points
+# ----------------------------------------------------------------------
+
+def extract_media(video_path: str) -> Tuple[str, str, str]:
+    """
+    Copies a video into the workspace and extracts its audio,
+    reusing both if this video was ingested before.
+    Returns (media_id, video_path, audio_path).
+    """
+    info = VideoLoader().load(video_path, media_id_for_file(video_path))
+    audio_path = AudioExtractor().extract(info["video_path"], info["media_id"])
+    return info["media_id"], info["video_path"], audio_path
+
+
+def sample_frames(video_path: str) -> List[str]:
+    # The cleanup closure cannot cross processes; the
+    # batch runner removes the frame directory itself
+    frame_paths, _ = FrameSampler().sample(video_path)
+    return frame_paths
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+class BatchRunner:
+    """
+    Processes a batch of videos through a staged pipeline.
+    """
+
+    def __init__(
+        self,
+        extract_workers: int = BATCH_EXTRACT_WORKERS,
+        sample_workers: int = BATCH_SAMPLE_WORKERS,
+        whisper_workers: int = BATCH_WHISPER_WORKERS,
+        agent_concurrency: int = BATCH_AGENT_CONCURRENCY,
+        queue_size: int = BATCH_QUEUE_SIZE,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+    ):
+        self.extract_workers = max(extract_workers, 1)
+        self.sample_workers = max(sample_workers, 1)
+        self.whisper_workers = max(whisper_workers, 1)
+        self.agent_concurrency = max(agent_concurrency, 1)
+        self.queue_size = max(queue_size, 1)
+        self.on_result = on_result
+        self.storage = get_storage_backend()
+
+        self._results: List[BatchResult] = []
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+        self._sample_pool: Optional[ProcessPoolExecutor] = None
+        self._whisper_pool: Optional[ProcessPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(self, items: Iterable[BatchItem]) -> List[BatchResult]:
+        return asyncio.run(self.arun(items))
+
+    async def arun(self, items: Iterable[BatchItem]) -> List[BatchResult]:
+        self._results = []
+
+        with ProcessPoolExecutor(self.extract_workers) as extract_pool, \
+                ProcessPoolExecutor(self.sample_workers) as sample_pool, \
+                ProcessPoolExecutor(self.whisper_workers) as whisper_pool:
+
+            self._extract_pool = extract_pool
+            self._sample_pool = sample_pool
+            self._whisper_pool = whisper_pool
+
+            stages: List[Tuple[str, Callable[[_Job], Awaitable[None]], int]] = [
+                ("extract", self._extract, self.extract_workers),
+                ("sample", self._sample, self.sample_workers),
+                ("transcribe", self._transcribe, self.whisper_workers),
+                ("agents", self._analyse, self.agent_concurrency),
+            ]
+            queues = [asyncio.Queue(maxsize=self.queue_size) for _ in stages]
+
+            async def feed():
+                for item in items:
+                    await queues[0].put(
+                        _Job(item=item, result=BatchResult(video_path=item.video_path))
+                    )
+                for _ in range(stages[0][2]):
+                    await queues[0].put(None)
+
+            async def run_stage(i: int):
+                name, handler, workers = stages[i]
+                outbox = queues[i + 1] if i + 1 < len(stages) else None
+
+                async def worker():
+                    while True:
+                        job = await queues[i].get()
+                        if job is None:
+                            return
+
+                        if not await self._guard(name, handler, job):
+                            continue
+
+                        if outbox is not None:
+                            await outbox.put(job)
+                        else:
+                            self._finish(job)
+
+                await asyncio.gather(*(worker() for _ in range(workers)))
+
+                # Stop the next stage once this one has drained
+                if outbox is not None:
+                    for _ in range(stages[i + 1][2]):
+                        await outbox.put(None)
+
+            await asyncio.gather(feed(), *(run_stage(i) for i in range(len(stages))))
+
+        return self._results
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def _extract(self, job: _Job):
+        loop = asyncio.get_running_loop()
+        media_id, job.video_path, job.audio_path = await loop.run_in_executor(
+            self._extract_pool, extract_media, job.item.video_path
+        )
+        job.result.media_id = media_id
+
+        if await asyncio.to_thread(self.storage.get_media, media_id) is not None:
+            return
+
+        await asyncio.to_thread(
+            self.storage.upsert_media,
+            MediaRecord(
+                media_id=media_id,
+                title=job.item.title or os.path.basename(job.item.video_path),
+                source="local",
+            ),
+        )
+
+    async def _sample(self, job: _Job):
+        if not ENABLE_VIDEO_AGENT:
+            return
+
+        loop = asyncio.get_running_loop()
+        job.frame_paths = await loop.run_in_executor(
+            self._sample_pool, sample_frames, job.video_path
+        )
+
+    async def _transcribe(self, job: _Job):
+        job.runner = AsyncWorkflowRunner(media_id=job.result.media_id)
+        audio = await job.runner.atranscribe(job.audio_path, self._whisper_pool)
+
+        if not audio.success:
+            raise RuntimeError(audio.error_message or "transcription failed")
+
+    async def _analyse(self, job: _Job):
+        context = await job.runner.arun(
+            audio_path=job.audio_path,
+            frame_paths=job.frame_paths,
+        )
+        job.result.outputs = list(context)
+        job.result.success = True
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    async def _guard(
+        self,
+        stage: str,
+        handler: Callable[[_Job], Awaitable[None]],
+        job: _Job,
+    ) -> bool:
+        """
+        Runs one stage for a job. A failure ends that job
+        only; the rest of the batch keeps flowing.
+        """
+        try:
+            await handler(job)
+            return True
+        except Exception as e:
+            job.result.error = f"{stage}: {e}"
+            self._finish(job)
+            return False
+
+    def _finish(self, job: _Job):
+        if job.frame_paths:
+            shutil.rmtree(os.path.dirname(job.frame_paths[0]), ignore_errors=True)
+
+        job.runner = None
+        job.result.seconds = time.perf_counter() - job.started
+        self._results.append(job.result)
+
+        if self.on_result:
+            self.on_result(job.result)
@@ -0,0 +1,100 @@
+"""
+Checkpoint Store
+----------------
+
+File-based checkpoints of agent outputs, so an interrupted
+pipeline run can resume instead of starting from scratch.
+
+Layout: {base_dir}/{media_id}/{run_id}/{agent_name}.json.gz
+Each output is gzip-compressed JSON and written atomically.
+The runner deletes a media's checkpoints once a run has succeeded
+on every node, so only runs with something left to resume remain.
+"""
+
+import gzip
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.orchestration.context_loader import CONTEXT_KEYS, OUTPUT_SCHEMAS
+from src.schemas.agent_outputs import BaseAgentOutput
+from config.config import CHECKPOINT_DIR
+
+
+SUFFIX = ".json.gz"
+
+
+class CheckpointStore:
+    """
+    Per-run agent output checkpoints.
+    """
+
+    def __init__(self, base_dir: Path = CHECKPOINT_DIR):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    # --------------------------------------------------
+
+    def _run_dir(self, media_id: str, run_id: str) -> Path:
+        return self.base_dir / media_id / run_id
+
+    # --------------------------------------------------
+
+    def save(self, run_id: str, output: BaseAgentOutput):
+        run_dir = self._run_dir(output.media_id, run_id)
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        path = run_dir / f"{output.agent_name}{SUFFIX}"
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(gzip.compress(output.model_dump_json().encode("utf-8")))
+
+        # A crash mid-write never leaves a truncated checkpoint behind
+        os.replace(tmp, path)
+
+    def load(self, media_id: str, run_id: str) -> Dict[str, BaseAgentOutput]:
+        """
+        Returns the checkpointed outputs of a run keyed by agent name.
+        """
+        run_dir = self._run_dir(media_id, run_id)
+        if not run_dir.exists():
+            return {}
+
+        outputs: Dict[str, BaseAgentOutput] = {}
+        for path in run_dir.glob(f"*{SUFFIX}"):
+            agent_name = path.name[: -len(SUFFIX)]
+            if agent_name not in CONTEXT_KEYS:
+                continue
+
+            schema = OUTPUT_SCHEMAS[CONTEXT_KEYS[agent_name]]
+            outputs[agent_name] = schema.model_validate_json(
+                gzip.decompress(path.read_bytes())
+            )
+
+        return outputs
+
+    # --------------------------------------------------
+
+    def resumable_run_id(self, media_id: str) -> Optional[str]:
+        """
+        Returns the most recent run of a media that did not
+        succeed, or None if there is nothing to resume.
+        """
+        media_dir = self.base_dir / media_id
+        if not media_dir.exists():
+            return None
+
+        runs = sorted(
+            (p for p in media_dir.iterdir() if p.is_dir()),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        return runs[0].name if runs else None
+
+    # --------------------------------------------------
+
+    def clear(self, media_id: str, run_id: Optional[str] = None):
+        path = self.base_dir / media_id
+        if run_id is not None:
+            path = path / run_id
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,99 @@
+"""
+Context Loader
+--------------
+
+Rebuilds the agent context of a previous analysis
+from persisted insights, so pages can reopen it
+without re-running the pipeline.
+
+Responsible for:
+- Mapping agent names to context keys and output schemas
+- Fetching all stored outputs of a media in one query
+- Validating each output only when it is first accessed
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Type
+
+from src.schemas.agent_outputs import (
+    AudioAnalysisOutput,
+    BaseAgentOutput,
+    EmotionAnalysisOutput,
+    ReasoningOutput,
+    RiskAssessmentOutput,
+    SummaryTreeOutput,
+    TaggingOutput,
+    VideoAnalysisOutput,
+)
+from src.storage.backend import StorageBackend
+from src.storage.factory import get_storage_backend
+
+
+# Context key each agent's output is stored under
+CONTEXT_KEYS = {
+    "AudioAgent": "audio",
+    "EmotionAgent": "emotion",
+    "TaggingAgent": "tagging",
+    "SummaryAgent": "summary",
+    "VideoAgent": "video",
+    "ReasoningAgent": "reasoning",
+    "RiskAgent": "risk",
+}
+
+OUTPUT_SCHEMAS: Dict[str, Type[BaseAgentOutput]] = {
+    "audio": AudioAnalysisOutput,
+    "emotion": EmotionAnalysisOutput,
+    "tagging": TaggingOutput,
+    "summary": SummaryTreeOutput,
+    "video": VideoAnalysisOutput,
+    "reasoning": ReasoningOutput,
+    "risk": RiskAssessmentOutput,
+}
+
+
+class LazyAgentContext(Mapping):
+    """
+    Read-only context dict backed by stored insight payloads.
+    Payloads are parsed into their output schema on first access.
+    """
+
+    def __init__(self, media_id: str, payloads: Dict[str, Dict[str, Any]]):
+        self.media_id = media_id
+        self._payloads = {
+            CONTEXT_KEYS[agent_name]: payload
+            for agent_name, payload in payloads.items()
+            if agent_name in CONTEXT_KEYS
+        }
+        self._outputs: Dict[str, BaseAgentOutput] = {}
+
+    # --------------------------------------------------
+
+    def __getitem__(self, key: str) -> BaseAgentOutput:
+        output = self._outputs.get(key)
+        if output is None:
+            output = OUTPUT_SCHEMAS[key].model_validate(self._payloads[key])
+            self._outputs[key] = output
+        return output
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._payloads)
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+def load_context(
+    media_id: str,
+    storage: Optional[StorageBackend] = None,
+) -> Optional[LazyAgentContext]:
+    """
+    Returns the stored context of a media item,
+    or None if it has never been analysed.
+    """
+    storage = storage or get_storage_backend()
+    payloads = storage.get_insights(media_id)
+
+    if "AudioAgent" not in payloads:
+        return None
+
+    return LazyAgentContext(media_id, payloads)
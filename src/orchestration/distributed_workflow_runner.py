@@ -0,0 +1,358 @@
+"""
+Distributed Workflow Runner
+---------------------------
+
+Coordinator that runs one media pipeline as stage work items
+on the stage broker, executed by stage workers on any node.
+
+- The audio is split into TRANSCRIBE_SEGMENT_SECONDS segments and
+  the sampled frames into FRAME_WINDOW_SIZE windows, one work item
+  each; their outputs are merged here
+- Every other agent is one work item, published as soon as all of
+  its dependencies have finished
+- Inputs and outputs travel through the shared ArtifactStore; the
+  broker only carries artifact keys
+- Item ids derive from (media_id, run_id, stage), so a resumed run
+  republishes its plan without duplicating finished work
+
+Persistence, indexing, checkpoints and incremental reuse stay on
+the coordinator, exactly as in WorkflowRunner. The fused text agent
+is not used: Emotion, Tagging and Risk run as separate items.
+"""
+
+import math
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.ingestion.media_probe import probe_duration_seconds
+from src.jobs.stage_broker import ItemStatus, StageBroker, get_stage_broker
+from src.jobs.stages import ANALYZE_FRAMES, RUN_AGENT, TRANSCRIBE_SEGMENT
+from src.orchestration.context_loader import CONTEXT_KEYS, OUTPUT_SCHEMAS
+from src.orchestration.fingerprint import stamp_fingerprint
+from src.orchestration.workflow_runner import WorkflowRunner
+from src.schemas.agent_outputs import (
+    AudioAnalysisOutput,
+    BaseAgentOutput,
+    VideoAnalysisOutput,
+)
+from src.storage.artifact_store import ArtifactStore
+from config.config import (
+    FRAME_WINDOW_SIZE,
+    STAGE_POLL_SECONDS,
+    TRANSCRIBE_SEGMENT_SECONDS,
+)
+
+
+class DistributedWorkflowRunner(WorkflowRunner):
+    """
+    Executes the agent graph for one media item on stage workers.
+    """
+
+    def __init__(
+        self,
+        media_id: str,
+        run_id: Optional[str] = None,
+        on_progress: Optional[Callable[[str, int, int], None]] = None,
+        broker: Optional[StageBroker] = None,
+        artifacts: Optional[ArtifactStore] = None,
+        poll_seconds: float = STAGE_POLL_SECONDS,
+    ):
+        super().__init__(media_id=media_id, run_id=run_id, on_progress=on_progress)
+        self.broker = broker or get_stage_broker()
+        self.artifacts = artifacts or ArtifactStore()
+        self.poll_seconds = poll_seconds
+        self._fingerprints: Dict[str, str] = {}
+        self._context_artifacts: Dict[str, Tuple[int, str]] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def run(
+        self,
+        audio_path: str,
+        frame_paths: list[str] | None = None,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Executes the full agent pipeline, publishing each node once
+        its dependencies have finished and waiting for the workers.
+        """
+        if resume:
+            self._restore_checkpoints()
+
+        order = self.graph.execution_order()
+        settled: Set[str] = set(self._completed)
+        pending: Dict[str, List[str]] = {}
+
+        while len(settled) < len(order):
+            for agent_name in order:
+                if agent_name in settled or agent_name in pending:
+                    continue
+                if not set(self.graph.nodes[agent_name].depends_on) <= settled:
+                    continue
+
+                item_ids = self._dispatch(agent_name, audio_path, frame_paths)
+                if item_ids:
+                    pending[agent_name] = item_ids
+                else:
+                    # Disabled or reused: nothing to wait for
+                    settled.add(agent_name)
+                    self._report_progress(agent_name, len(settled), len(order))
+
+            finished = self._collect(pending)
+            for agent_name in finished:
+                del pending[agent_name]
+                settled.add(agent_name)
+                self._report_progress(agent_name, len(settled), len(order))
+
+            if pending and not finished:
+                time.sleep(self.poll_seconds)
+
+        self._finish_run()
+        return self.context
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def _dispatch(
+        self,
+        agent_name: str,
+        audio_path: str,
+        frame_paths: list[str] | None,
+    ) -> List[str]:
+        """
+        Publishes the work items of a graph node and returns their
+        ids, or none if the node is disabled or its output reused.
+        """
+        agent = self._build_agent(agent_name, audio_path, frame_paths)
+        if agent is None:
+            return []
+
+        fingerprint, reused = self._memoized(agent, audio_path, frame_paths)
+        if reused is not None:
+            self._store_reused([reused])
+            return []
+
+        self._fingerprints[agent_name] = fingerprint
+
+        if agent_name == "AudioAgent":
+            return self._publish_segments(audio_path)
+        if agent_name == "VideoAgent":
+            return self._publish_frame_windows(frame_paths)
+        return [self._publish_agent(agent_name)]
+
+    def _publish_segments(self, audio_path: str) -> List[str]:
+        audio = self.artifacts.put_file(
+            self._artifact_key(f"audio{os.path.splitext(audio_path)[-1]}"),
+            audio_path,
+        )
+
+        # Short or unprobeable audio is transcribed as a whole
+        duration = probe_duration_seconds(audio_path) or 0.0
+        count = max(math.ceil(duration / TRANSCRIBE_SEGMENT_SECONDS), 1)
+
+        item_ids = []
+        for index in range(count):
+            start = index * TRANSCRIBE_SEGMENT_SECONDS
+            item_ids.append(
+                self._publish(
+                    TRANSCRIBE_SEGMENT,
+                    index,
+                    {
+                        "audio": audio,
+                        "start": start if count > 1 else 0.0,
+                        "end": start + TRANSCRIBE_SEGMENT_SECONDS if count > 1 else None,
+                    },
+                )
+            )
+
+        return item_ids
+
+    def _publish_frame_windows(self, frame_paths: List[str]) -> List[str]:
+        frames = [
+            self.artifacts.put_file(
+                self._artifact_key("frames", f"{i}{os.path.splitext(path)[-1]}"),
+                path,
+            )
+            for i, path in enumerate(frame_paths)
+        ]
+
+        return [
+            self._publish(
+                ANALYZE_FRAMES,
+                index,
+                {"frames": frames[start:start + FRAME_WINDOW_SIZE]},
+            )
+            for index, start in enumerate(range(0, len(frames), FRAME_WINDOW_SIZE))
+        ]
+
+    def _publish_agent(self, agent_name: str) -> str:
+        return self._publish(
+            RUN_AGENT,
+            agent_name,
+            {
+                "agent_name": agent_name,
+                "context": {key: self._context_artifact(key) for key in self.context},
+            },
+        )
+
+    def _publish(self, kind: str, part: Any, payload: Dict[str, Any]) -> str:
+        item_id = f"{self.media_id}:{self.run_id}:{kind}:{part}"
+        self.broker.publish(
+            item_id,
+            kind,
+            {
+                **payload,
+                "media_id": self.media_id,
+                "output": self._artifact_key("outputs", f"{kind}-{part}.json"),
+            },
+        )
+        return item_id
+
+    # ------------------------------------------------------------------
+    # Collecting
+    # ------------------------------------------------------------------
+
+    def _collect(self, pending: Dict[str, List[str]]) -> List[str]:
+        """
+        Stores the output of every node whose items have all
+        finished and returns those nodes.
+        """
+        statuses = self.broker.statuses(
+            item_id for item_ids in pending.values() for item_id in item_ids
+        )
+
+        finished = []
+        for agent_name, item_ids in pending.items():
+            for item_id in item_ids:
+                if statuses[item_id] is None:
+                    raise RuntimeError(f"Work item {item_id} is unknown to the broker")
+            if not all(statuses[item_id].finished for item_id in item_ids):
+                continue
+
+            outputs = [self._item_output(agent_name, statuses[i]) for i in item_ids]
+            # Before merging, which keeps no per-item metadata
+            self._charge(*outputs)
+            if agent_name == "AudioAgent":
+                output = _merge_segments(outputs)
+            elif agent_name == "VideoAgent":
+                output = _merge_frame_windows(outputs)
+            else:
+                output = outputs[0]
+
+            stamp_fingerprint(output, self._fingerprints.pop(agent_name))
+            self._store_output(agent_name, output)
+            finished.append(agent_name)
+
+        return finished
+
+    def _item_output(self, agent_name: str, status: ItemStatus) -> BaseAgentOutput:
+        schema = OUTPUT_SCHEMAS[CONTEXT_KEYS[agent_name]]
+        if status.result is None:
+            # The stage itself crashed on every attempt
+            return schema(
+                agent_name=agent_name,
+                media_id=self.media_id,
+                success=False,
+                error_message=status.error,
+            )
+
+        return self.artifacts.get_model(status.result["output"], schema)
+
+    # ------------------------------------------------------------------
+    # Artifacts
+    # ------------------------------------------------------------------
+
+    def _artifact_key(self, *parts: str) -> str:
+        return "/".join(["runs", self.media_id, self.run_id, *parts])
+
+    def _context_artifact(self, key: str) -> str:
+        output = self.context[key]
+
+        # Written once per output object, like the digests
+        cached = self._context_artifacts.get(key)
+        if cached is None or cached[0] != id(output):
+            artifact = self.artifacts.put_model(
+                self._artifact_key("context", f"{key}.json"), output
+            )
+            cached = (id(output), artifact)
+            self._context_artifacts[key] = cached
+
+        return cached[1]
+
+    def _finish_run(self):
+        super()._finish_run()
+        # Inputs and stage outputs are only needed until the run completes
+        self.artifacts.clear(self._artifact_key())
+
+
+# ----------------------------------------------------------------------
+# Merging
+# ----------------------------------------------------------------------
+
+def _merge_segments(outputs: List[BaseAgentOutput]) -> BaseAgentOutput:
+    """
+    Joins segment transcripts, in order, into one AudioAgent output.
+    """
+    if len(outputs) == 1:
+        return outputs[0]
+
+    for index, output in enumerate(outputs):
+        if not output.success:
+            output.error_message = f"segment {index}: {output.error_message}"
+            return output
+
+    chunks = [chunk for output in outputs for chunk in output.transcript_chunks]
+    if not chunks:
+        return AudioAnalysisOutput(
+            agent_name="AudioAgent",
+            media_id=outputs[0].media_id,
+            success=False,
+            error_message="Whisper returned no transcription segments "
+            "(audio may be silent or unsupported)",
+        )
+
+    return AudioAnalysisOutput(
+        agent_name="AudioAgent",
+        media_id=outputs[0].media_id,
+        success=True,
+        language=next((o.language for o in outputs if o.language), None),
+        duration_seconds=chunks[-1].end_time,
+        transcript_chunks=chunks,
+        full_transcript=" ".join(chunk.text for chunk in chunks),
+        metadata={"segments": len(outputs)},
+    )
+
+
+def _merge_frame_windows(outputs: List[BaseAgentOutput]) -> BaseAgentOutput:
+    """
+    Concatenates the scenes of all frame windows into one
+    VideoAgent output.
+    """
+    if len(outputs) == 1:
+        return outputs[0]
+
+    for index, output in enumerate(outputs):
+        if not output.success:
+            output.error_message = f"frame window {index}: {output.error_message}"
+            return output
+
+    scenes = [
+        scene.model_copy(update={"scene_id": scene_id})
+        for scene_id, scene in enumerate(
+            (scene for output in outputs for scene in output.scenes),
+            start=1,
+        )
+    ]
+
+    return VideoAnalysisOutput(
+        agent_name="VideoAgent",
+        media_id=outputs[0].media_id,
+        success=True,
+        total_scenes=len(scenes),
+        scenes=scenes,
+        metadata={"frame_windows": len(outputs)},
+    )
@@ -0,0 +1,38 @@
+"""
+Executors
+---------
+
+Shared executor for CPU-bound pipeline stages
+(Whisper transcription, frame extraction, image encoding)
+when running under asyncio.
+
+A small, bounded pool keeps hundreds of concurrent media
+pipelines from starting hundreds of Whisper runs at once.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable
+
+from config.config import CPU_STAGE_WORKERS
+
+
+@lru_cache(maxsize=1)
+def get_cpu_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=CPU_STAGE_WORKERS,
+        thread_name_prefix="sentinel-cpu",
+    )
+
+
+async def run_cpu_bound(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs a blocking, CPU-heavy callable on the shared CPU executor
+    without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_cpu_executor(),
+        partial(fn, *args, **kwargs),
+    )
@@ -0,0 +1,76 @@
+"""
+Fingerprints
+------------
+
+Content hashes used to decide which agent graph nodes
+must be recomputed in an incremental run.
+
+A node's fingerprint covers everything its output depends on:
+- the agent's code (its module source and `version`)
+- its fingerprint_settings() (model, config, ...)
+- the digests of its upstream outputs
+- raw inputs such as the audio file or sampled frames
+"""
+
+import hashlib
+import inspect
+import json
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from src.agents.base_agent import BaseAgent
+from src.schemas.agent_outputs import BaseAgentOutput
+
+
+# Key under which an output's fingerprint is kept in its metadata
+FINGERPRINT_KEY = "fingerprint"
+
+
+@lru_cache(maxsize=None)
+def agent_code_version(agent_cls: type) -> str:
+    source = inspect.getsource(sys.modules[agent_cls.__module__])
+    return hashlib.sha256(
+        f"{agent_cls.__qualname__}\n{agent_cls.version}\n{source}".encode("utf-8")
+    ).hexdigest()
+
+
+def output_digest(output: BaseAgentOutput) -> str:
+    """
+    Hash of an output's content; metadata (timings, usage,
+    fingerprints) is excluded so it does not cascade.
+    """
+    return hashlib.sha256(
+        output.model_dump_json(exclude={"metadata"}).encode("utf-8")
+    ).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def node_fingerprint(
+    agent: BaseAgent,
+    upstream: Dict[str, Optional[str]],
+    inputs: Optional[List[str]] = None,
+) -> str:
+    payload: Dict[str, Any] = {
+        "agent": agent.agent_name,
+        "code": agent_code_version(type(agent)),
+        "settings": agent.fingerprint_settings(),
+        "upstream": upstream,
+        "inputs": inputs or [],
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def stamp_fingerprint(output: BaseAgentOutput, fingerprint: str):
+    output.metadata = output.metadata or {}
+    output.metadata[FINGERPRINT_KEY] = fingerprint
+
+
+def stored_fingerprint(payload: Dict[str, Any]) -> Optional[str]:
+    return (payload.get("metadata") or {}).get(FINGERPRINT_KEY)
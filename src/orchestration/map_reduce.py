@@ -0,0 +1,113 @@
+"""
+Map-Reduce Engine
+-----------------
+
+Runs an analysis function over transcript windows
+concurrently, then merges the partial results with
+a single reduce step.
+
+Used by agents that must cover the whole transcript
+without silently truncating it.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Generic, List, TypeVar
+
+from src.processing.transcript_windower import TranscriptWindow
+from config.config import MAP_REDUCE_MAX_WORKERS
+
+P = TypeVar("P")
+
+
+class MapReduceEngine(Generic[P]):
+    """
+    Concurrent map over windows followed by a reduce.
+
+    Map calls are network-bound LLM requests, so a thread
+    pool (or bounded coroutines, for the async variants) keeps
+    wall-clock time close to the slowest window instead of the
+    sum of all windows.
+    """
+
+    def __init__(self, max_workers: int = MAP_REDUCE_MAX_WORKERS):
+        self.max_workers = max(max_workers, 1)
+
+    # --------------------------------------------------
+
+    def map(
+        self,
+        windows: List[TranscriptWindow],
+        map_fn: Callable[[TranscriptWindow], P],
+    ) -> List[P]:
+        """
+        Applies map_fn to every window, preserving window order.
+        """
+        if len(windows) == 1:
+            return [map_fn(windows[0])]
+
+        workers = min(self.max_workers, len(windows))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(map_fn, windows))
+
+    # --------------------------------------------------
+
+    def run(
+        self,
+        windows: List[TranscriptWindow],
+        map_fn: Callable[[TranscriptWindow], P],
+        reduce_fn: Callable[[List[P]], P],
+    ) -> P:
+        """
+        Maps all windows and reduces the partial results.
+        A single window is returned as-is without a reduce call.
+        """
+        if not windows:
+            raise ValueError("At least one window is required for map-reduce")
+
+        partials = self.map(windows, map_fn)
+
+        if len(partials) == 1:
+            return partials[0]
+
+        return reduce_fn(partials)
+
+    # --------------------------------------------------
+
+    async def amap(
+        self,
+        windows: List[TranscriptWindow],
+        map_fn: Callable[[TranscriptWindow], Awaitable[P]],
+    ) -> List[P]:
+        """
+        Async map with at most max_workers calls in flight,
+        preserving window order.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def bounded(window: TranscriptWindow) -> P:
+            async with semaphore:
+                return await map_fn(window)
+
+        return list(await asyncio.gather(*(bounded(w) for w in windows)))
+
+    # --------------------------------------------------
+
+    async def arun(
+        self,
+        windows: List[TranscriptWindow],
+        map_fn: Callable[[TranscriptWindow], Awaitable[P]],
+        reduce_fn: Callable[[List[P]], Awaitable[P]],
+    ) -> P:
+        """
+        Async counterpart of run().
+        """
+        if not windows:
+            raise ValueError("At least one window is required for map-reduce")
+
+        partials = await self.amap(windows, map_fn)
+
+        if len(partials) == 1:
+            return partials[0]
+
+        return await reduce_fn(partials)
@@ -4,40 +4,96 @@ Workflow Runner
 
 Executes the agent graph in order,
 passing outputs between agents and
-persisting outputs where required.
+persisting each output as it completes.
+
+Each completed output is also checkpointed under
+(media_id, run_id); a resumed run reloads them and
+executes only the missing or failed nodes.
+
+Outputs are stamped with a fingerprint of their inputs;
+a node whose fingerprint matches its stored output is
+reused instead of recomputed (incremental runs).
 """
 
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Mapping, Optional, Set, Tuple
+from uuid import uuid4
 
 from src.orchestration.agent_graph import AgentGraph
+from src.orchestration.checkpoint_store import CheckpointStore
+from src.orchestration.context_loader import CONTEXT_KEYS, OUTPUT_SCHEMAS
+from src.orchestration.fingerprint import (
+    file_digest,
+    node_fingerprint,
+    output_digest,
+    stamp_fingerprint,
+    stored_fingerprint,
+)
+
+# Agent modules are imported on first use, see src/agents/registry.py
+from src.agents.base_agent import BaseAgent
+from src.agents.registry import get_agent_class
 
-from src.agents.audio_agent import AudioAgent
-from src.agents.emotion_agent import EmotionAgent
-from src.agents.tagging_agent import TaggingAgent
-from src.agents.video_agent import VideoAgent
-from src.agents.reasoning_agent import ReasoningAgent
-from src.agents.risk_agent import RiskAgent
+if TYPE_CHECKING:
+    from src.agents.text_analysis_agent import TextAnalysisAgent
 
-from src.storage.elastic.es_client import get_es_client
+from src.processing.token_counter import count_tokens
+from src.rag.answer_cache import get_answer_cache
+from src.rag.bm25_index import get_bm25_index
+from src.rag.embeddings import EmbeddingPipeline
+from src.rag.local_vector_index import get_local_vector_index
+from src.rag.summary_tree import SummaryTreeStore
+from src.schemas.agent_outputs import AudioAnalysisOutput, BaseAgentOutput
+from src.storage.factory import get_storage_backend
 from config.config import (
     ENABLE_VIDEO_AGENT,
     ENABLE_EMOTION_AGENT,
     ENABLE_RISK_AGENT,
-    MEDIA_TRANSCRIPTS_INDEX,
+    ENABLE_FUSED_TEXT_AGENT,
+    ENABLE_INCREMENTAL_RUNS,
+    ENABLE_SEMANTIC_RETRIEVAL,
+    FUSED_TEXT_MAX_TOKENS,
 )
 
 
+# Agents whose outputs the fused TextAnalysisAgent can produce,
+# mapped to their context keys. The call is made at the first of these
+# nodes, before ReasoningAgent, so a fused risk output is assessed
+# from the transcript without ReasoningAgent's conclusions
+FUSED_CONTEXT_KEYS = {
+    "EmotionAgent": "emotion",
+    "TaggingAgent": "tagging",
+    "RiskAgent": "risk",
+}
+
+
 class WorkflowRunner:
     """
     Central orchestrator for executing
     the agent pipeline.
     """
 
-    def __init__(self, media_id: str):
+    def __init__(
+        self,
+        media_id: str,
+        run_id: Optional[str] = None,
+        on_progress: Optional[Callable[[str, int, int], None]] = None,
+    ):
         self.media_id = media_id
+        self.run_id = run_id or uuid4().hex
+        # Called as on_progress(agent_name, nodes_done, nodes_total)
+        self.on_progress = on_progress
         self.graph = AgentGraph()
         self.context: Dict[str, Any] = {}
-        self.es = get_es_client()
+        self.storage = get_storage_backend()
+        self.summary_store = SummaryTreeStore()
+        self.checkpoints = CheckpointStore()
+        self._fused_attempted = False
+        self._completed: Set[str] = set()
+        self._stored_outputs: Optional[Dict[str, Dict[str, Any]]] = None
+        self._digests: Dict[str, Tuple[int, str]] = {}
+        # LLM tokens spent by the agents this attempt ran, excluding
+        # outputs restored from checkpoints or reused from storage
+        self.llm_tokens = 0
 
     # ------------------------------------------------------------------
     # Public API
@@ -47,14 +103,22 @@ class WorkflowRunner:
         self,
         audio_path: str,
         frame_paths: list[str] | None = None,
+        resume: bool = False,
     ) -> Dict[str, Any]:
         """
-        Executes the full agent pipeline.
+        Executes the full agent pipeline. With resume=True, outputs
+        checkpointed by an earlier attempt of this run_id are reused.
         """
+        if resume:
+            self._restore_checkpoints()
 
-        for agent_name in self.graph.execution_order():
-            self._run_agent(agent_name, audio_path, frame_paths)
+        order = self.graph.execution_order()
+        for done, agent_name in enumerate(order, start=1):
+            if agent_name not in self._completed:
+                self._run_agent(agent_name, audio_path, frame_paths)
+            self._report_progress(agent_name, done, len(order))
 
+        self._finish_run()
         return self.context
 
     # ------------------------------------------------------------------
@@ -68,93 +132,403 @@ class WorkflowRunner:
         frame_paths: list[str] | None,
     ):
         # --------------------------------------------------
-        # Audio Agent
+        # Fused text analysis (Emotion + Tagging + Risk)
         # --------------------------------------------------
-        if agent_name == "AudioAgent":
-            agent = AudioAgent(
-                media_id=self.media_id,
-                audio_path=audio_path,
-            )
-            output = agent.run()
-            self.context["audio"] = output
+        if agent_name in FUSED_CONTEXT_KEYS:
+            if self._should_fuse():
+                self._fused_attempted = True
+                agent = self._build_fused_agent()
+                fingerprint, reused = self._memoized_fused(agent)
+
+                if reused:
+                    self._store_reused(reused)
+                else:
+                    output = agent.run()
+                    self._charge(output)
+                    self._store_fused_output(agent, output, fingerprint)
+
+            # Already produced by the fused agent
+            if FUSED_CONTEXT_KEYS[agent_name] in self.context:
+                return
+
+        agent = self._build_agent(agent_name, audio_path, frame_paths)
+        if agent is None:
+            return
+
+        fingerprint, reused = self._memoized(agent, audio_path, frame_paths)
+        if reused is not None:
+            self._store_reused([reused])
+            return
 
-            # ✅ Persist transcript chunks to Elasticsearch (RAG backbone)
+        output = agent.run()
+        self._charge(output)
+        stamp_fingerprint(output, fingerprint)
+        self._store_output(agent_name, output)
+
+    def _build_agent(
+        self,
+        agent_name: str,
+        audio_path: str,
+        frame_paths: list[str] | None,
+    ) -> Optional[BaseAgent]:
+        return build_agent(
+            agent_name,
+            self.media_id,
+            self.context,
+            audio_path,
+            frame_paths,
+        )
+
+    def _store_output(self, agent_name: str, output: BaseAgentOutput):
+        """
+        Records an agent output in the context and persists
+        it where required.
+        """
+        self.context[CONTEXT_KEYS[agent_name]] = output
+
+        # Persist the output so pages can reload it without re-running
+        if output.success:
+            self.storage.store_insight(output)
+
+        # ✅ Persist transcript chunks (RAG backbone)
+        if agent_name == "AudioAgent":
             if output.success and output.transcript_chunks:
-                for chunk in output.transcript_chunks:
-                    self.es.index(
-                        index=MEDIA_TRANSCRIPTS_INDEX,
-                        document={
-                            "media_id": self.media_id,
-                            "text": chunk.text,
-                            "start_time": chunk.start_time,
-                            "end_time": chunk.end_time,
-                        },
-                    )
+                self.storage.index_transcript(
+                    self.media_id,
+                    output.transcript_chunks,
+                )
+                self._index_for_retrieval(output)
 
-        # --------------------------------------------------
-        # Emotion Agent
-        # --------------------------------------------------
-        elif agent_name == "EmotionAgent" and ENABLE_EMOTION_AGENT:
-            agent = EmotionAgent(
-                media_id=self.media_id,
-                transcript_chunks=self.context["audio"].transcript_chunks,
-            )
-            output = agent.run()
-            self.context["emotion"] = output
+        # Persist the tree so chat can reuse it without re-running
+        elif agent_name == "SummaryAgent":
+            if output.success:
+                self.summary_store.save(output)
 
-        # --------------------------------------------------
-        # Tagging Agent
-        # --------------------------------------------------
-        elif agent_name == "TaggingAgent":
-            agent = TaggingAgent(
-                media_id=self.media_id,
-                transcript_text=self.context["audio"].full_transcript,
+        # Last, so a checkpoint implies the side effects above are done
+        if output.success:
+            self.checkpoints.save(self.run_id, output)
+
+    def _charge(self, *outputs: BaseAgentOutput):
+        for output in outputs:
+            usage = (output.metadata or {}).get("llm_usage") or {}
+            self.llm_tokens += usage.get("prompt_tokens", 0) + usage.get(
+                "completion_tokens", 0
             )
-            output = agent.run()
-            self.context["tagging"] = output
 
-        # --------------------------------------------------
-        # Video Agent
-        # --------------------------------------------------
-        elif agent_name == "VideoAgent" and ENABLE_VIDEO_AGENT:
-            if frame_paths:
-                agent = VideoAgent(
-                    media_id=self.media_id,
-                    frame_paths=frame_paths,
+    def _invalidate_answers(self):
+        # Chat answers about the previous analysis are now stale
+        get_answer_cache().invalidate(self.media_id)
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def _restore_checkpoints(self):
+        """
+        Loads the successful outputs of an earlier attempt of
+        this run into the context and marks their nodes done.
+        """
+        for agent_name, output in self.checkpoints.load(
+            self.media_id, self.run_id
+        ).items():
+            if agent_name not in self.graph.nodes or not output.success:
+                continue
+
+            self.context[CONTEXT_KEYS[agent_name]] = output
+            self._completed.add(agent_name)
+
+        # Don't re-fuse over outputs that were already restored
+        if self._completed & FUSED_CONTEXT_KEYS.keys():
+            self._fused_attempted = True
+
+    def _report_progress(self, agent_name: str, done: int, total: int):
+        if self.on_progress:
+            self.on_progress(agent_name, done, total)
+
+    def _finish_run(self):
+        self._invalidate_answers()
+
+        # A run with failed nodes stays resumable: only those re-run.
+        # Once every node succeeded, this run and any older partial
+        # runs of the media have nothing left to resume
+        if all(output.success for output in self.context.values()):
+            self.checkpoints.clear(self.media_id)
+
+    # ------------------------------------------------------------------
+    # Incremental runs
+    # ------------------------------------------------------------------
+
+    def _memoized(
+        self,
+        agent: BaseAgent,
+        audio_path: str,
+        frame_paths: list[str] | None,
+    ) -> Tuple[str, Optional[BaseAgentOutput]]:
+        """
+        Fingerprints a graph node and returns it with the stored
+        output of that node if it was computed from the same inputs.
+        """
+        if agent.agent_name == "AudioAgent":
+            inputs = [file_digest(audio_path)]
+        elif agent.agent_name == "VideoAgent":
+            inputs = [file_digest(path) for path in frame_paths or []]
+        else:
+            inputs = []
+
+        upstream = {
+            name: self._digest(CONTEXT_KEYS[name])
+            for name in sorted(self.graph.ancestors(agent.agent_name))
+        }
+        fingerprint = node_fingerprint(agent, upstream, inputs)
+
+        return fingerprint, self._stored_output(agent.agent_name, fingerprint)
+
+    def _memoized_fused(
+        self,
+        agent: "TextAnalysisAgent",
+    ) -> Tuple[str, Optional[List[BaseAgentOutput]]]:
+        fingerprint = node_fingerprint(
+            agent,
+            {"AudioAgent": self._digest("audio")},
+        )
+
+        enabled = {
+            "EmotionAgent": ENABLE_EMOTION_AGENT,
+            "TaggingAgent": True,
+            "RiskAgent": ENABLE_RISK_AGENT,
+        }
+        parts = [
+            self._stored_output(name, fingerprint)
+            for name in FUSED_CONTEXT_KEYS
+            if enabled[name]
+        ]
+
+        # Reuse only if every part came from this same fused call
+        if any(part is None for part in parts):
+            return fingerprint, None
+
+        return fingerprint, parts
+
+    def _stored_output(
+        self,
+        agent_name: str,
+        fingerprint: str,
+    ) -> Optional[BaseAgentOutput]:
+        if not ENABLE_INCREMENTAL_RUNS:
+            return None
+
+        # All stored outputs of the media, fetched in one query
+        if self._stored_outputs is None:
+            self._stored_outputs = self.storage.get_insights(self.media_id)
+
+        payload = self._stored_outputs.get(agent_name)
+        if payload is None or stored_fingerprint(payload) != fingerprint:
+            return None
+
+        return OUTPUT_SCHEMAS[CONTEXT_KEYS[agent_name]].model_validate(payload)
+
+    def _store_reused(self, outputs: List[BaseAgentOutput]):
+        # Already persisted and indexed by the run that produced them
+        for output in outputs:
+            self.context[CONTEXT_KEYS[output.agent_name]] = output
+            self.checkpoints.save(self.run_id, output)
+
+    def _digest(self, key: str) -> Optional[str]:
+        output = self.context.get(key)
+        if output is None or not output.success:
+            return None
+
+        cached = self._digests.get(key)
+        if cached is None or cached[0] != id(output):
+            cached = (id(output), output_digest(output))
+            self._digests[key] = cached
+
+        return cached[1]
+
+    def _index_for_retrieval(self, audio: AudioAnalysisOutput):
+        transcript_text = audio.full_transcript or ""
+
+        # Embed passages for semantic chat retrieval: into the vector
+        # index on Elasticsearch, else into the local vector index
+        if ENABLE_SEMANTIC_RETRIEVAL:
+            if self.storage.name == "elasticsearch":
+                EmbeddingPipeline().index_transcript(
+                    self.storage.es,
+                    self.media_id,
+                    transcript_text,
+                    audio.transcript_chunks,
+                )
+            else:
+                get_local_vector_index(
+                    self.media_id,
+                    transcript_text,
+                    audio.transcript_chunks,
+                    version=audio.transcript_version(),
                 )
-                output = agent.run()
-                self.context["video"] = output
 
-        # --------------------------------------------------
-        # Reasoning Agent
-        # --------------------------------------------------
-        elif agent_name == "ReasoningAgent":
-            agent = ReasoningAgent(
-                media_id=self.media_id,
-                transcript_text=self.context["audio"].full_transcript,
-                emotions=(
-                    self.context.get("emotion").emotion_spikes
-                    if ENABLE_EMOTION_AGENT and self.context.get("emotion")
-                    else []
-                ),
-                topics=self.context.get("tagging").topics,
-                entities=self.context.get("tagging").entities,
-            )
-            output = agent.run()
-            self.context["reasoning"] = output
+        # Warm the local BM25 fallback used by chat
+        get_bm25_index(
+            self.media_id,
+            transcript_text,
+            audio.transcript_chunks,
+            audio.transcript_version(),
+        )
 
-        # --------------------------------------------------
-        # Risk Agent
-        # --------------------------------------------------
-        elif agent_name == "RiskAgent" and ENABLE_RISK_AGENT:
-            agent = RiskAgent(
-                media_id=self.media_id,
-                transcript_text=self.context["audio"].full_transcript,
-                conclusions=self.context.get("reasoning").decisions
-                if self.context.get("reasoning")
-                else [],
-                topics=self.context.get("tagging").topics,
-                entities=self.context.get("tagging").entities,
+    # ------------------------------------------------------------------
+    # Fused mode
+    # ------------------------------------------------------------------
+
+    def _should_fuse(self) -> bool:
+        if not ENABLE_FUSED_TEXT_AGENT or self._fused_attempted:
+            return False
+
+        audio = self.context.get("audio")
+        if not audio or not audio.success or not audio.transcript_chunks:
+            return False
+
+        # Long transcripts go through the map-reduce agents instead
+        return count_tokens(audio.full_transcript or "") <= FUSED_TEXT_MAX_TOKENS
+
+    def _build_fused_agent(self) -> "TextAnalysisAgent":
+        return get_agent_class("TextAnalysisAgent")(
+            media_id=self.media_id,
+            transcript_chunks=self.context["audio"].transcript_chunks,
+        )
+
+    def _store_fused_output(
+        self,
+        agent: "TextAnalysisAgent",
+        output: BaseAgentOutput,
+        fingerprint: Optional[str] = None,
+    ):
+        """
+        Splits a TextAnalysisAgent result into the emotion /
+        tagging / risk context entries. On failure the context
+        is left untouched so the separate agents run.
+        """
+        if not output.success:
+            return
+
+        parts = {
+            "emotion": (output.emotion, ENABLE_EMOTION_AGENT),
+            "tagging": (output.tagging, True),
+            "risk": (output.risk, ENABLE_RISK_AGENT),
+        }
+
+        stored = []
+        for key, (part, enabled) in parts.items():
+            if part is None or not enabled:
+                continue
+
+            part.metadata = part.metadata or {}
+            part.metadata.update(output.metadata or {})
+            part.metadata["fused_by"] = agent.agent_name
+            if fingerprint:
+                stamp_fingerprint(part, fingerprint)
+            self.context[key] = part
+            stored.append(part)
+
+        # One batched write for all parts
+        self.storage.store_insights(stored)
+        for part in stored:
+            self.checkpoints.save(self.run_id, part)
+
+
+# ----------------------------------------------------------------------
+# Agent construction
+# ----------------------------------------------------------------------
+
+def build_agent(
+    agent_name: str,
+    media_id: str,
+    context: Mapping[str, Any],
+    audio_path: Optional[str] = None,
+    frame_paths: list[str] | None = None,
+) -> Optional[BaseAgent]:
+    """
+    Constructs the agent for a graph node from the outputs of its
+    upstream nodes, or returns None if the node is disabled/skipped.
+    """
+    # --------------------------------------------------
+    # Audio Agent
+    # --------------------------------------------------
+    if agent_name == "AudioAgent":
+        return get_agent_class("AudioAgent")(
+            media_id=media_id,
+            audio_path=audio_path,
+        )
+
+    # --------------------------------------------------
+    # Emotion Agent
+    # --------------------------------------------------
+    elif agent_name == "EmotionAgent" and ENABLE_EMOTION_AGENT:
+        return get_agent_class("EmotionAgent")(
+            media_id=media_id,
+            transcript_chunks=context["audio"].transcript_chunks,
+        )
+
+    # --------------------------------------------------
+    # Tagging Agent
+    # --------------------------------------------------
+    elif agent_name == "TaggingAgent":
+        return get_agent_class("TaggingAgent")(
+            media_id=media_id,
+            transcript_text=context["audio"].full_transcript,
+            transcript_chunks=context["audio"].transcript_chunks,
+        )
+
+    # --------------------------------------------------
+    # Summary Agent
+    # --------------------------------------------------
+    elif agent_name == "SummaryAgent":
+        return get_agent_class("SummaryAgent")(
+            media_id=media_id,
+            transcript_text=context["audio"].full_transcript,
+            transcript_chunks=context["audio"].transcript_chunks,
+        )
+
+    # --------------------------------------------------
+    # Video Agent
+    # --------------------------------------------------
+    elif agent_name == "VideoAgent" and ENABLE_VIDEO_AGENT:
+        if frame_paths:
+            return get_agent_class("VideoAgent")(
+                media_id=media_id,
+                frame_paths=frame_paths,
             )
-            output = agent.run()
-            self.context["risk"] = output
+
+    # --------------------------------------------------
+    # Reasoning Agent
+    # --------------------------------------------------
+    elif agent_name == "ReasoningAgent":
+        return get_agent_class("ReasoningAgent")(
+            media_id=media_id,
+            transcript_text=context["audio"].full_transcript,
+            emotions=(
+                context.get("emotion").emotion_spikes
+                if ENABLE_EMOTION_AGENT and context.get("emotion")
+                else []
+            ),
+            topics=context.get("tagging").topics,
+            entities=context.get("tagging").entities,
+            transcript_chunks=context["audio"].transcript_chunks,
+            summary_tree=context.get("summary"),
+        )
+
+    # --------------------------------------------------
+    # Risk Agent
+    # --------------------------------------------------
+    elif agent_name == "RiskAgent" and ENABLE_RISK_AGENT:
+        return get_agent_class("RiskAgent")(
+            media_id=media_id,
+            transcript_text=context["audio"].full_transcript,
+            conclusions=context.get("reasoning").decisions
+            if context.get("reasoning")
+            else [],
+            topics=context.get("tagging").topics,
+            entities=context.get("tagging").entities,
+            transcript_chunks=context["audio"].transcript_chunks,
+            summary_tree=context.get("summary"),
+        )
+
+    return None
@@ -1,4 +1,3 @@
-import cv2
 import os
 import shutil
 from typing import List, Tuple
@@ -17,6 +16,7 @@ class FrameSampler:
         - list of frame paths
         - cleanup function to delete them safely
         """
+        import cv2
 
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
@@ -0,0 +1,48 @@
+"""
+Token Counter
+-------------
+
+Estimates prompt token counts so transcripts can be
+split into windows that fit a model's budget.
+"""
+
+from functools import lru_cache
+
+from config.config import TEXT_MODEL
+
+
+# Rough characters-per-token ratio for English text,
+# used when no tokenizer is available.
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Newer model names are not always registered in tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # Encoding files could not be loaded (e.g. offline)
+        return None
+
+
+def count_tokens(text: str, model: str = TEXT_MODEL) -> int:
+    """
+    Returns the number of tokens in text for the given model.
+    Falls back to a character-based estimate.
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return max(len(text) // CHARS_PER_TOKEN, 1)
+
+    return len(encoding.encode(text, disallowed_special=()))
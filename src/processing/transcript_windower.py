@@ -0,0 +1,146 @@
+"""
+Transcript Windower
+-------------------
+
+Groups transcript content into token-budgeted windows
+for map-reduce analysis of long media.
+
+Windows built from TranscriptChunk objects stay aligned
+to segment boundaries and keep their timestamps.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.processing.chunker import TextChunker
+from src.processing.token_counter import count_tokens
+from src.schemas.agent_outputs import TranscriptChunk
+from config.config import MAP_REDUCE_WINDOW_TOKENS
+
+
+# Average words per token, used to size TextChunker windows
+WORDS_PER_TOKEN = 0.75
+
+
+def format_chunk_line(chunk: TranscriptChunk) -> str:
+    return f"[{chunk.start_time:.1f}s - {chunk.end_time:.1f}s] {chunk.text}"
+
+
+def format_transcript(chunks: List[TranscriptChunk]) -> str:
+    """
+    Canonical timestamped transcript formatting. Every agent uses
+    this so the transcript text is byte-identical across prompts.
+    """
+    return "\n".join(format_chunk_line(chunk) for chunk in chunks)
+
+
+@dataclass
+class TranscriptWindow:
+    index: int
+    text: str
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    token_count: int = 0
+
+    @property
+    def label(self) -> str:
+        if self.start_time is None or self.end_time is None:
+            return f"part {self.index + 1}"
+        return f"{self.start_time:.1f}s - {self.end_time:.1f}s"
+
+
+class TranscriptWindower:
+    """
+    Splits transcripts into windows of at most
+    `max_tokens` tokens each.
+    """
+
+    def __init__(self, max_tokens: int = MAP_REDUCE_WINDOW_TOKENS):
+        self.max_tokens = max_tokens
+
+    # --------------------------------------------------
+
+    def window_chunks(
+        self,
+        chunks: List[TranscriptChunk],
+    ) -> List[TranscriptWindow]:
+        """
+        Groups consecutive transcript chunks into windows.
+        A single chunk larger than the budget gets its own window.
+        """
+        windows: List[TranscriptWindow] = []
+        lines: List[str] = []
+        tokens = 0
+        start_time = None
+        end_time = None
+
+        for chunk in chunks:
+            line = format_chunk_line(chunk)
+            line_tokens = count_tokens(line)
+
+            if lines and tokens + line_tokens > self.max_tokens:
+                windows.append(
+                    TranscriptWindow(
+                        index=len(windows),
+                        text="\n".join(lines),
+                        start_time=start_time,
+                        end_time=end_time,
+                        token_count=tokens,
+                    )
+                )
+                lines, tokens, start_time = [], 0, None
+
+            if start_time is None:
+                start_time = chunk.start_time
+
+            lines.append(line)
+            tokens += line_tokens
+            end_time = chunk.end_time
+
+        if lines:
+            windows.append(
+                TranscriptWindow(
+                    index=len(windows),
+                    text="\n".join(lines),
+                    start_time=start_time,
+                    end_time=end_time,
+                    token_count=tokens,
+                )
+            )
+
+        return windows
+
+    # --------------------------------------------------
+
+    def window_text(self, text: str) -> List[TranscriptWindow]:
+        """
+        Splits plain text (no timestamps) using TextChunker.
+        """
+        chunk_size = max(int(self.max_tokens * WORDS_PER_TOKEN), 1)
+        chunker = TextChunker(
+            chunk_size=chunk_size,
+            overlap=min(50, chunk_size // 10),
+        )
+
+        return [
+            TranscriptWindow(
+                index=i,
+                text=chunk,
+                token_count=count_tokens(chunk),
+            )
+            for i, chunk in enumerate(chunker.chunk(text))
+        ]
+
+    # --------------------------------------------------
+
+    def window(
+        self,
+        transcript_text: str,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+    ) -> List[TranscriptWindow]:
+        """
+        Prefers timestamp-aligned windows when chunks are available.
+        """
+        if transcript_chunks:
+            return self.window_chunks(transcript_chunks)
+        return self.window_text(transcript_text)
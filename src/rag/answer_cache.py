@@ -0,0 +1,188 @@
+"""
+Answer Cache
+------------
+
+Per-media cache of RAG chat answers.
+
+Responsible for:
+- Scoping answers to the conversation they were given in, so a
+  follow-up question never gets an answer written for another one
+- Exact lookups on the normalized question
+- Optional lookups by question embedding similarity
+- LRU eviction across all media
+- Invalidation when a media's analysis changes
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.rag.embeddings import EmbeddingPipeline
+from config.config import (
+    ANSWER_CACHE_SEMANTIC,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_SIZE,
+)
+
+
+def normalize_question(question: str) -> str:
+    """
+    Lowercases, drops punctuation and collapses whitespace, so
+    "Summarize this!" and "summarize  this" share an entry.
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", question.lower()).split())
+
+
+def analysis_fingerprint(*parts: Optional[str]) -> str:
+    """
+    Short hash of the analysis outputs answers depend on
+    (e.g. transcript and media summary). Cached answers from an
+    older analysis of the same media never match a newer one.
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def conversation_fingerprint(
+    summary: Optional[str],
+    messages: List[Dict[str, str]],
+) -> str:
+    """
+    Hash of the conversation a question is asked in. Empty for a
+    fresh conversation, so opening questions are shared across
+    sessions while follow-ups only match the same history.
+    """
+    if not summary and not messages:
+        return ""
+
+    return analysis_fingerprint(
+        summary, *(f"{m['role']}: {m['content']}" for m in messages)
+    )
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    answer: str
+    vector: Optional[np.ndarray] = None
+
+
+class AnswerCache:
+    """
+    Thread-safe LRU of answers keyed by (media_id, analysis version,
+    conversation fingerprint, normalized question).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_SIZE,
+        semantic: bool = ANSWER_CACHE_SEMANTIC,
+        similarity_threshold: float = ANSWER_CACHE_SIMILARITY,
+        embedder: Optional[EmbeddingPipeline] = None,
+    ):
+        self.max_entries = max(max_entries, 1)
+        self.semantic = semantic
+        self.similarity_threshold = similarity_threshold
+        self._embedder = embedder
+
+        self._entries: "OrderedDict[Tuple[str, str, str, str], CachedAnswer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+
+    @property
+    def embedder(self) -> EmbeddingPipeline:
+        if self._embedder is None:
+            self._embedder = EmbeddingPipeline()
+        return self._embedder
+
+    # --------------------------------------------------
+
+    def get(
+        self,
+        media_id: str,
+        question: str,
+        version: str = "",
+        conversation: str = "",
+    ) -> Optional[str]:
+        key = (media_id, version, conversation, normalize_question(question))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.answer
+
+        if not self.semantic:
+            return None
+
+        return self._get_similar(key[:3], question)
+
+    # --------------------------------------------------
+
+    def put(
+        self,
+        media_id: str,
+        question: str,
+        answer: str,
+        version: str = "",
+        conversation: str = "",
+    ):
+        key = (media_id, version, conversation, normalize_question(question))
+        vector = self.embedder.embed_query(key[3]) if self.semantic else None
+
+        with self._lock:
+            self._entries[key] = CachedAnswer(question, answer, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # --------------------------------------------------
+
+    def invalidate(self, media_id: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == media_id]:
+                del self._entries[key]
+
+    # --------------------------------------------------
+
+    def _get_similar(self, scope: Tuple[str, str, str], question: str) -> Optional[str]:
+        # Same media, analysis and conversation; only the wording differs
+        with self._lock:
+            candidates = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if key[:3] == scope and entry.vector is not None
+            ]
+
+        if not candidates:
+            return None
+
+        # Embeddings are cached, so a repeated question costs no API call
+        query_vector = self.embedder.embed_query(normalize_question(question))
+        similarities = np.vstack([e.vector for _, e in candidates]) @ query_vector
+
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        key, entry = candidates[best]
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+        return entry.answer
+
+
+@lru_cache(maxsize=1)
+def get_answer_cache() -> AnswerCache:
+    return AnswerCache()
@@ -0,0 +1,179 @@
+"""
+BM25 Index
+----------
+
+In-memory inverted index with BM25 scoring, used by the
+Retriever when Elasticsearch is unavailable.
+
+Responsible for:
+- Tokenizing passages once and building postings lists
+- Scoring queries by walking only the postings of query terms
+- Caching one index per media for the session
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from src.rag.passages import Passage, build_passages
+from src.schemas.agent_outputs import TranscriptChunk, transcript_digest
+from config.config import (
+    RAG_PASSAGE_WORDS,
+    BM25_K1,
+    BM25_B,
+    RAG_INDEX_CACHE_SIZE,
+)
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be but by did do does for from had has have he her
+    his i if in into is it its me my of on or our she so than that the
+    their them then there these they this to was we were what when where
+    which who why will with you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases and splits text into word tokens,
+    dropping stopwords and possessive suffixes.
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token.endswith("'s"):
+            token = token[:-2]
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    Inverted index over the passages of one transcript.
+    """
+
+    def __init__(
+        self,
+        passages: List[Passage],
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+    ):
+        self.passages = passages
+        self.k1 = k1
+        self.b = b
+
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.doc_lengths: List[int] = []
+
+        for doc_id, passage in enumerate(passages):
+            counts = Counter(tokenize(passage.text))
+            self.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((doc_id, tf))
+
+        n_docs = len(passages)
+        self.avg_doc_length = (
+            sum(self.doc_lengths) / n_docs if n_docs else 0.0
+        )
+        self.idf = {
+            term: math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    # --------------------------------------------------
+    # Construction
+    # --------------------------------------------------
+
+    @classmethod
+    def from_transcript(
+        cls,
+        transcript_text: str,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+        passage_words: int = RAG_PASSAGE_WORDS,
+    ) -> "BM25Index":
+        return cls(
+            build_passages(transcript_text, transcript_chunks, passage_words)
+        )
+
+    # --------------------------------------------------
+    # Search
+    # --------------------------------------------------
+
+    def search(self, query: str, top_k: int) -> List[Tuple[float, Passage]]:
+        """
+        Returns up to top_k (score, passage) pairs, best first.
+        Passages sharing no term with the query are not returned.
+        """
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+
+            idf = self.idf[term]
+            for doc_id, tf in docs:
+                norm = 1 - self.b + self.b * (
+                    self.doc_lengths[doc_id] / self.avg_doc_length
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    tf * (self.k1 + 1) / (tf + self.k1 * norm)
+                )
+
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        return [(score, self.passages[doc_id]) for doc_id, score in ranked[:top_k]]
+
+
+# ----------------------------------------------------------------------
+# Per-media cache
+# ----------------------------------------------------------------------
+
+_index_cache: "OrderedDict[Tuple[str, str], BM25Index]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_bm25_index(
+    media_id: str,
+    transcript_text: str,
+    transcript_chunks: Optional[List[TranscriptChunk]] = None,
+    version: Optional[str] = None,
+) -> BM25Index:
+    """
+    Returns the cached index for a media item, building it on first use.
+    The key includes the transcript version (see transcript_digest) so
+    a re-transcribed media does not reuse a stale index. Pass the
+    version computed when the transcript was stored; without one the
+    transcript is hashed on every call.
+    """
+    key = (media_id, version or transcript_digest(transcript_text, transcript_chunks))
+
+    with _cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = BM25Index.from_transcript(transcript_text, transcript_chunks)
+
+    with _cache_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > RAG_INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+
+    return index
+
+
+def invalidate_bm25_index(media_id: str):
+    """
+    Drops every cached index of a media item.
+    """
+    with _cache_lock:
+        for key in [k for k in _index_cache if k[0] == media_id]:
+            del _index_cache[key]
@@ -0,0 +1,347 @@
+"""
+Embeddings
+----------
+
+Embedding pipeline for semantic retrieval.
+
+Responsible for:
+- Pluggable embedding providers (OpenAI, offline hashing stand-in)
+- Embedding texts in large batches
+- Caching passage embeddings by content hash so unchanged
+  passages are never re-embedded; query embeddings are only
+  kept in a bounded in-memory LRU
+- Bulk-writing transcript passage vectors to the vector index
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+from collections import OrderedDict
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from src.agents.llm_client import get_client
+from src.rag.bm25_index import tokenize
+from src.rag.passages import Passage, build_passages
+from src.schemas.agent_outputs import TranscriptChunk
+from src.storage.elastic.index_manager import IndexManager
+from config.config import (
+    EMBEDDING_MODEL,
+    EMBEDDING_PROVIDER,
+    EMBEDDING_DIMS,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_DIR,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    MEDIA_VECTORS_INDEX,
+)
+
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
+
+
+# ----------------------------------------------------------------------
+# Providers
+# ----------------------------------------------------------------------
+
+class EmbeddingProvider(ABC):
+    """
+    Turns texts into fixed-size, L2-normalized vectors.
+    """
+
+    name: str
+    dims: int
+
+    @property
+    def cache_namespace(self) -> str:
+        """
+        Identifies the vector space, so cached vectors from another
+        model or dimensionality are never mixed in.
+        """
+        return f"{self.name}:{self.dims}"
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns a (len(texts), dims) float32 array.
+        """
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    def __init__(self, model: str = EMBEDDING_MODEL, dims: int = EMBEDDING_DIMS):
+        self.model = model
+        self.dims = dims
+        self.name = f"openai/{model}"
+        self.client = get_client()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        kwargs = {"model": self.model, "input": texts}
+
+        # Only text-embedding-3 models accept a reduced dimensionality
+        if self.model.startswith("text-embedding-3"):
+            kwargs["dimensions"] = self.dims
+
+        response = self.client.embeddings.create(**kwargs)
+        data = sorted(response.data, key=lambda d: d.index)
+
+        return _normalize(np.asarray([d.embedding for d in data], dtype=np.float32))
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic, offline feature-hashing embedder.
+
+    Captures lexical overlap only, but needs no network
+    or model download, which makes it usable for local
+    development and reproducible benchmarks.
+    """
+
+    def __init__(self, dims: int = EMBEDDING_DIMS):
+        self.dims = dims
+        self.name = "hashing"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dims), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            counts: Dict[str, int] = {}
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+
+            for token, tf in counts.items():
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dims] += sign * (1 + math.log(tf))
+
+        return _normalize(vectors)
+
+
+PROVIDERS = {
+    "openai": OpenAIEmbeddingProvider,
+    "hashing": HashingEmbeddingProvider,
+}
+
+
+@lru_cache(maxsize=None)
+def get_embedding_provider(name: str = EMBEDDING_PROVIDER) -> EmbeddingProvider:
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown embedding provider: {name}")
+    return PROVIDERS[name]()
+
+
+# ----------------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------------
+
+class EmbeddingCache:
+    """
+    SQLite-backed cache of vectors keyed by content hash.
+    """
+
+    def __init__(self, path: Path = EMBEDDING_CACHE_DIR / "cache.sqlite3"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    # --------------------------------------------------
+
+    @staticmethod
+    def key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}\n{text}".encode("utf-8")).hexdigest()
+
+    # --------------------------------------------------
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    # --------------------------------------------------
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes())
+                    for key, vector in items.items()
+                ],
+            )
+            self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache:
+    return EmbeddingCache()
+
+
+# ----------------------------------------------------------------------
+# Pipeline
+# ----------------------------------------------------------------------
+
+class EmbeddingPipeline:
+    """
+    Embeds texts through the cache and writes transcript
+    passage vectors to Elasticsearch.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[EmbeddingProvider] = None,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        query_cache_size: int = QUERY_EMBEDDING_CACHE_SIZE,
+    ):
+        self.provider = provider or get_embedding_provider()
+        self.cache = cache or get_embedding_cache()
+        self.batch_size = max(batch_size, 1)
+        self.query_cache_size = query_cache_size
+        self._query_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_lock = threading.Lock()
+
+    # --------------------------------------------------
+    # Embedding
+    # --------------------------------------------------
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Returns one vector per text. Only texts missing from the
+        cache are sent to the provider, in batches of batch_size.
+        """
+        if not texts:
+            return np.zeros((0, self.provider.dims), dtype=np.float32)
+
+        namespace = self.provider.cache_namespace
+        keys = [EmbeddingCache.key(namespace, text) for text in texts]
+        vectors = self.cache.get_many(list(set(keys)))
+
+        # Deduplicate identical texts before calling the provider
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        missing_keys = list(missing)
+
+        for i in range(0, len(missing_keys), self.batch_size):
+            batch_keys = missing_keys[i : i + self.batch_size]
+            embedded = self.provider.embed([missing[k] for k in batch_keys])
+            fresh = dict(zip(batch_keys, embedded))
+            self.cache.put_many(fresh)
+            vectors.update(fresh)
+
+        return np.vstack([vectors[key] for key in keys])
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embeds a question. Questions are rarely repeated across
+        processes, so they bypass the on-disk cache and are kept
+        in a per-process LRU of query_cache_size entries.
+        """
+        key = EmbeddingCache.key(self.provider.cache_namespace, query)
+
+        with self._query_lock:
+            vector = self._query_vectors.get(key)
+            if vector is not None:
+                self._query_vectors.move_to_end(key)
+                return vector
+
+        vector = self.provider.embed([query])[0]
+
+        with self._query_lock:
+            self._query_vectors[key] = vector
+            while len(self._query_vectors) > self.query_cache_size:
+                self._query_vectors.popitem(last=False)
+
+        return vector
+
+    # --------------------------------------------------
+    # Indexing
+    # --------------------------------------------------
+
+    def index_transcript(
+        self,
+        es: "Elasticsearch",
+        media_id: str,
+        transcript_text: str,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+    ) -> int:
+        """
+        Embeds the transcript passages of a media item and bulk-writes
+        them to the vector index, replacing any previous vectors.
+        Returns the number of passages indexed.
+        """
+        from elasticsearch.helpers import bulk
+
+        passages = build_passages(transcript_text, transcript_chunks)
+        if not passages:
+            return 0
+
+        vectors = self.embed([p.text for p in passages])
+
+        IndexManager(es).create_vector_index(
+            index_name=MEDIA_VECTORS_INDEX,
+            dims=self.provider.dims,
+        )
+
+        es.delete_by_query(
+            index=MEDIA_VECTORS_INDEX,
+            body={"query": {"term": {"media_id": media_id}}},
+            conflicts="proceed",
+        )
+
+        bulk(
+            es,
+            (
+                _vector_action(media_id, passage, vector)
+                for passage, vector in zip(passages, vectors)
+            ),
+            chunk_size=self.batch_size,
+        )
+
+        return len(passages)
+
+
+# ----------------------------------------------------------------------
+# Utilities
+# ----------------------------------------------------------------------
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _vector_action(media_id: str, passage: Passage, vector: np.ndarray) -> dict:
+    return {
+        "_index": MEDIA_VECTORS_INDEX,
+        "_id": f"{media_id}:{passage.index}",
+        "_source": {
+            "media_id": media_id,
+            "passage_index": passage.index,
+            "text": passage.text,
+            "start_time": passage.start_time,
+            "end_time": passage.end_time,
+            "embedding": vector.tolist(),
+        },
+    }
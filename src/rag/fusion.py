@@ -0,0 +1,121 @@
+"""
+Fusion
+------
+
+Rank fusion and diversification for hybrid retrieval.
+
+Responsible for:
+- Reciprocal rank fusion of lexical and semantic rankings
+- Dropping duplicate / overlapping passages
+- Vectorized maximal marginal relevance (MMR) selection
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.rag.passages import Passage
+from config.config import RRF_K, MMR_LAMBDA
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = RRF_K,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuses ranked id lists: score(d) = sum over lists of 1 / (k + rank).
+    Only ranks are used, so BM25 and cosine scores never need to be
+    calibrated against each other.
+    """
+    scores: Dict[Hashable, float] = {}
+
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+def dedupe_passages(
+    passages: List[Passage],
+    max_overlap: float = 0.5,
+) -> List[int]:
+    """
+    Returns the positions of passages to keep, in order.
+
+    A passage is dropped when its normalized text was already
+    kept, or when more than max_overlap of its time span is
+    covered by a passage kept before it.
+    """
+    kept: List[int] = []
+    seen_texts = set()
+
+    for i, passage in enumerate(passages):
+        text_key = " ".join(passage.text.lower().split())
+        if text_key in seen_texts:
+            continue
+
+        if passage.start_time is not None and passage.end_time is not None:
+            duration = max(passage.end_time - passage.start_time, 1e-6)
+            if any(
+                _overlap(passage, passages[j]) / duration > max_overlap
+                for j in kept
+            ):
+                continue
+
+        kept.append(i)
+        seen_texts.add(text_key)
+
+    return kept
+
+
+def mmr(
+    query_vector: np.ndarray,
+    doc_vectors: np.ndarray,
+    top_k: int,
+    relevance: Optional[np.ndarray] = None,
+    lambda_: float = MMR_LAMBDA,
+) -> List[int]:
+    """
+    Greedy MMR over L2-normalized vectors.
+
+    relevance is a per-document score in [0, 1] and defaults to
+    cosine similarity with the query. Pairwise
+    similarities are computed once as a matrix product, and each
+    step updates the running max-similarity vector, so selection
+    is O(n * top_k) after an O(n^2 * d) setup.
+    """
+    n = len(doc_vectors)
+    if n == 0:
+        return []
+
+    top_k = min(top_k, n)
+    if relevance is None:
+        relevance = doc_vectors @ query_vector
+    similarity = doc_vectors @ doc_vectors.T
+
+    selected: List[int] = []
+    max_similarity = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+
+    for _ in range(top_k):
+        redundancy = np.where(np.isfinite(max_similarity), max_similarity, 0.0)
+        scores = lambda_ * relevance - (1 - lambda_) * redundancy
+        scores[~available] = -np.inf
+
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[best])
+
+    return selected
+
+
+# ----------------------------------------------------------------------
+# Utilities
+# ----------------------------------------------------------------------
+
+def _overlap(a: Passage, b: Passage) -> float:
+    if b.start_time is None or b.end_time is None:
+        return 0.0
+    return max(0.0, min(a.end_time, b.end_time) - max(a.start_time, b.start_time))
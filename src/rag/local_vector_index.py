@@ -0,0 +1,439 @@
+"""
+Local Vector Index
+------------------
+
+In-process approximate nearest-neighbour search over transcript
+passage embeddings, used when Elasticsearch is unavailable.
+
+Responsible for:
+- Exact search over a float32 matrix for small corpora
+- An HNSW graph for larger corpora
+- Persisting each media index as .npy files that are
+  memory-mapped on load instead of read into RAM
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.rag.embeddings import EmbeddingPipeline
+from src.rag.passages import Passage, build_passages
+from src.schemas.agent_outputs import TranscriptChunk, transcript_digest
+from config.config import (
+    VECTOR_DIR,
+    LOCAL_ANN_THRESHOLD,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    RAG_INDEX_CACHE_SIZE,
+    RAG_PASSAGE_WORDS,
+)
+
+
+# ----------------------------------------------------------------------
+# Indices
+# ----------------------------------------------------------------------
+
+class FlatVectorIndex:
+    """
+    Exact cosine search: one matrix-vector product per query.
+    """
+
+    kind = "flat"
+
+    def __init__(self, vectors: np.ndarray, passages: List[Passage]):
+        self.vectors = vectors
+        self.passages = passages
+
+    def search(self, query_vector: np.ndarray, top_k: int) -> List[Tuple[float, Passage]]:
+        if not len(self.passages):
+            return []
+
+        scores = self.vectors @ query_vector
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+
+        return [(float(scores[i]), self.passages[i]) for i in best]
+
+
+class HNSWVectorIndex:
+    """
+    Hierarchical navigable small world graph over L2-normalized vectors.
+
+    neighbors[level, node] holds up to 2*M neighbour ids (layer 0) or
+    M ids (upper layers), padded with -1, so the whole graph is a
+    single int32 array that can be memory-mapped.
+    """
+
+    kind = "hnsw"
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        passages: List[Passage],
+        neighbors: np.ndarray,
+        entry_point: int,
+        ef_search: int = HNSW_EF_SEARCH,
+    ):
+        self.vectors = vectors
+        self.passages = passages
+        self.neighbors = neighbors
+        self.entry_point = entry_point
+        self.ef_search = ef_search
+
+    # --------------------------------------------------
+    # Construction
+    # --------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        passages: List[Passage],
+        m: int = HNSW_M,
+        ef_construction: int = HNSW_EF_CONSTRUCTION,
+        seed: int = 42,
+    ) -> "HNSWVectorIndex":
+        n = len(vectors)
+        m0 = 2 * m
+        rng = np.random.default_rng(seed)
+
+        # Geometric level assignment, as in the HNSW paper
+        levels = np.floor(
+            -np.log(1.0 - rng.random(n)) / math.log(m)
+        ).astype(np.int32)
+        max_level = int(levels.max()) if n else 0
+
+        neighbors = np.full((max_level + 1, n, m0), -1, dtype=np.int32)
+        index = cls(vectors, passages, neighbors, entry_point=0)
+
+        top = int(levels[0]) if n else 0
+
+        for node in range(1, n):
+            query = vectors[node]
+            level = int(levels[node])
+            current = index.entry_point
+
+            for layer in range(top, level, -1):
+                current = index._greedy(query, current, layer)
+
+            for layer in range(min(level, top), -1, -1):
+                candidates = index._search_layer(query, [current], ef_construction, layer)
+                capacity = m0 if layer == 0 else m
+                selected = index._select_neighbors(
+                    [c for _, c in candidates],
+                    np.array([sim for sim, _ in candidates], dtype=np.float32),
+                    m,
+                )
+
+                neighbors[layer, node, : len(selected)] = selected
+                for other in selected:
+                    index._connect(other, node, layer, capacity)
+
+                current = candidates[0][1]
+
+            if level > top:
+                index.entry_point = node
+                top = level
+
+        return index
+
+    def _connect(self, node: int, new: int, layer: int, capacity: int):
+        row = self.neighbors[layer, node]
+        links = [int(x) for x in row[:capacity] if x >= 0]
+
+        if len(links) < capacity:
+            row[len(links)] = new
+            return
+
+        # Full: re-select among old links + new one
+        links.append(new)
+        sims = self.vectors[links] @ self.vectors[node]
+        order = np.argsort(-sims)
+        selected = self._select_neighbors(
+            [links[i] for i in order], sims[order], capacity
+        )
+        row[:] = -1
+        row[: len(selected)] = selected
+
+    def _select_neighbors(
+        self,
+        candidates: List[int],
+        sims: np.ndarray,
+        m: int,
+    ) -> List[int]:
+        """
+        Neighbour selection heuristic of the HNSW paper (algorithm 4).
+        `candidates` come most similar first. A candidate is kept only
+        if it is closer to the base node than to every neighbour kept
+        so far, which preserves links between clusters instead of
+        spending them all inside the nearest one. Remaining slots are
+        filled with the closest pruned candidates.
+        """
+        if len(candidates) <= m:
+            return list(candidates)
+
+        pairwise = self.vectors[candidates] @ self.vectors[candidates].T
+        # Similarity of each candidate to its closest kept neighbour
+        closest = np.full(len(candidates), -np.inf, dtype=np.float32)
+        selected: List[int] = []
+        pruned: List[int] = []
+
+        for i in range(len(candidates)):
+            if len(selected) == m:
+                break
+            if closest[i] < sims[i]:
+                selected.append(i)
+                np.maximum(closest, pairwise[i], out=closest)
+            else:
+                pruned.append(i)
+
+        selected += pruned[: m - len(selected)]
+        return [candidates[i] for i in selected]
+
+    # --------------------------------------------------
+    # Search
+    # --------------------------------------------------
+
+    def search(self, query_vector: np.ndarray, top_k: int) -> List[Tuple[float, Passage]]:
+        if not len(self.passages):
+            return []
+
+        current = self.entry_point
+        for layer in range(len(self.neighbors) - 1, 0, -1):
+            current = self._greedy(query_vector, current, layer)
+
+        results = self._search_layer(
+            query_vector,
+            [current],
+            max(self.ef_search, top_k),
+            layer=0,
+        )
+
+        return [(sim, self.passages[node]) for sim, node in results[:top_k]]
+
+    def _links(self, node: int, layer: int) -> np.ndarray:
+        row = self.neighbors[layer, node]
+        return row[row >= 0]
+
+    def _greedy(self, query: np.ndarray, node: int, layer: int) -> int:
+        best_sim = float(self.vectors[node] @ query)
+
+        while True:
+            links = self._links(node, layer)
+            if not len(links):
+                return node
+
+            sims = self.vectors[links] @ query
+            i = int(np.argmax(sims))
+            if sims[i] <= best_sim:
+                return node
+
+            node, best_sim = int(links[i]), float(sims[i])
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry_points: List[int],
+        ef: int,
+        layer: int,
+    ) -> List[Tuple[float, int]]:
+        """
+        Beam search within one layer. Returns (similarity, node)
+        pairs, most similar first.
+        """
+        visited = np.zeros(len(self.vectors), dtype=bool)
+        visited[entry_points] = True
+        sims = self.vectors[entry_points] @ query
+
+        # candidates: max-heap on similarity, results: min-heap of size ef
+        candidates = [(-float(s), n) for s, n in zip(sims, entry_points)]
+        results = [(float(s), n) for s, n in zip(sims, entry_points)]
+        heapq.heapify(candidates)
+        heapq.heapify(results)
+
+        while candidates:
+            neg_sim, node = heapq.heappop(candidates)
+            if -neg_sim < results[0][0] and len(results) >= ef:
+                break
+
+            links = self._links(node, layer)
+            links = links[~visited[links]]
+            if not len(links):
+                continue
+
+            visited[links] = True
+            link_sims = self.vectors[links] @ query
+
+            for sim, link in zip(link_sims.tolist(), links.tolist()):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, link))
+                    heapq.heappush(results, (sim, link))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted(results, reverse=True)
+
+
+# ----------------------------------------------------------------------
+# Persistence
+# ----------------------------------------------------------------------
+
+class LocalVectorStore:
+    """
+    One directory per media:
+    meta.json, passages.json, vectors.npy and (HNSW only) neighbors.npy.
+    """
+
+    def __init__(self, base_dir: Path = VECTOR_DIR):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    # --------------------------------------------------
+
+    def _path(self, media_id: str) -> Path:
+        return self.base_dir / media_id
+
+    # --------------------------------------------------
+
+    def save(self, media_id: str, index, fingerprint: str):
+        path = self._path(media_id)
+        tmp = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        np.save(tmp / "vectors.npy", np.ascontiguousarray(index.vectors))
+        meta = {"kind": index.kind, "fingerprint": fingerprint}
+
+        if isinstance(index, HNSWVectorIndex):
+            np.save(tmp / "neighbors.npy", index.neighbors)
+            meta["entry_point"] = index.entry_point
+
+        (tmp / "passages.json").write_text(
+            json.dumps([p.__dict__ for p in index.passages]),
+            encoding="utf-8",
+        )
+        (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+        # Swap the finished directory in so readers never see a partial index
+        shutil.rmtree(path, ignore_errors=True)
+        tmp.rename(path)
+
+    # --------------------------------------------------
+
+    def load(self, media_id: str, fingerprint: str):
+        """
+        Returns the stored index if it was built from the same
+        transcript and embedding space, else None.
+        """
+        path = self._path(media_id)
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            return None
+
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("fingerprint") != fingerprint:
+            return None
+
+        vectors = np.load(path / "vectors.npy", mmap_mode="r")
+        passages = [
+            Passage(**p)
+            for p in json.loads((path / "passages.json").read_text(encoding="utf-8"))
+        ]
+
+        if meta["kind"] == HNSWVectorIndex.kind:
+            return HNSWVectorIndex(
+                vectors,
+                passages,
+                np.load(path / "neighbors.npy", mmap_mode="r"),
+                entry_point=meta["entry_point"],
+            )
+
+        return FlatVectorIndex(vectors, passages)
+
+
+# ----------------------------------------------------------------------
+# Per-media cache
+# ----------------------------------------------------------------------
+
+_index_cache: "OrderedDict[Tuple[str, str], object]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def build_local_vector_index(
+    passages: List[Passage],
+    vectors: np.ndarray,
+    threshold: int = LOCAL_ANN_THRESHOLD,
+):
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    if len(passages) < threshold:
+        return FlatVectorIndex(vectors, passages)
+
+    return HNSWVectorIndex.build(vectors, passages)
+
+
+def get_local_vector_index(
+    media_id: str,
+    transcript_text: str,
+    transcript_chunks: Optional[List[TranscriptChunk]] = None,
+    embedder: Optional[EmbeddingPipeline] = None,
+    store: Optional[LocalVectorStore] = None,
+    version: Optional[str] = None,
+):
+    """
+    Returns the vector index for a media item: from memory, then
+    from disk (memory-mapped), else embedded, built and saved.
+
+    Indexes are keyed by the transcript version (see
+    transcript_digest), which covers the chunk boundaries, so the
+    passage numbering always matches the BM25 index of that version.
+    """
+    embedder = embedder or EmbeddingPipeline()
+    version = version or transcript_digest(transcript_text, transcript_chunks)
+    fingerprint = hashlib.sha1(
+        f"{embedder.provider.cache_namespace}\n{RAG_PASSAGE_WORDS}\n{version}".encode()
+    ).hexdigest()
+    key = (media_id, fingerprint)
+
+    with _cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    store = store or LocalVectorStore()
+    index = store.load(media_id, fingerprint)
+
+    if index is None:
+        passages = build_passages(transcript_text, transcript_chunks)
+        vectors = embedder.embed([p.text for p in passages])
+        index = build_local_vector_index(passages, vectors)
+        store.save(media_id, index, fingerprint)
+
+    with _cache_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > RAG_INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+
+    return index
+
+
+def invalidate_local_vector_index(media_id: str):
+    """
+    Drops the in-memory indexes of a media item. Saved indexes
+    are keyed by fingerprint and stay on disk.
+    """
+    with _cache_lock:
+        for key in [k for k in _index_cache if k[0] == media_id]:
+            del _index_cache[key]
@@ -4,33 +4,167 @@ Memory Manager
 
 Handles session-based conversation memory
 for RAG chat.
+
+- Persists history per session_id in the SessionStore
+- Measures history in tokens, not turns
+- Folds older turns into a rolling summary once the
+  history budget is exceeded
+- Packs summary, history and retrieved context into a
+  fixed prompt budget
 """
 
-from typing import List, Dict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from src.agents.llm_client import get_client
+from src.processing.token_counter import count_tokens
+from src.rag.prompt_templates import MEMORY_SUMMARY_PROMPT
+from src.storage.db.session_store import SessionStore, get_session_store
+from config.config import (
+    TEXT_MODEL,
+    MAX_CHAT_HISTORY,
+    CHAT_HISTORY_TOKEN_BUDGET,
+    CHAT_PROMPT_TOKEN_BUDGET,
+)
+
+
+# Per-message formatting overhead of the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def message_tokens(message: Dict[str, str]) -> int:
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def summarize_conversation(
+    previous_summary: Optional[str],
+    messages: List[Dict[str, str]],
+) -> str:
+    """
+    Default summarizer: folds turns into the previous summary
+    with a single LLM call.
+    """
+    turns = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+
+    response = get_client().chat.completions.create(
+        model=TEXT_MODEL,
+        messages=[
+            {"role": "system", "content": MEMORY_SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": (
+                    f"Existing summary:\n{previous_summary or '(none)'}\n\n"
+                    f"New turns:\n{turns}"
+                ),
+            },
+        ],
+    )
+    return (response.choices[0].message.content or "").strip()
+
+
+@dataclass
+class PackedMemory:
+    summary: Optional[str] = None
+    history: List[Dict[str, str]] = field(default_factory=list)
+    context: List[str] = field(default_factory=list)
 
 
 class MemoryManager:
     """
-    Simple in-memory conversation store.
-    Can be swapped with DB/Redis later.
+    Token-budgeted conversation memory for one chat session.
     """
 
-    def __init__(self, session_id: str, max_turns: int = 6):
+    def __init__(
+        self,
+        session_id: str,
+        store: Optional[SessionStore] = None,
+        history_budget: int = CHAT_HISTORY_TOKEN_BUDGET,
+        max_messages: int = MAX_CHAT_HISTORY,
+        summarizer: Optional[
+            Callable[[Optional[str], List[Dict[str, str]]], str]
+        ] = None,
+    ):
         self.session_id = session_id
-        self.max_turns = max_turns
-        self._memory: List[Dict[str, str]] = []
+        self.store = store or get_session_store()
+        self.history_budget = history_budget
+        self.max_messages = max(max_messages, 2)
+        self.summarizer = summarizer or summarize_conversation
 
     # --------------------------------------------------
 
     def add_interaction(self, user_message: str, assistant_message: str):
-        self._memory.append({"role": "user", "content": user_message})
-        self._memory.append({"role": "assistant", "content": assistant_message})
+        messages = self.get_conversation()
+        messages.append({"role": "user", "content": user_message})
+        messages.append({"role": "assistant", "content": assistant_message})
 
-        # Trim memory
-        if len(self._memory) > self.max_turns * 2:
-            self._memory = self._memory[-self.max_turns * 2 :]
+        # Fold the oldest turns into the summary until the rest fits,
+        # always keeping the latest turn verbatim
+        overflow: List[Dict[str, str]] = []
+        while len(messages) > 2 and (
+            len(messages) > self.max_messages
+            or sum(message_tokens(m) for m in messages) > self.history_budget
+        ):
+            overflow.extend(messages[:2])
+            messages = messages[2:]
+
+        summary = (
+            self.summarizer(self.get_summary(), overflow) if overflow else None
+        )
+
+        # History and summary go to the store in one write
+        self.store.save_turn(self.session_id, messages, summary)
 
     # --------------------------------------------------
 
     def get_conversation(self) -> List[Dict[str, str]]:
-        return list(self._memory)
+        return list(self.store.get(self.session_id))
+
+    # --------------------------------------------------
+
+    def get_summary(self) -> Optional[str]:
+        return self.store.get_summary(self.session_id)
+
+    # --------------------------------------------------
+
+    def pack(
+        self,
+        retrieved_context: List[str],
+        reserved_tokens: int = 0,
+        budget: int = CHAT_PROMPT_TOKEN_BUDGET,
+    ) -> PackedMemory:
+        """
+        Fills the prompt budget (minus reserved_tokens for the system
+        prompt and question) with, in priority order: the rolling
+        summary, the most recent turns, then retrieved passages in
+        rank order.
+        """
+        remaining = budget - reserved_tokens
+        packed = PackedMemory()
+
+        summary = self.get_summary()
+        if summary:
+            cost = count_tokens(summary) + MESSAGE_OVERHEAD_TOKENS
+            if cost <= remaining:
+                packed.summary = summary
+                remaining -= cost
+
+        # Newest turns first, so the oldest are dropped when tight
+        for message in reversed(self.get_conversation()):
+            cost = message_tokens(message)
+            if cost > remaining:
+                break
+            packed.history.insert(0, message)
+            remaining -= cost
+
+        # Never start the history with an orphaned assistant reply
+        if packed.history and packed.history[0]["role"] == "assistant":
+            packed.history.pop(0)
+
+        for passage in retrieved_context:
+            cost = count_tokens(passage) + 1
+            if cost > remaining:
+                break
+            packed.context.append(passage)
+            remaining -= cost
+
+        return packed
@@ -0,0 +1,86 @@
+"""
+Passages
+--------
+
+Retrieval units shared by the keyword and semantic indices.
+
+Whisper segments are usually a sentence or two, too short
+to retrieve on their own, so consecutive transcript chunks
+are merged into passages that keep their time span.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.processing.chunker import TextChunker
+from src.schemas.agent_outputs import TranscriptChunk
+from config.config import RAG_PASSAGE_WORDS
+
+
+@dataclass
+class Passage:
+    index: int
+    text: str
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+
+def build_passages(
+    transcript_text: str,
+    transcript_chunks: Optional[List[TranscriptChunk]] = None,
+    passage_words: int = RAG_PASSAGE_WORDS,
+) -> List[Passage]:
+    """
+    Builds passages from timed transcript chunks when available,
+    otherwise from the plain transcript text.
+    """
+    if transcript_chunks:
+        return _group_chunks(transcript_chunks, passage_words)
+
+    chunker = TextChunker(
+        chunk_size=passage_words,
+        overlap=passage_words // 10,
+    )
+    return [
+        Passage(index=i, text=text)
+        for i, text in enumerate(chunker.chunk(transcript_text))
+    ]
+
+
+# ----------------------------------------------------------------------
+# Utilities
+# ----------------------------------------------------------------------
+
+def _group_chunks(
+    chunks: List[TranscriptChunk],
+    passage_words: int,
+) -> List[Passage]:
+    """
+    Merges consecutive transcript chunks into passages of
+    roughly passage_words words.
+    """
+    passages: List[Passage] = []
+    current: List[TranscriptChunk] = []
+    words = 0
+
+    for chunk in chunks:
+        current.append(chunk)
+        words += len(chunk.text.split())
+
+        if words >= passage_words:
+            passages.append(_to_passage(len(passages), current))
+            current, words = [], 0
+
+    if current:
+        passages.append(_to_passage(len(passages), current))
+
+    return passages
+
+
+def _to_passage(index: int, chunks: List[TranscriptChunk]) -> Passage:
+    return Passage(
+        index=index,
+        text=" ".join(c.text.strip() for c in chunks),
+        start_time=chunks[0].start_time,
+        end_time=chunks[-1].end_time,
+    )
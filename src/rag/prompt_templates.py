@@ -21,3 +21,16 @@ Rules:
 
 You are allowed to summarize, reason, and explain.
 """
+
+MEMORY_SUMMARY_PROMPT = """
+You maintain a running summary of a conversation between a user
+and an assistant about a media item.
+
+Update the existing summary with the new turns.
+
+Rules:
+- Keep the questions asked, the facts given in answers and any
+  user preferences or open follow-ups
+- Drop greetings and filler
+- At most 150 words, plain text
+"""
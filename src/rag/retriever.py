@@ -3,28 +3,52 @@ Retriever
 ---------
 
 Hybrid retriever:
-- Elasticsearch (primary)
-- Local keyword fallback
+- Elasticsearch hybrid search: BM25 + kNN over passage embeddings,
+  fused with reciprocal rank fusion and diversified with MMR (primary)
+- Storage backend keyword search (Elasticsearch or SQLite FTS5)
+- Local fallback: in-process BM25 + vector index, fused the same way
 """
 
-from typing import List
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from config.config import (
-    ELASTICSEARCH_URL,
-    MEDIA_TRANSCRIPTS_INDEX,
+    ENABLE_SEMANTIC_RETRIEVAL,
+    MEDIA_VECTORS_INDEX,
     RAG_TOP_K,
+    RAG_RETRIEVAL_MODE,
+    RAG_CANDIDATE_FACTOR,
 )
-from src.processing.chunker import TextChunker
-from src.storage.elastic.es_client import get_es_client
+from src.rag.bm25_index import get_bm25_index
+from src.rag.embeddings import EmbeddingPipeline
+from src.rag.fusion import dedupe_passages, mmr, reciprocal_rank_fusion
+from src.rag.local_vector_index import get_local_vector_index
+from src.rag.passages import Passage
+from src.schemas.agent_outputs import TranscriptChunk, transcript_digest
+from src.storage.elastic.queries import ElasticQueries
+from src.storage.factory import get_storage_backend
 
 
 class Retriever:
     def __init__(self):
-        self.chunker = TextChunker()
-        self.use_es = ELASTICSEARCH_URL is not None
+        self.storage = get_storage_backend()
+        self.use_es = self.storage.name == "elasticsearch"
+
+        self.use_semantic = (
+            ENABLE_SEMANTIC_RETRIEVAL
+            and RAG_RETRIEVAL_MODE in ("hybrid", "semantic")
+        )
+        self.use_hybrid = self.use_semantic and RAG_RETRIEVAL_MODE == "hybrid"
 
         if self.use_es:
-            self.es = get_es_client()
+            self.es = self.storage.es
+
+        if self.use_semantic:
+            self.embedder = EmbeddingPipeline()
+
+        if self.use_es and self.use_semantic:
+            self.vector_queries = ElasticQueries(self.es, MEDIA_VECTORS_INDEX)
 
     # --------------------------------------------------
     # Public API
@@ -36,50 +60,180 @@ class Retriever:
         transcript_text: str,
         query: str,
         top_k: int = RAG_TOP_K,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+        transcript_version: Optional[str] = None,
     ) -> List[str]:
         """
-        Retrieve relevant context for a query.
+        Retrieve relevant context for a query. transcript_version
+        (AudioAnalysisOutput.transcript_version()) identifies the
+        local indexes without rehashing the transcript.
         """
         if self.use_es:
-            results = self._es_retrieve(media_id, query, top_k)
+            if self.use_hybrid:
+                results = self._hybrid_retrieve(media_id, query, top_k)
+            elif self.use_semantic:
+                results = self._semantic_retrieve(media_id, query, top_k)
+            else:
+                results = []
+
+            if not results:
+                results = self.storage.keyword_search(media_id, query, top_k)
             if results:
                 return results
 
-        # Fallback: local keyword matching
-        return self._local_retrieve(transcript_text, query, top_k)
+        elif not self.use_semantic:
+            # Embedded backend: FTS5 avoids building an in-memory index
+            results = self.storage.keyword_search(media_id, query, top_k)
+            if results:
+                return results
+
+        # Fallback: local in-process indices
+        return self._local_retrieve(
+            media_id,
+            transcript_text,
+            query,
+            top_k,
+            transcript_chunks,
+            transcript_version,
+        )
 
     # --------------------------------------------------
-    # Elasticsearch retrieval
+    # Hybrid retrieval
     # --------------------------------------------------
 
-    def _es_retrieve(
+    def _hybrid_retrieve(
         self,
         media_id: str,
         query: str,
         top_k: int,
     ) -> List[str]:
-        body = {
-            "size": top_k,
-            "query": {
-                "bool": {
-                    "must": [
-                        {"term": {"media_id": media_id}}
-                    ],
-                    "should": [
-                        {"match": {"text": query}}
-                    ],
-                    "minimum_should_match": 1,
-                }
+        """
+        Runs BM25 and kNN over the passage index in one msearch,
+        fuses both rankings with RRF, drops overlapping passages
+        and picks top_k with MMR.
+        """
+        if not self.es.indices.exists(index=MEDIA_VECTORS_INDEX):
+            return []
+
+        n_candidates = top_k * RAG_CANDIDATE_FACTOR
+        query_vector = self.embedder.embed_query(query)
+        # The stored embeddings are returned for MMR, which saves
+        # re-embedding every candidate per query
+        source = ["passage_index", "text", "start_time", "end_time", "embedding"]
+
+        searches = [
+            {"index": MEDIA_VECTORS_INDEX},
+            {
+                "size": n_candidates,
+                "_source": source,
+                "query": {
+                    "bool": {
+                        "filter": [{"term": {"media_id": media_id}}],
+                        "must": [{"match": {"text": query}}],
+                    }
+                },
             },
-        }
+            {"index": MEDIA_VECTORS_INDEX},
+            ElasticQueries.knn_body(
+                query_vector.tolist(),
+                top_k=n_candidates,
+                media_id=media_id,
+                source_fields=source,
+            ),
+        ]
+
+        response = self.es.msearch(searches=searches)
+
+        rankings = []
+        passages = {}
+        vectors = {}
+        for result in response.get("responses", []):
+            hits = result.get("hits", {}).get("hits", [])
+            rankings.append([hit["_id"] for hit in hits])
+            for hit in hits:
+                passages[hit["_id"]] = _to_passage(hit["_source"])
+                if hit["_source"].get("embedding"):
+                    vectors[hit["_id"]] = hit["_source"]["embedding"]
+
+        return self._fuse(query_vector, rankings, passages, top_k, vectors)
+
+    def _fuse(
+        self,
+        query_vector: np.ndarray,
+        rankings: List[List],
+        passages: dict,
+        top_k: int,
+        vectors: Optional[Dict] = None,
+    ) -> List[str]:
+        """
+        RRF over the rankings, overlap dedupe, then MMR down to top_k.
+        `vectors` holds the stored passage embeddings by key; only
+        candidates missing from it are embedded.
+        """
+        fused = reciprocal_rank_fusion(rankings)
+        if not fused:
+            return []
+
+        keys = [key for key, _ in fused]
+        candidates = [passages[key] for key in keys]
+        scores = np.array([score for _, score in fused], dtype=np.float32)
+
+        keep = dedupe_passages(candidates)
+        keys = [keys[i] for i in keep]
+        candidates = [candidates[i] for i in keep]
+        relevance = scores[keep] / scores.max()
+
+        order = mmr(
+            query_vector,
+            self._candidate_vectors(keys, candidates, vectors or {}),
+            top_k,
+            relevance=relevance,
+        )
+
+        return [candidates[i].text for i in order]
 
-        response = self.es.search(
-            index=MEDIA_TRANSCRIPTS_INDEX,
-            body=body,
+    def _candidate_vectors(
+        self,
+        keys: List,
+        candidates: List[Passage],
+        vectors: Dict,
+    ) -> np.ndarray:
+        missing = [i for i, key in enumerate(keys) if key not in vectors]
+        embedded = (
+            self.embedder.embed([candidates[i].text for i in missing])
+            if missing
+            else []
         )
+        fallback = dict(zip(missing, embedded))
+
+        return np.asarray(
+            [
+                fallback[i] if i in fallback else vectors[key]
+                for i, key in enumerate(keys)
+            ],
+            dtype=np.float32,
+        )
+
+    # --------------------------------------------------
+    # Semantic retrieval
+    # --------------------------------------------------
+
+    def _semantic_retrieve(
+        self,
+        media_id: str,
+        query: str,
+        top_k: int,
+    ) -> List[str]:
+        if not self.es.indices.exists(index=MEDIA_VECTORS_INDEX):
+            return []
+
+        query_vector = self.embedder.embed_query(query).tolist()
 
-        hits = response.get("hits", {}).get("hits", [])
-        return [hit["_source"]["text"] for hit in hits]
+        return self.vector_queries.vector_search(
+            query_vector,
+            top_k=top_k,
+            media_id=media_id,
+        )
 
     # --------------------------------------------------
     # Local fallback
@@ -87,21 +241,58 @@ class Retriever:
 
     def _local_retrieve(
         self,
+        media_id: str,
         transcript_text: str,
         query: str,
         top_k: int,
+        transcript_chunks: Optional[List[TranscriptChunk]] = None,
+        transcript_version: Optional[str] = None,
     ) -> List[str]:
-        chunks = self.chunker.chunk(transcript_text)
-        scored = []
-
-        query_lower = query.lower()
-        for chunk in chunks:
-            score = sum(
-                1 for word in query_lower.split()
-                if word in chunk.lower()
-            )
-            if score > 0:
-                scored.append((score, chunk))
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [chunk for score, chunk in scored[:top_k]]
+        # Both indices are built once per transcript version and reused
+        # across questions; the shared version keeps their passages aligned
+        version = transcript_version or transcript_digest(
+            transcript_text, transcript_chunks
+        )
+        bm25 = get_bm25_index(media_id, transcript_text, transcript_chunks, version)
+
+        if not self.use_semantic:
+            return [passage.text for _, passage in bm25.search(query, top_k)]
+
+        vector_index = get_local_vector_index(
+            media_id,
+            transcript_text,
+            transcript_chunks,
+            embedder=self.embedder,
+            version=version,
+        )
+        query_vector = self.embedder.embed_query(query)
+
+        if not self.use_hybrid:
+            return [
+                passage.text
+                for _, passage in vector_index.search(query_vector, top_k)
+            ]
+
+        # Both indices share passage numbering, so the index is the key
+        # (and the row of the passage in the vector matrix)
+        n_candidates = top_k * RAG_CANDIDATE_FACTOR
+        rankings = []
+        passages = {}
+        for hits in (
+            bm25.search(query, n_candidates),
+            vector_index.search(query_vector, n_candidates),
+        ):
+            rankings.append([passage.index for _, passage in hits])
+            passages.update({passage.index: passage for _, passage in hits})
+
+        vectors = {key: vector_index.vectors[key] for key in passages}
+        return self._fuse(query_vector, rankings, passages, top_k, vectors)
+
+
+def _to_passage(source: dict) -> Passage:
+    return Passage(
+        index=source.get("passage_index", 0),
+        text=source["text"],
+        start_time=source.get("start_time"),
+        end_time=source.get("end_time"),
+    )
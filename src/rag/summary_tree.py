@@ -0,0 +1,65 @@
+"""
+Summary Tree
+------------
+
+Persists per-media summary trees produced by SummaryAgent
+and helps chat decide when the whole-media summary can
+answer a question without retrieval.
+"""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+from src.schemas.agent_outputs import SummaryTreeOutput
+from config.config import SUMMARY_DIR
+
+
+OVERVIEW_PATTERNS = [
+    r"\bwhat\b.*\b(video|media|clip|recording|talk|episode)\b.*\babout\b",
+    r"\b(summari[sz]e|summary|overview|tl;?dr|gist)\b",
+    r"\bmain (point|points|idea|ideas|topic|topics)\b",
+]
+
+
+def is_overview_question(question: str) -> bool:
+    """
+    True for questions about the media as a whole,
+    e.g. "what is this video about?".
+    """
+    text = question.lower().strip()
+    return any(re.search(pattern, text) for pattern in OVERVIEW_PATTERNS)
+
+
+class SummaryTreeStore:
+    """
+    File-based store for summary trees, one JSON file per media.
+    """
+
+    def __init__(self, base_dir: Path = SUMMARY_DIR):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    # --------------------------------------------------
+
+    def _path(self, media_id: str) -> Path:
+        return self.base_dir / f"{media_id}.json"
+
+    # --------------------------------------------------
+
+    def save(self, tree: SummaryTreeOutput):
+        self._path(tree.media_id).write_text(
+            tree.model_dump_json(),
+            encoding="utf-8",
+        )
+
+    # --------------------------------------------------
+
+    def load(self, media_id: str) -> Optional[SummaryTreeOutput]:
+        path = self._path(media_id)
+        if not path.exists():
+            return None
+
+        return SummaryTreeOutput.model_validate_json(
+            path.read_text(encoding="utf-8")
+        )
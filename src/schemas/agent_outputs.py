@@ -9,8 +9,9 @@ This enables:
 - Predictable orchestration
 """
 
+import hashlib
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 # -------------------------------------------------------------------
@@ -40,12 +41,43 @@ class TranscriptChunk(BaseModel):
     speaker: Optional[str] = None
 
 
+def transcript_digest(
+    transcript_text: Optional[str],
+    transcript_chunks: Optional[List[TranscriptChunk]] = None,
+) -> str:
+    """
+    Digest of a transcript and its chunk boundaries. Retrieval
+    indexes built for the same digest number their passages alike.
+    """
+    digest = hashlib.sha1((transcript_text or "").encode("utf-8"))
+    for chunk in transcript_chunks or []:
+        digest.update(
+            f"\0{chunk.start_time}\0{chunk.end_time}\0{chunk.text}".encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
 class AudioAnalysisOutput(BaseAgentOutput):
     language: Optional[str] = None
     duration_seconds: Optional[float] = None
     transcript_chunks: List[TranscriptChunk] = Field(default_factory=list)
     full_transcript: Optional[str] = None
 
+    _transcript_version: Optional[str] = PrivateAttr(default=None)
+
+    def transcript_version(self) -> str:
+        """
+        transcript_digest of this output, computed on first use, so
+        per-question index lookups do not rehash the transcript.
+        Outputs are not modified once produced; a model_copy with
+        changed transcript fields keeps the memoized value.
+        """
+        if self._transcript_version is None:
+            self._transcript_version = transcript_digest(
+                self.full_transcript, self.transcript_chunks
+            )
+        return self._transcript_version
+
 
 # -------------------------------------------------------------------
 # Video Agent Output
@@ -123,6 +155,54 @@ class RiskAssessmentOutput(BaseAgentOutput):
     risk_flags: List[RiskFlag] = Field(default_factory=list)
 
 
+# -------------------------------------------------------------------
+# Fused Text Analysis Agent Output
+# -------------------------------------------------------------------
+
+class FusedTextAnalysisOutput(BaseAgentOutput):
+    emotion: Optional[EmotionAnalysisOutput] = None
+    tagging: Optional[TaggingOutput] = None
+    risk: Optional[RiskAssessmentOutput] = None
+
+
+# -------------------------------------------------------------------
+# Summary Agent Output
+# -------------------------------------------------------------------
+
+class SummaryNode(BaseModel):
+    level: str  # window / section / media
+    index: int
+    summary: str
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+
+
+class SummaryTreeOutput(BaseAgentOutput):
+    window_summaries: List[SummaryNode] = Field(default_factory=list)
+    section_summaries: List[SummaryNode] = Field(default_factory=list)
+    media_summary: Optional[SummaryNode] = None
+
+    def level_chunks(self, level: str) -> List[TranscriptChunk]:
+        """
+        Returns one summary level as timestamped chunks so it can
+        replace raw transcript chunks in downstream prompts.
+        """
+        nodes = {
+            "window": self.window_summaries,
+            "section": self.section_summaries,
+            "media": [self.media_summary] if self.media_summary else [],
+        }[level]
+
+        return [
+            TranscriptChunk(
+                text=node.summary,
+                start_time=node.start_time or 0.0,
+                end_time=node.end_time or 0.0,
+            )
+            for node in nodes
+        ]
+
+
 # -------------------------------------------------------------------
 # RAG Chat Agent Output
 # -------------------------------------------------------------------
@@ -136,3 +216,46 @@ class ChatCitation(BaseModel):
 class RAGChatOutput(BaseAgentOutput):
     answer: str
     citations: List[ChatCitation] = Field(default_factory=list)
+
+
+# -------------------------------------------------------------------
+# LLM Response Schemas
+# -------------------------------------------------------------------
+# Shapes requested from the model (JSON-schema constrained) before
+# they are mapped onto the agent outputs above. Defaults keep
+# repaired partial responses valid.
+
+class EmotionResponse(BaseModel):
+    dominant_emotion: Optional[str] = None
+    emotion_spikes: List[EmotionSpike] = Field(default_factory=list)
+
+
+class TaggingResponse(BaseModel):
+    topics: List[str] = Field(default_factory=list)
+    entities: List[str] = Field(default_factory=list)
+    keywords: List[str] = Field(default_factory=list)
+
+
+class ReasoningResponse(BaseModel):
+    intent: str = ""
+    key_insights: List[str] = Field(default_factory=list)
+    conclusions: List[str] = Field(default_factory=list)
+
+
+class RiskResponse(BaseModel):
+    risk_level: str = "low"
+    risk_categories: List[str] = Field(default_factory=list)
+    explanation: str = ""
+    recommended_actions: List[str] = Field(default_factory=list)
+
+
+class VideoResponse(BaseModel):
+    scene_summaries: List[str] = Field(default_factory=list)
+    visual_tags: List[str] = Field(default_factory=list)
+    detected_activities: List[str] = Field(default_factory=list)
+
+
+class FusedTextResponse(BaseModel):
+    emotion: EmotionResponse = Field(default_factory=EmotionResponse)
+    tagging: TaggingResponse = Field(default_factory=TaggingResponse)
+    risk: RiskResponse = Field(default_factory=RiskResponse)
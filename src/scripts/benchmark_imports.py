@@ -0,0 +1,144 @@
+"""
+Benchmark Imports
+-----------------
+
+Measures the cold-start import time of the entry points.
+
+Every module is imported in a fresh interpreter with
+`python -X importtime`, several times, and the median cumulative
+import time is reported together with the packages that account
+for most of it. Heavy dependencies (Whisper, OpenCV, the OpenAI and
+Elasticsearch clients) should not show up here: they are imported
+on first use.
+
+Exits with status 1 when a module's median import time exceeds
+--max-seconds, so the check can run in CI.
+
+Usage:
+    python -m src.scripts.benchmark_imports
+    python -m src.scripts.benchmark_imports --modules src.jobs.worker --max-seconds 0.5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+
+DEFAULT_MODULES = [
+    "config.config",
+    "src.orchestration.workflow_runner",
+    "src.jobs.worker",
+    "src.jobs.stage_worker",
+    "src.app_pages.media_dashboard",
+    "src.app_pages.chat",
+]
+
+
+def _import_once(module: str) -> Tuple[float, float, Dict[str, float]]:
+    """
+    Imports `module` in a fresh interpreter. Returns the process wall
+    time, the module's cumulative import time and the self time per
+    package, all in seconds.
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(
+                filter(None, [str(PROJECT_DIR), os.environ.get("PYTHONPATH")])
+            ),
+        },
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    cumulative = 0.0
+    packages: Dict[str, float] = defaultdict(float)
+
+    # Lines look like "import time:  self [us] | cumulative | name"
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        # Project modules per subpackage, dependencies per package
+        parts = name.split(".")
+        package = ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+        packages[package] += int(self_us) / 1e6
+        if name == module:
+            cumulative = int(cumulative_us) / 1e6
+
+    return wall, cumulative, packages
+
+
+def run_benchmark(args: argparse.Namespace) -> bool:
+    """
+    Prints one report per module. Returns False if any module
+    exceeded the budget.
+    """
+    within_budget = True
+
+    for module in args.modules:
+        walls: List[float] = []
+        imports: List[float] = []
+        packages: Dict[str, List[float]] = defaultdict(list)
+
+        for _ in range(args.repeat):
+            wall, cumulative, per_package = _import_once(module)
+            walls.append(wall)
+            imports.append(cumulative)
+            for package, seconds in per_package.items():
+                packages[package].append(seconds)
+
+        median = statistics.median(imports)
+        heaviest = sorted(
+            ((statistics.median(times), package) for package, times in packages.items()),
+            reverse=True,
+        )[:args.top]
+
+        print(f"\n📦 {module}")
+        print(f"import : {median * 1000:8.1f} ms (median of {args.repeat})")
+        print(f"process: {statistics.median(walls) * 1000:8.1f} ms (incl. interpreter)")
+        for seconds, package in heaviest:
+            print(f"    {seconds * 1000:8.1f} ms  {package}")
+
+        if args.max_seconds is not None and median > args.max_seconds:
+            print(f"❌ over budget ({args.max_seconds:.2f}s)")
+            within_budget = False
+
+    return within_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="heaviest packages shown")
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="fail if a module's median import time exceeds this",
+    )
+    args = parser.parse_args()
+
+    if not run_benchmark(args):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark Stage Workers
+-----------------------
+
+Measures how stage throughput scales with the number of workers.
+
+For every worker count a fresh LocalStageBroker is filled with
+synthetic work items, and that many StageWorkers (threads) drain
+it. Each item sleeps for --stage-seconds, standing in for a stage
+that waits on an LLM call or on another node, so the numbers show
+the scheduling overhead of the broker and workers rather than the
+cost of the stages themselves. CPU-bound stages (Whisper) scale with
+worker processes and nodes instead, which this script does not cover.
+
+Usage:
+    python -m src.scripts.benchmark_stage_workers
+    python -m src.scripts.benchmark_stage_workers --workers 1 2 4 8 16 --items 160
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from typing import Any, Dict
+
+from src.jobs.stage_broker import LocalStageBroker, WorkItem
+from src.jobs.stage_worker import StageWorker
+from src.jobs.stages import STAGE_HANDLERS
+from src.storage.artifact_store import ArtifactStore
+
+
+BENCHMARK_STAGE = "benchmark_sleep"
+
+
+def _sleep_stage(item: WorkItem, artifacts: ArtifactStore) -> Dict[str, Any]:
+    time.sleep(item.payload["seconds"])
+    return {"index": item.payload["index"]}
+
+
+def _drain(workers: int, items: int, stage_seconds: float, artifacts: ArtifactStore) -> float:
+    """
+    Seconds `workers` stage workers take to finish `items` items.
+    """
+    broker = LocalStageBroker()
+    for index in range(items):
+        broker.publish(
+            f"item-{index}",
+            BENCHMARK_STAGE,
+            {"index": index, "seconds": stage_seconds},
+        )
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=StageWorker(
+                broker=broker,
+                artifacts=artifacts,
+                kinds=[BENCHMARK_STAGE],
+                worker_id=f"bench:{i}",
+                poll_seconds=0.01,
+            ).run_forever,
+            args=(stop,),
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    item_ids = [f"item-{index}" for index in range(items)]
+    while not all(status.finished for status in broker.statuses(item_ids).values()):
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return elapsed
+
+
+def run_benchmark(args: argparse.Namespace):
+    STAGE_HANDLERS[BENCHMARK_STAGE] = _sleep_stage
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifacts = ArtifactStore(tmp)
+
+        print(f"{'workers':>8} {'seconds':>9} {'items/s':>9} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            elapsed = _drain(workers, args.items, args.stage_seconds, artifacts)
+            throughput = args.items / elapsed
+            baseline = baseline or throughput
+            print(
+                f"{workers:>8} {elapsed:>9.2f} {throughput:>9.1f} "
+                f"{throughput / baseline:>7.1f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--items", type=int, default=160)
+    parser.add_argument(
+        "--stage-seconds",
+        type=float,
+        default=0.05,
+        help="time each synthetic stage takes",
+    )
+    args = parser.parse_args()
+
+    run_benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark Vector Search
+-----------------------
+
+Compares the legacy brute-force `script_score` vector query
+with filtered approximate kNN on synthetic corpora.
+
+For every corpus size a throwaway index is filled with random
+unit vectors spread over many media ids, then both queries are
+timed for the same random query vectors. kNN recall@k is
+measured against exact per-media cosine ranking.
+
+Usage:
+    python -m src.scripts.benchmark_vector_search --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+from typing import Iterator, List
+
+import numpy as np
+from elasticsearch.helpers import bulk
+
+from src.storage.elastic.es_client import get_es_client
+from src.storage.elastic.index_manager import IndexManager
+from src.storage.elastic.queries import ElasticQueries
+
+
+def _documents(
+    index_name: str,
+    size: int,
+    dims: int,
+    n_media: int,
+    rng: np.random.Generator,
+    batch: int = 10000,
+) -> Iterator[dict]:
+    for start in range(0, size, batch):
+        count = min(batch, size - start)
+        vectors = rng.standard_normal((count, dims)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        for offset, vector in enumerate(vectors):
+            doc_id = start + offset
+            yield {
+                "_index": index_name,
+                "_id": str(doc_id),
+                "_source": {
+                    "media_id": f"media-{doc_id % n_media}",
+                    "text": f"passage {doc_id}",
+                    "embedding": vector.tolist(),
+                },
+            }
+
+
+def _brute_force_body(embedding: List[float], top_k: int, media_id: str | None) -> dict:
+    query = {"term": {"media_id": media_id}} if media_id else {"match_all": {}}
+    return {
+        "size": top_k,
+        "_source": ["text"],
+        "query": {
+            "script_score": {
+                "query": query,
+                "script": {
+                    "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
+                    "params": {"query_vector": embedding},
+                },
+            }
+        },
+    }
+
+
+def _timed_search(es, index_name: str, body: dict) -> tuple[float, List[str]]:
+    started = time.perf_counter()
+    response = es.search(index=index_name, body=body)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return elapsed_ms, [hit["_id"] for hit in response["hits"]["hits"]]
+
+
+def _percentiles(samples: List[float]) -> str:
+    p50, p95 = np.percentile(samples, [50, 95])
+    return f"p50={p50:8.1f} ms  p95={p95:8.1f} ms"
+
+
+def run_benchmark(args: argparse.Namespace):
+    es = get_es_client()
+    index_manager = IndexManager(es)
+    rng = np.random.default_rng(args.seed)
+
+    for size in args.sizes:
+        index_name = f"{args.index_prefix}_{size}"
+        print(f"\n📦 Corpus: {size:,} vectors ({args.dims} dims) -> {index_name}")
+
+        if es.indices.exists(index=index_name):
+            es.indices.delete(index=index_name)
+        index_manager.create_vector_index(index_name=index_name, dims=args.dims)
+
+        started = time.perf_counter()
+        bulk(
+            es.options(request_timeout=600),
+            _documents(index_name, size, args.dims, args.media, rng),
+            chunk_size=2000,
+        )
+        es.indices.refresh(index=index_name)
+        if args.force_merge:
+            es.options(request_timeout=3600).indices.forcemerge(
+                index=index_name,
+                max_num_segments=1,
+            )
+        print(f"Indexed in {time.perf_counter() - started:.1f}s")
+
+        legacy, knn, recalls = [], [], []
+
+        for _ in range(args.queries):
+            vector = rng.standard_normal(args.dims).astype(np.float32)
+            vector /= np.linalg.norm(vector)
+            embedding = vector.tolist()
+            media_id = f"media-{rng.integers(args.media)}"
+
+            # Legacy query: every document in the index is scored
+            elapsed, _ = _timed_search(
+                es, index_name, _brute_force_body(embedding, args.top_k, None)
+            )
+            legacy.append(elapsed)
+
+            elapsed, knn_ids = _timed_search(
+                es,
+                index_name,
+                ElasticQueries.knn_body(
+                    embedding,
+                    top_k=args.top_k,
+                    media_id=media_id,
+                    num_candidates=args.num_candidates,
+                ),
+            )
+            knn.append(elapsed)
+
+            # Exact per-media ranking as ground truth
+            _, exact_ids = _timed_search(
+                es, index_name, _brute_force_body(embedding, args.top_k, media_id)
+            )
+            if exact_ids:
+                recalls.append(len(set(knn_ids) & set(exact_ids)) / len(exact_ids))
+
+        print(f"script_score (match_all): {_percentiles(legacy)}")
+        print(f"kNN (media filter)     : {_percentiles(knn)}")
+        print(f"kNN recall@{args.top_k}          : {np.mean(recalls):.3f}")
+
+        if not args.keep:
+            es.indices.delete(index=index_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--dims", type=int, default=256)
+    parser.add_argument("--media", type=int, default=200, help="distinct media ids")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--num-candidates", type=int, default=None)
+    parser.add_argument("--index-prefix", default="sentinel_bench_vectors")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force-merge", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="keep indices afterwards")
+
+    run_benchmark(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
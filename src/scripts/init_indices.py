@@ -6,11 +6,11 @@ Run this script once to create
 required Elasticsearch indices.
 """
 
-from config.config import (
-    MEDIA_TRANSCRIPTS_INDEX,
-)
+from config.config import MEDIA_VECTORS_INDEX
+from src.rag.embeddings import get_embedding_provider
 from src.storage.elastic.index_manager import IndexManager
 from src.storage.elastic.es_client import get_es_client
+from src.storage.elastic.elastic_backend import ElasticStorageBackend
 
 
 def main():
@@ -24,34 +24,20 @@ def main():
     index_manager.create_media_index(index_name="media-index")
 
     # -------------------------------------------------
-    # Vector index (for future embeddings / search)
+    # Vector index (transcript passage embeddings)
     # -------------------------------------------------
     print("Creating vector index...")
     index_manager.create_vector_index(
-        index_name="media-vectors",
-        dims=384,  # match your embedding model
+        index_name=MEDIA_VECTORS_INDEX,
+        dims=get_embedding_provider().dims,
     )
 
     # -------------------------------------------------
-    # Transcript chunks index (CRITICAL for RAG)
+    # Transcript chunks (CRITICAL for RAG), insights
+    # and media records
     # -------------------------------------------------
-    print("Creating transcript index...")
-    if not es.indices.exists(index=MEDIA_TRANSCRIPTS_INDEX):
-        es.indices.create(
-            index=MEDIA_TRANSCRIPTS_INDEX,
-            body={
-                "mappings": {
-                    "properties": {
-                        "media_id": {"type": "keyword"},
-                        "text": {"type": "text"},
-                        "start_time": {"type": "float"},
-                        "end_time": {"type": "float"},
-                    }
-                }
-            },
-        )
-    else:
-        print(f"Index {MEDIA_TRANSCRIPTS_INDEX} already exists.")
+    print("Creating storage backend indices...")
+    ElasticStorageBackend(es).ensure_indices()
 
     print("✅ Elasticsearch indices initialized successfully.")
 
@@ -0,0 +1,91 @@
+"""
+Artifact Store
+--------------
+
+Intermediate pipeline artifacts (uploaded audio and frames,
+stage outputs) shared by the distributed coordinator and the
+stage workers.
+
+Keys are relative paths such as media/{media_id}/audio.wav,
+resolved under a directory every node mounts (NFS, EFS, ...).
+Writes are atomic, so a stage that runs twice after its lease
+expired simply rewrites the same artifact.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Type, TypeVar
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+from config.config import ARTIFACT_DIR
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class ArtifactStore:
+    """
+    Key-addressed files on a shared directory.
+    """
+
+    def __init__(self, base_dir: Path = ARTIFACT_DIR):
+        self.base_dir = Path(base_dir).resolve()
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    # --------------------------------------------------
+
+    def path(self, key: str) -> Path:
+        """
+        Local path of an artifact on this node.
+        """
+        path = (self.base_dir / key).resolve()
+        if self.base_dir not in path.parents:
+            raise ValueError(f"Invalid artifact key: {key}")
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    # --------------------------------------------------
+
+    def put_file(self, key: str, source_path: str) -> str:
+        # Already uploaded (e.g. by an earlier attempt of the run)
+        path = self.path(key)
+        if path.exists() and path.stat().st_size == os.path.getsize(source_path):
+            return key
+
+        tmp = self._tmp_path(path)
+        shutil.copyfile(source_path, tmp)
+        os.replace(tmp, path)
+        return key
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        path = self.path(key)
+        tmp = self._tmp_path(path)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return key
+
+    def get_bytes(self, key: str) -> bytes:
+        return self.path(key).read_bytes()
+
+    # --------------------------------------------------
+
+    def put_model(self, key: str, model: BaseModel) -> str:
+        return self.put_bytes(key, model.model_dump_json().encode("utf-8"))
+
+    def get_model(self, key: str, schema: Type[M]) -> M:
+        return schema.model_validate_json(self.get_bytes(key))
+
+    # --------------------------------------------------
+
+    def clear(self, prefix: str):
+        shutil.rmtree(self.path(prefix), ignore_errors=True)
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer: two workers may write the same key at once
+        return path.with_name(f"{path.name}.{uuid4().hex}.tmp")
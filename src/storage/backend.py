@@ -0,0 +1,91 @@
+"""
+Storage Backend
+---------------
+
+Interface for persisting and searching media data,
+implemented by Elasticsearch and embedded SQLite/FTS5.
+
+Responsible for:
+- Transcript chunk indexing and keyword search
+- Agent insight storage
+- Media record lookups
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from src.schemas.agent_outputs import BaseAgentOutput, TranscriptChunk
+from src.storage.db.models import MediaRecord
+
+
+class StorageBackend(ABC):
+    """
+    Abstract storage backend.
+    """
+
+    name: str
+
+    # --------------------------------------------------
+    # Transcripts
+    # --------------------------------------------------
+
+    @abstractmethod
+    def index_transcript(self, media_id: str, chunks: List[TranscriptChunk]):
+        """
+        Stores the transcript chunks of a media item,
+        replacing any previously stored chunks.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def keyword_search(self, media_id: str, query: str, top_k: int) -> List[str]:
+        """
+        Full-text search over one media's transcript chunks.
+        """
+        raise NotImplementedError
+
+    # --------------------------------------------------
+    # Insights
+    # --------------------------------------------------
+
+    @abstractmethod
+    def store_insight(self, output: BaseAgentOutput):
+        """
+        Stores an agent output, replacing the previous
+        output of the same agent for that media.
+        """
+        raise NotImplementedError
+
+    def store_insights(self, outputs: List[BaseAgentOutput]):
+        """
+        Stores several agent outputs; backends override this
+        to write them in one batch.
+        """
+        for output in outputs:
+            self.store_insight(output)
+
+    @abstractmethod
+    def get_insights(self, media_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns stored agent outputs keyed by agent name.
+        """
+        raise NotImplementedError
+
+    # --------------------------------------------------
+    # Media records
+    # --------------------------------------------------
+
+    @abstractmethod
+    def upsert_media(self, record: MediaRecord):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_media(self, media_id: str) -> Optional[MediaRecord]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_media(self, limit: int = 100) -> List[MediaRecord]:
+        """
+        Most recently created media first.
+        """
+        raise NotImplementedError
@@ -9,18 +9,18 @@ and media metadata storage.
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class MediaRecord(BaseModel):
     media_id: str
     title: Optional[str] = None
     source: str  # local | youtube
-    created_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class ChatSession(BaseModel):
     session_id: str
     media_id: str
-    created_at: datetime = datetime.utcnow()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
 
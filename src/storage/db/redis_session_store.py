@@ -0,0 +1,128 @@
+"""
+Redis Session Store
+-------------------
+
+SessionStore on any Redis-protocol server, so several app
+replicas can share chat sessions.
+
+- One pooled client per process
+- Keys: sentinel:session:{id} (hash of session metadata),
+  :messages and :summary (strings), all O(1) GET / HGETALL
+- A chat turn is written in a single pipelined round trip
+"""
+
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from src.storage.db.models import ChatSession
+from src.storage.db.session_store import SessionStore
+from config.config import REDIS_URL, REDIS_MAX_CONNECTIONS, SESSION_TTL_SECONDS
+
+
+KEY_PREFIX = "sentinel:session"
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Chat sessions in Redis, expiring after SESSION_TTL_SECONDS idle.
+    A client can be passed in (any redis-py compatible one with
+    decode_responses=True); otherwise one is pooled from `url`.
+    """
+
+    def __init__(
+        self,
+        url: str = REDIS_URL,
+        max_connections: int = REDIS_MAX_CONNECTIONS,
+        ttl_seconds: int = SESSION_TTL_SECONDS,
+        client=None,
+    ):
+        if client is None:
+            # redis is only required when no client is given
+            import redis
+
+            pool = redis.ConnectionPool.from_url(
+                url,
+                max_connections=max_connections,
+                decode_responses=True,
+            )
+            client = redis.Redis(connection_pool=pool)
+
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    # --------------------------------------------------
+
+    @staticmethod
+    def _key(session_id: str, part: str = "") -> str:
+        key = f"{KEY_PREFIX}:{session_id}"
+        return f"{key}:{part}" if part else key
+
+    def _touch(self, pipe, *keys: str):
+        if self.ttl_seconds > 0:
+            for key in keys:
+                pipe.expire(key, self.ttl_seconds)
+
+    # --------------------------------------------------
+
+    def register_session(self, session: ChatSession):
+        key = self._key(session.session_id)
+
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(
+            key,
+            mapping={
+                "media_id": session.media_id,
+                "created_at": session.created_at.isoformat(),
+            },
+        )
+        self._touch(pipe, key)
+        pipe.execute()
+
+    def get_session(self, session_id: str) -> Optional[ChatSession]:
+        fields = self.client.hgetall(self._key(session_id))
+        if not fields:
+            return None
+
+        return ChatSession(
+            session_id=session_id,
+            media_id=fields["media_id"],
+            created_at=datetime.fromisoformat(fields["created_at"]),
+        )
+
+    # --------------------------------------------------
+
+    def get(self, session_id: str) -> List[dict]:
+        raw = self.client.get(self._key(session_id, "messages"))
+        return json.loads(raw) if raw else []
+
+    def get_summary(self, session_id: str) -> Optional[str]:
+        return self.client.get(self._key(session_id, "summary"))
+
+    def save_turn(
+        self,
+        session_id: str,
+        messages: List[dict],
+        summary: Optional[str] = None,
+    ):
+        keys = [
+            self._key(session_id),
+            self._key(session_id, "messages"),
+            self._key(session_id, "summary"),
+        ]
+
+        pipe = self.client.pipeline(transaction=True)
+        pipe.set(keys[1], json.dumps(messages))
+        if summary is not None:
+            pipe.set(keys[2], summary)
+        self._touch(pipe, *keys)
+        pipe.execute()
+
+    # --------------------------------------------------
+
+    def clear(self, session_id: str):
+        self.client.delete(
+            self._key(session_id),
+            self._key(session_id, "messages"),
+            self._key(session_id, "summary"),
+        )
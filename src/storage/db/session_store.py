@@ -3,33 +3,254 @@ Session Store
 -------------
 
 Handles persistence of chat sessions.
+
+- SessionStore defines the interface
+- InMemorySessionStore: single process, lost on restart
+- SQLiteSessionStore: embedded, WAL mode, one connection per thread
+- RedisSessionStore (redis_session_store.py): shared across app replicas
+
+Every read on the chat path is a primary-key (or single key) lookup,
+and each chat turn is written in one transaction / round trip.
 """
 
-from typing import Dict, List
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.storage.db.models import ChatSession
+from config.config import SESSION_STORE, SQLITE_DB_PATH
 
 
-class SessionStore:
+class SessionStore(ABC):
+    """
+    Abstract chat session store.
+    """
+
+    # --------------------------------------------------
+    # Sessions
+    # --------------------------------------------------
+
+    @abstractmethod
+    def register_session(self, session: ChatSession):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[ChatSession]:
+        raise NotImplementedError
+
+    # --------------------------------------------------
+    # History
+    # --------------------------------------------------
+
+    @abstractmethod
+    def get(self, session_id: str) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_summary(self, session_id: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_turn(
+        self,
+        session_id: str,
+        messages: List[dict],
+        summary: Optional[str] = None,
+    ):
+        """
+        Replaces the stored history and, when given, the rolling
+        summary in a single write.
+        """
+        raise NotImplementedError
+
+    def save(self, session_id: str, messages: List[dict]):
+        self.save_turn(session_id, messages)
+
+    @abstractmethod
+    def clear(self, session_id: str):
+        raise NotImplementedError
+
+
+class InMemorySessionStore(SessionStore):
     """
     Simple in-memory session store.
-    Replace with DB/Redis later.
     """
 
     def __init__(self):
         self.sessions: Dict[str, List[dict]] = {}
+        self.summaries: Dict[str, str] = {}
+        self.records: Dict[str, ChatSession] = {}
+
+    # --------------------------------------------------
+
+    def register_session(self, session: ChatSession):
+        self.records[session.session_id] = session
+
+    def get_session(self, session_id: str) -> Optional[ChatSession]:
+        return self.records.get(session_id)
 
     # --------------------------------------------------
 
     def get(self, session_id: str) -> List[dict]:
         return self.sessions.get(session_id, [])
 
-    # --------------------------------------------------
+    def get_summary(self, session_id: str) -> Optional[str]:
+        return self.summaries.get(session_id)
 
-    def save(self, session_id: str, messages: List[dict]):
+    def save_turn(
+        self,
+        session_id: str,
+        messages: List[dict],
+        summary: Optional[str] = None,
+    ):
         self.sessions[session_id] = messages
+        if summary is not None:
+            self.summaries[session_id] = summary
 
     # --------------------------------------------------
 
     def clear(self, session_id: str):
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        self.sessions.pop(session_id, None)
+        self.summaries.pop(session_id, None)
+        self.records.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions and their history in SQLite, one row per session.
+
+    Each thread gets its own connection (sqlite3 connections are
+    not shareable across threads); WAL lets those readers proceed
+    while another thread writes.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS chat_sessions (
+        session_id TEXT PRIMARY KEY,
+        media_id   TEXT,
+        created_at TEXT,
+        messages   TEXT NOT NULL DEFAULT '[]',
+        summary    TEXT
+    );
+    """
+
+    def __init__(self, path: str = SQLITE_DB_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self._local = threading.local()
+
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    # --------------------------------------------------
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --------------------------------------------------
+
+    def register_session(self, session: ChatSession):
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO chat_sessions (session_id, media_id, created_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET "
+                "media_id = excluded.media_id, created_at = excluded.created_at",
+                (
+                    session.session_id,
+                    session.media_id,
+                    session.created_at.isoformat(),
+                ),
+            )
+
+    def get_session(self, session_id: str) -> Optional[ChatSession]:
+        row = self._conn.execute(
+            "SELECT session_id, media_id, created_at FROM chat_sessions "
+            "WHERE session_id = ? AND media_id IS NOT NULL",
+            (session_id,),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return ChatSession(
+            session_id=row[0],
+            media_id=row[1],
+            created_at=datetime.fromisoformat(row[2]),
+        )
+
+    # --------------------------------------------------
+
+    def get(self, session_id: str) -> List[dict]:
+        row = self._conn.execute(
+            "SELECT messages FROM chat_sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def get_summary(self, session_id: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT summary FROM chat_sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def save_turn(
+        self,
+        session_id: str,
+        messages: List[dict],
+        summary: Optional[str] = None,
+    ):
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO chat_sessions (session_id, messages, summary) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET "
+                "messages = excluded.messages, "
+                "summary = COALESCE(excluded.summary, chat_sessions.summary)",
+                (session_id, json.dumps(messages), summary),
+            )
+
+    # --------------------------------------------------
+
+    def clear(self, session_id: str):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM chat_sessions WHERE session_id = ?",
+                (session_id,),
+            )
+
+
+@lru_cache(maxsize=1)
+def get_session_store() -> SessionStore:
+    """
+    Process-wide store selected by SESSION_STORE
+    ("sqlite", "redis" or "memory").
+    """
+    if SESSION_STORE == "sqlite":
+        return SQLiteSessionStore()
+
+    if SESSION_STORE == "redis":
+        # redis is only required when this store is selected
+        from src.storage.db.redis_session_store import RedisSessionStore
+
+        return RedisSessionStore()
+
+    if SESSION_STORE == "memory":
+        return InMemorySessionStore()
 
+    raise ValueError(f"Unknown session store: {SESSION_STORE}")
@@ -0,0 +1,230 @@
+"""
+SQLite Storage Backend
+----------------------
+
+Embedded storage backend for single-node deployments
+and test rigs, with no Elasticsearch cluster required.
+
+- Transcript chunks are full-text indexed with FTS5 and ranked with bm25()
+- WAL mode lets readers (chat) run while the pipeline writes
+- Inserts are batched with executemany in one transaction
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.schemas.agent_outputs import BaseAgentOutput, TranscriptChunk
+from src.storage.backend import StorageBackend
+from src.storage.db.models import MediaRecord
+from config.config import SQLITE_DB_PATH, STORAGE_BATCH_SIZE
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    media_id   TEXT PRIMARY KEY,
+    title      TEXT,
+    source     TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS transcript_chunks (
+    id         INTEGER PRIMARY KEY,
+    media_id   TEXT NOT NULL,
+    text       TEXT NOT NULL,
+    start_time REAL,
+    end_time   REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_transcript_chunks_media
+    ON transcript_chunks (media_id);
+
+-- External-content FTS index over transcript_chunks, kept in sync by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+    text,
+    content = 'transcript_chunks',
+    content_rowid = 'id',
+    tokenize = 'porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS transcript_chunks_ai AFTER INSERT ON transcript_chunks
+BEGIN
+    INSERT INTO transcript_fts (rowid, text) VALUES (new.id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transcript_chunks_ad AFTER DELETE ON transcript_chunks
+BEGIN
+    INSERT INTO transcript_fts (transcript_fts, rowid, text)
+    VALUES ('delete', old.id, old.text);
+END;
+
+CREATE TABLE IF NOT EXISTS insights (
+    media_id   TEXT NOT NULL,
+    agent_name TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (media_id, agent_name)
+);
+"""
+
+QUERY_TERM_PATTERN = re.compile(r"\w+")
+
+
+class SQLiteStorageBackend(StorageBackend):
+    """
+    StorageBackend on a single SQLite database file.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str = SQLITE_DB_PATH,
+        batch_size: int = STORAGE_BATCH_SIZE,
+    ):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.batch_size = max(batch_size, 1)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # --------------------------------------------------
+    # Transcripts
+    # --------------------------------------------------
+
+    def index_transcript(self, media_id: str, chunks: List[TranscriptChunk]):
+        rows = [
+            (media_id, chunk.text, chunk.start_time, chunk.end_time)
+            for chunk in chunks
+        ]
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM transcript_chunks WHERE media_id = ?",
+                (media_id,),
+            )
+            for i in range(0, len(rows), self.batch_size):
+                self._conn.executemany(
+                    "INSERT INTO transcript_chunks (media_id, text, start_time, end_time) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows[i : i + self.batch_size],
+                )
+
+    def keyword_search(self, media_id: str, query: str, top_k: int) -> List[str]:
+        match = _fts_query(query)
+        if not match:
+            return []
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.text FROM transcript_fts "
+                "JOIN transcript_chunks c ON c.id = transcript_fts.rowid "
+                "WHERE transcript_fts MATCH ? AND c.media_id = ? "
+                "ORDER BY bm25(transcript_fts) LIMIT ?",
+                (match, media_id, top_k),
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    # --------------------------------------------------
+    # Insights
+    # --------------------------------------------------
+
+    def store_insight(self, output: BaseAgentOutput):
+        self.store_insights([output])
+
+    def store_insights(self, outputs: List[BaseAgentOutput]):
+        updated_at = datetime.utcnow().isoformat()
+        rows = [
+            (
+                output.media_id,
+                output.agent_name,
+                output.model_dump_json(),
+                updated_at,
+            )
+            for output in outputs
+        ]
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO insights "
+                "(media_id, agent_name, payload, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def get_insights(self, media_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT agent_name, payload FROM insights WHERE media_id = ?",
+                (media_id,),
+            ).fetchall()
+
+        return {agent_name: json.loads(payload) for agent_name, payload in rows}
+
+    # --------------------------------------------------
+    # Media records
+    # --------------------------------------------------
+
+    def upsert_media(self, record: MediaRecord):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media (media_id, title, source, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    record.media_id,
+                    record.title,
+                    record.source,
+                    record.created_at.isoformat(),
+                ),
+            )
+
+    def get_media(self, media_id: str) -> Optional[MediaRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT media_id, title, source, created_at FROM media WHERE media_id = ?",
+                (media_id,),
+            ).fetchone()
+
+        return _to_record(row) if row else None
+
+    def list_media(self, limit: int = 100) -> List[MediaRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT media_id, title, source, created_at FROM media "
+                "ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+        return [_to_record(row) for row in rows]
+
+
+# ----------------------------------------------------------------------
+# Utilities
+# ----------------------------------------------------------------------
+
+def _fts_query(query: str) -> str:
+    """
+    Turns free text into an FTS5 OR-query of quoted terms, so user
+    input can never be parsed as FTS5 syntax (NEAR, *, column filters).
+    """
+    terms = dict.fromkeys(QUERY_TERM_PATTERN.findall(query.lower()))
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def _to_record(row) -> MediaRecord:
+    media_id, title, source, created_at = row
+    return MediaRecord(
+        media_id=media_id,
+        title=title,
+        source=source,
+        created_at=datetime.fromisoformat(created_at),
+    )
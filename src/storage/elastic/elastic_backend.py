@@ -0,0 +1,200 @@
+"""
+Elasticsearch Storage Backend
+-----------------------------
+
+StorageBackend implementation on an Elasticsearch cluster.
+Transcript chunks are written with the bulk API instead of
+one index request per chunk.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import bulk
+
+from src.schemas.agent_outputs import (
+    BaseAgentOutput,
+    TranscriptChunk,
+    VideoAnalysisOutput,
+)
+from src.storage.backend import StorageBackend
+from src.storage.elastic.index_manager import IndexManager
+from src.storage.db.models import MediaRecord
+from config.config import (
+    MEDIA_RECORDS_INDEX,
+    MEDIA_TRANSCRIPTS_INDEX,
+    MEDIA_INSIGHTS_INDEX,
+    MEDIA_SCENES_INDEX,
+    STORAGE_BATCH_SIZE,
+)
+
+
+class ElasticStorageBackend(StorageBackend):
+    """
+    StorageBackend on Elasticsearch indices.
+    """
+
+    name = "elasticsearch"
+
+    def __init__(
+        self,
+        es_client: Elasticsearch,
+        batch_size: int = STORAGE_BATCH_SIZE,
+    ):
+        self.es = es_client
+        self.batch_size = max(batch_size, 1)
+
+    # --------------------------------------------------
+
+    def ensure_indices(self):
+        index_manager = IndexManager(self.es)
+        index_manager.create_media_records_index(MEDIA_RECORDS_INDEX)
+        index_manager.create_transcript_index(MEDIA_TRANSCRIPTS_INDEX)
+        index_manager.create_insights_index(MEDIA_INSIGHTS_INDEX)
+        index_manager.create_scenes_index(MEDIA_SCENES_INDEX)
+
+    # --------------------------------------------------
+    # Transcripts
+    # --------------------------------------------------
+
+    def index_transcript(self, media_id: str, chunks: List[TranscriptChunk]):
+        self.es.delete_by_query(
+            index=MEDIA_TRANSCRIPTS_INDEX,
+            body={"query": {"term": {"media_id": media_id}}},
+            conflicts="proceed",
+        )
+
+        bulk(
+            self.es,
+            (
+                {
+                    "_index": MEDIA_TRANSCRIPTS_INDEX,
+                    "_id": f"{media_id}:{i}",
+                    "_source": {
+                        "media_id": media_id,
+                        "text": chunk.text,
+                        "start_time": chunk.start_time,
+                        "end_time": chunk.end_time,
+                    },
+                }
+                for i, chunk in enumerate(chunks)
+            ),
+            chunk_size=self.batch_size,
+        )
+
+    def keyword_search(self, media_id: str, query: str, top_k: int) -> List[str]:
+        body = {
+            "size": top_k,
+            "_source": ["text"],
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"term": {"media_id": media_id}}
+                    ],
+                    "must": [
+                        {"match": {"text": query}}
+                    ],
+                }
+            },
+        }
+
+        response = self.es.search(
+            index=MEDIA_TRANSCRIPTS_INDEX,
+            body=body,
+        )
+
+        hits = response.get("hits", {}).get("hits", [])
+        return [hit["_source"]["text"] for hit in hits]
+
+    # --------------------------------------------------
+    # Insights
+    # --------------------------------------------------
+
+    def store_insight(self, output: BaseAgentOutput):
+        self.store_insights([output])
+
+    def store_insights(self, outputs: List[BaseAgentOutput]):
+        updated_at = datetime.utcnow().isoformat()
+        actions = []
+
+        for output in outputs:
+            actions.append(
+                {
+                    "_index": MEDIA_INSIGHTS_INDEX,
+                    "_id": f"{output.media_id}:{output.agent_name}",
+                    "_source": {
+                        "media_id": output.media_id,
+                        "agent_name": output.agent_name,
+                        "payload": output.model_dump(mode="json"),
+                        "updated_at": updated_at,
+                    },
+                }
+            )
+
+            # Scenes are also indexed one document each, so they are searchable
+            if isinstance(output, VideoAnalysisOutput):
+                self.es.delete_by_query(
+                    index=MEDIA_SCENES_INDEX,
+                    body={"query": {"term": {"media_id": output.media_id}}},
+                    conflicts="proceed",
+                )
+                actions.extend(
+                    {
+                        "_index": MEDIA_SCENES_INDEX,
+                        "_id": f"{output.media_id}:{scene.scene_id}",
+                        "_source": {
+                            "media_id": output.media_id,
+                            **scene.model_dump(mode="json"),
+                        },
+                    }
+                    for scene in output.scenes
+                )
+
+        bulk(self.es, actions, chunk_size=self.batch_size)
+
+    def get_insights(self, media_id: str) -> Dict[str, Dict[str, Any]]:
+        response = self.es.search(
+            index=MEDIA_INSIGHTS_INDEX,
+            body={
+                "size": 100,
+                "query": {"term": {"media_id": media_id}},
+            },
+        )
+
+        hits = response.get("hits", {}).get("hits", [])
+        return {
+            hit["_source"]["agent_name"]: hit["_source"]["payload"]
+            for hit in hits
+        }
+
+    # --------------------------------------------------
+    # Media records
+    # --------------------------------------------------
+
+    def upsert_media(self, record: MediaRecord):
+        self.es.index(
+            index=MEDIA_RECORDS_INDEX,
+            id=record.media_id,
+            document=record.model_dump(mode="json"),
+        )
+
+    def get_media(self, media_id: str) -> Optional[MediaRecord]:
+        if not self.es.exists(index=MEDIA_RECORDS_INDEX, id=media_id):
+            return None
+
+        response = self.es.get(index=MEDIA_RECORDS_INDEX, id=media_id)
+        return MediaRecord(**response["_source"])
+
+    def list_media(self, limit: int = 100) -> List[MediaRecord]:
+        response = self.es.search(
+            index=MEDIA_RECORDS_INDEX,
+            body={
+                "size": limit,
+                "sort": [{"created_at": {"order": "desc"}}],
+                "query": {"match_all": {}},
+            },
+        )
+
+        hits = response.get("hits", {}).get("hits", [])
+        return [MediaRecord(**hit["_source"]) for hit in hits]
@@ -6,7 +6,10 @@ Creates and manages indices for media,
 transcripts, and embeddings.
 """
 
-from elasticsearch import Elasticsearch
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
 
 
 class IndexManager:
@@ -14,7 +17,7 @@ class IndexManager:
     Manages Elasticsearch indices.
     """
 
-    def __init__(self, es_client: Elasticsearch):
+    def __init__(self, es_client: "Elasticsearch"):
         self.es = es_client
 
     # --------------------------------------------------
@@ -42,7 +45,10 @@ class IndexManager:
             "mappings": {
                 "properties": {
                     "media_id": {"type": "keyword"},
+                    "passage_index": {"type": "integer"},
                     "text": {"type": "text"},
+                    "start_time": {"type": "float"},
+                    "end_time": {"type": "float"},
                     "embedding": {
                         "type": "dense_vector",
                         "dims": dims,
@@ -55,3 +61,74 @@ class IndexManager:
 
         if not self.es.indices.exists(index=index_name):
             self.es.indices.create(index=index_name, body=mapping)
+
+    # --------------------------------------------------
+
+    def create_transcript_index(self, index_name: str):
+        mapping = {
+            "mappings": {
+                "properties": {
+                    "media_id": {"type": "keyword"},
+                    "text": {"type": "text"},
+                    "start_time": {"type": "float"},
+                    "end_time": {"type": "float"},
+                }
+            }
+        }
+
+        if not self.es.indices.exists(index=index_name):
+            self.es.indices.create(index=index_name, body=mapping)
+
+    # --------------------------------------------------
+
+    def create_insights_index(self, index_name: str):
+        # Payloads differ per agent, so they are stored but not indexed
+        mapping = {
+            "mappings": {
+                "properties": {
+                    "media_id": {"type": "keyword"},
+                    "agent_name": {"type": "keyword"},
+                    "payload": {"type": "object", "enabled": False},
+                    "updated_at": {"type": "date"},
+                }
+            }
+        }
+
+        if not self.es.indices.exists(index=index_name):
+            self.es.indices.create(index=index_name, body=mapping)
+
+    # --------------------------------------------------
+
+    def create_media_records_index(self, index_name: str):
+        mapping = {
+            "mappings": {
+                "properties": {
+                    "media_id": {"type": "keyword"},
+                    "title": {"type": "text"},
+                    "source": {"type": "keyword"},
+                    "created_at": {"type": "date"},
+                }
+            }
+        }
+
+        if not self.es.indices.exists(index=index_name):
+            self.es.indices.create(index=index_name, body=mapping)
+
+    # --------------------------------------------------
+
+    def create_scenes_index(self, index_name: str):
+        mapping = {
+            "mappings": {
+                "properties": {
+                    "media_id": {"type": "keyword"},
+                    "scene_id": {"type": "integer"},
+                    "start_time": {"type": "float"},
+                    "end_time": {"type": "float"},
+                    "description": {"type": "text"},
+                    "key_objects": {"type": "keyword"},
+                }
+            }
+        }
+
+        if not self.es.indices.exists(index=index_name):
+            self.es.indices.create(index=index_name, body=mapping)
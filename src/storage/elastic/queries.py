@@ -5,9 +5,16 @@ Elasticsearch Queries
 Reusable queries for search and retrieval.
 """
 
-from typing import List
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
-from elasticsearch import Elasticsearch
+from config.config import KNN_NUM_CANDIDATES_FACTOR
+
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
+
+
+# Elasticsearch rejects num_candidates above this value
+MAX_NUM_CANDIDATES = 10000
 
 
 class ElasticQueries:
@@ -15,7 +22,7 @@ class ElasticQueries:
     Query helper for Elasticsearch.
     """
 
-    def __init__(self, es_client: Elasticsearch, index_name: str):
+    def __init__(self, es_client: "Elasticsearch", index_name: str):
         self.es = es_client
         self.index_name = index_name
 
@@ -36,19 +43,59 @@ class ElasticQueries:
 
     # --------------------------------------------------
 
-    def vector_search(self, embedding: List[float], top_k: int = 5) -> List[str]:
-        body = {
-            "size": top_k,
-            "query": {
-                "script_score": {
-                    "query": {"match_all": {}},
-                    "script": {
-                        "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
-                        "params": {"query_vector": embedding},
-                    },
-                }
-            },
-        }
+    def vector_search(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        media_id: Optional[str] = None,
+        num_candidates: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Approximate kNN search over the HNSW graph of the
+        `embedding` field, optionally restricted to one media.
+        """
+        body = self.knn_body(
+            embedding,
+            top_k=top_k,
+            media_id=media_id,
+            num_candidates=num_candidates,
+        )
 
         response = self.es.search(index=self.index_name, body=body)
         return [hit["_source"]["text"] for hit in response["hits"]["hits"]]
+
+    # --------------------------------------------------
+
+    @staticmethod
+    def knn_body(
+        embedding: List[float],
+        top_k: int = 5,
+        media_id: Optional[str] = None,
+        num_candidates: Optional[int] = None,
+        source_fields: Sequence[str] = ("text",),
+    ) -> dict:
+        """
+        Builds a kNN search body.
+
+        The media filter is applied during graph traversal, so the
+        top_k results all belong to the media instead of being
+        post-filtered out of a corpus-wide top_k.
+        """
+        if num_candidates is None:
+            num_candidates = top_k * KNN_NUM_CANDIDATES_FACTOR
+
+        knn = {
+            "field": "embedding",
+            "query_vector": embedding,
+            "k": top_k,
+            "num_candidates": min(max(num_candidates, top_k), MAX_NUM_CANDIDATES),
+        }
+
+        if media_id is not None:
+            knn["filter"] = {"term": {"media_id": media_id}}
+
+        return {
+            "size": top_k,
+            "knn": knn,
+            "_source": list(source_fields),
+        }
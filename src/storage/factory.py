@@ -0,0 +1,37 @@
+"""
+Storage Factory
+---------------
+
+Selects the process-wide StorageBackend from configuration.
+"""
+
+from functools import lru_cache
+
+from src.storage.backend import StorageBackend
+from src.storage.db.sqlite_backend import SQLiteStorageBackend
+from config.config import ELASTICSEARCH_URL, STORAGE_BACKEND
+
+
+@lru_cache(maxsize=1)
+def get_storage_backend() -> StorageBackend:
+    """
+    "auto" uses Elasticsearch when ELASTICSEARCH_URL is set
+    and the embedded SQLite backend otherwise.
+    """
+    backend = STORAGE_BACKEND
+    if backend == "auto":
+        backend = "elasticsearch" if ELASTICSEARCH_URL else "sqlite"
+
+    if backend == "elasticsearch":
+        # The client library is only needed for this backend
+        from src.storage.elastic.elastic_backend import ElasticStorageBackend
+        from src.storage.elastic.es_client import get_es_client
+
+        storage = ElasticStorageBackend(get_es_client())
+        storage.ensure_indices()
+        return storage
+
+    if backend == "sqlite":
+        return SQLiteStorageBackend()
+
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -1,10 +1,5 @@
 import streamlit as st
 
-from src.app_pages.upload import render_upload_page
-from src.app_pages.media_dashboard import render_media_dashboard
-from src.app_pages.insights import render_insights_page
-from src.app_pages.chat import render_chat_page
-
 
 # ---------------------------------------------------------
 # Page Config (DO THIS FIRST)
@@ -95,19 +90,27 @@ with st.sidebar:
 
 
 # ---------------------------------------------------------
-# Page Routing
+# Page Routing (a page's modules are imported when first shown)
 # ---------------------------------------------------------
 
 if page == "📤 Upload Media":
+    from src.app_pages.upload import render_upload_page
+
     render_upload_page()
 
 elif page == "📊 Media Dashboard":
+    from src.app_pages.media_dashboard import render_media_dashboard
+
     render_media_dashboard()
 
 elif page == "🧠 Insights":
+    from src.app_pages.insights import render_insights_page
+
     render_insights_page()
 
 elif page == "💬 Chat":
+    from src.app_pages.chat import render_chat_page
+
     render_chat_page()
 
 
@@ -0,0 +1,17 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Run from anywhere: the project modules are imported as src.* / config.*
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Stores default to DATA_DIR; keep test runs out of the project's data/.
+# Set before config.config is first imported, which reads it once.
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="sentinel-tests-")
+os.environ["DATA_DIR"] = TEST_DATA_DIR
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
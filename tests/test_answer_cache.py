@@ -0,0 +1,80 @@
+import pytest
+
+from src.rag.answer_cache import (
+    AnswerCache,
+    conversation_fingerprint,
+    normalize_question,
+)
+from src.rag.embeddings import EmbeddingCache, EmbeddingPipeline, HashingEmbeddingProvider
+
+
+@pytest.fixture
+def embedder(tmp_path):
+    return EmbeddingPipeline(
+        provider=HashingEmbeddingProvider(dims=64),
+        cache=EmbeddingCache(tmp_path / "embeddings.sqlite3"),
+    )
+
+
+def test_normalize_question():
+    assert normalize_question("  Summarize THIS!! ") == "summarize this"
+
+
+def test_exact_hit_and_version_mismatch():
+    cache = AnswerCache(semantic=False)
+    cache.put("m1", "What is it about?", "cats", version="v1")
+
+    assert cache.get("m1", "what is it about", version="v1") == "cats"
+    assert cache.get("m1", "what is it about", version="v2") is None
+    assert cache.get("m2", "what is it about", version="v1") is None
+
+
+def test_invalidate_drops_only_that_media():
+    cache = AnswerCache(semantic=False)
+    cache.put("m1", "q", "a1")
+    cache.put("m2", "q", "a2")
+
+    cache.invalidate("m1")
+
+    assert cache.get("m1", "q") is None
+    assert cache.get("m2", "q") == "a2"
+
+
+def test_lru_eviction():
+    cache = AnswerCache(max_entries=2, semantic=False)
+    cache.put("m1", "q1", "a1")
+    cache.put("m1", "q2", "a2")
+    cache.get("m1", "q1")
+    cache.put("m1", "q3", "a3")
+
+    assert cache.get("m1", "q2") is None
+    assert cache.get("m1", "q1") == "a1"
+
+
+def test_follow_up_is_scoped_to_conversation():
+    cache = AnswerCache(semantic=False)
+    history = [
+        {"role": "user", "content": "who speaks first?"},
+        {"role": "assistant", "content": "Alice"},
+    ]
+    asked_in = conversation_fingerprint(None, history)
+    cache.put("m1", "explain that more", "about Alice...", conversation=asked_in)
+
+    assert cache.get("m1", "explain that more", conversation=asked_in) == "about Alice..."
+    # A fresh session, or one with different history, must not reuse it
+    assert cache.get("m1", "explain that more") is None
+    other = conversation_fingerprint(None, history[:1] + [{"role": "assistant", "content": "Bob"}])
+    assert cache.get("m1", "explain that more", conversation=other) is None
+
+
+def test_fresh_conversations_share_answers():
+    assert conversation_fingerprint(None, []) == ""
+    assert conversation_fingerprint("earlier turns", []) != ""
+
+
+def test_semantic_lookup_respects_conversation(embedder):
+    cache = AnswerCache(semantic=True, similarity_threshold=0.8, embedder=embedder)
+    cache.put("m1", "what are the main topics discussed", "topics", conversation="c1")
+
+    assert cache.get("m1", "what are the main topics discussed here", conversation="c1") == "topics"
+    assert cache.get("m1", "what are the main topics discussed here", conversation="c2") is None
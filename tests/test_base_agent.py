@@ -0,0 +1,26 @@
+import logging
+
+from src.agents.base_agent import BaseAgent
+from src.schemas.agent_outputs import BaseAgentOutput
+
+
+class _FailingAgent(BaseAgent):
+    def __init__(self):
+        super().__init__(agent_name="RiskAgent", media_id="m1")
+
+    def execute(self) -> BaseAgentOutput:
+        raise ValueError("bad response")
+
+
+def test_failure_is_logged_with_agent_name(caplog, capsys):
+    with caplog.at_level(logging.ERROR, logger="src.agents.base_agent"):
+        output = _FailingAgent().run()
+
+    assert not output.success
+    assert output.error_message == "bad response"
+    assert "ValueError" in output.metadata["traceback"]
+
+    record = caplog.records[-1]
+    assert "RiskAgent failed for media m1" in record.getMessage()
+    assert record.exc_info is not None
+    assert capsys.readouterr().out == ""
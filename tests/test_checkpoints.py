@@ -0,0 +1,83 @@
+import pytest
+
+import src.orchestration.workflow_runner as workflow_runner
+from src.orchestration.checkpoint_store import CheckpointStore
+from src.orchestration.context_loader import CONTEXT_KEYS, OUTPUT_SCHEMAS
+from src.orchestration.workflow_runner import WorkflowRunner
+from src.rag.summary_tree import SummaryTreeStore
+from src.storage.db.sqlite_backend import SQLiteStorageBackend
+
+
+def _output(agent_name: str, media_id: str = "m1", success: bool = True):
+    return OUTPUT_SCHEMAS[CONTEXT_KEYS[agent_name]](
+        agent_name=agent_name,
+        media_id=media_id,
+        success=success,
+        error_message=None if success else "boom",
+    )
+
+
+class _StubRunner(WorkflowRunner):
+    """
+    Runs the real graph, checkpointing and resume logic with
+    stub agent outputs instead of LLM calls.
+    """
+
+    def __init__(self, *args, failing=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing = set(failing)
+        self.ran = []
+
+    def _run_agent(self, agent_name, audio_path, frame_paths):
+        self.ran.append(agent_name)
+        self._store_output(
+            agent_name,
+            _output(agent_name, self.media_id, agent_name not in self.failing),
+        )
+
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    store = CheckpointStore(tmp_path / "checkpoints")
+    monkeypatch.setattr(workflow_runner, "CheckpointStore", lambda: store)
+    monkeypatch.setattr(
+        workflow_runner, "SummaryTreeStore", lambda: SummaryTreeStore(tmp_path / "summaries")
+    )
+    monkeypatch.setattr(
+        workflow_runner, "get_storage_backend", lambda: SQLiteStorageBackend(":memory:")
+    )
+    return store
+
+
+def test_store_round_trip(tmp_path):
+    store = CheckpointStore(tmp_path)
+    store.save("r1", _output("RiskAgent"))
+
+    loaded = store.load("m1", "r1")
+    assert list(loaded) == ["RiskAgent"]
+    assert loaded["RiskAgent"].success
+    assert store.load("m1", "other") == {}
+
+
+def test_failed_node_keeps_run_resumable(checkpoints):
+    first = _StubRunner("m1", run_id="r1", failing={"RiskAgent"})
+    first.run(audio_path="a.wav")
+
+    assert checkpoints.resumable_run_id("m1") == "r1"
+    assert "RiskAgent" not in checkpoints.load("m1", "r1")
+
+    resumed = _StubRunner("m1", run_id="r1")
+    context = resumed.run(audio_path="a.wav", resume=True)
+
+    # Only the failed node runs again
+    assert resumed.ran == ["RiskAgent"]
+    assert all(output.success for output in context.values())
+
+
+def test_successful_run_clears_checkpoints(checkpoints):
+    _StubRunner("m1", run_id="old", failing={"RiskAgent"}).run(audio_path="a.wav")
+    _StubRunner("m1", run_id="new").run(audio_path="a.wav")
+
+    assert checkpoints.resumable_run_id("m1") is None
+    assert checkpoints.load("m1", "old") == {}
+    assert checkpoints.load("m1", "new") == {}
@@ -0,0 +1,53 @@
+from src.rag.embeddings import EmbeddingCache, EmbeddingPipeline, HashingEmbeddingProvider
+
+
+class _CountingProvider(HashingEmbeddingProvider):
+    def __init__(self):
+        super().__init__(dims=16)
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return super().embed(texts)
+
+
+def _pipeline(tmp_path, **kwargs):
+    provider = _CountingProvider()
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    return EmbeddingPipeline(provider=provider, cache=cache, **kwargs), provider, cache
+
+
+def _cached_rows(cache):
+    return cache._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+def test_passages_are_cached_on_disk(tmp_path):
+    pipeline, provider, cache = _pipeline(tmp_path)
+
+    pipeline.embed(["budget review", "hiring plans", "budget review"])
+    pipeline.embed(["hiring plans"])
+
+    assert provider.calls == [["budget review", "hiring plans"]]
+    assert _cached_rows(cache) == 2
+
+
+def test_queries_stay_out_of_the_disk_cache(tmp_path):
+    pipeline, provider, cache = _pipeline(tmp_path, query_cache_size=2)
+
+    first = pipeline.embed_query("what about the budget?")
+    assert pipeline.embed_query("what about the budget?") is first
+    assert _cached_rows(cache) == 0
+
+    # Least recently used query is evicted
+    pipeline.embed_query("who was hired?")
+    pipeline.embed_query("what about the budget?")
+    pipeline.embed_query("when is the launch?")
+    pipeline.embed_query("what about the budget?")
+    pipeline.embed_query("who was hired?")
+
+    assert [call[0] for call in provider.calls] == [
+        "what about the budget?",
+        "who was hired?",
+        "when is the launch?",
+        "who was hired?",
+    ]
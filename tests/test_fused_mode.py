@@ -0,0 +1,121 @@
+import pytest
+
+import src.orchestration.workflow_runner as workflow_runner
+from src.orchestration.checkpoint_store import CheckpointStore
+from src.orchestration.context_loader import CONTEXT_KEYS, OUTPUT_SCHEMAS
+from src.orchestration.workflow_runner import WorkflowRunner
+from src.rag.summary_tree import SummaryTreeStore
+from src.schemas.agent_outputs import (
+    AudioAnalysisOutput,
+    FusedTextAnalysisOutput,
+    RiskAssessmentOutput,
+    TranscriptChunk,
+)
+from src.storage.db.sqlite_backend import SQLiteStorageBackend
+
+
+class _StubAgent:
+    version = 1
+
+    def __init__(self, agent_name, output, ran):
+        self.agent_name = agent_name
+        self.output = output
+        self.ran = ran
+
+    def fingerprint_settings(self):
+        return {}
+
+    def run(self):
+        self.ran.append(self.agent_name)
+        return self.output
+
+
+class _StubRunner(WorkflowRunner):
+    """
+    The real scheduling and fused-mode logic, with stub agents.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ran = []
+
+    def _build_agent(self, agent_name, audio_path, frame_paths):
+        if agent_name == "VideoAgent":
+            return None
+
+        if agent_name == "AudioAgent":
+            output = AudioAnalysisOutput(
+                agent_name=agent_name,
+                media_id=self.media_id,
+                success=True,
+                full_transcript="we will double the price",
+                transcript_chunks=[
+                    TranscriptChunk(text="we will double the price", start_time=0, end_time=2)
+                ],
+            )
+        else:
+            output = OUTPUT_SCHEMAS[CONTEXT_KEYS[agent_name]](
+                agent_name=agent_name, media_id=self.media_id, success=True
+            )
+        return _StubAgent(agent_name, output, self.ran)
+
+    def _build_fused_agent(self):
+        parts = {
+            key: OUTPUT_SCHEMAS[key](
+                agent_name=name, media_id=self.media_id, success=True
+            )
+            for name, key in workflow_runner.FUSED_CONTEXT_KEYS.items()
+        }
+        output = FusedTextAnalysisOutput(
+            agent_name="TextAnalysisAgent",
+            media_id=self.media_id,
+            success=True,
+            metadata={"llm_usage": {"prompt_tokens": 100, "completion_tokens": 20}},
+            **parts,
+        )
+        return _StubAgent("TextAnalysisAgent", output, self.ran)
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    (tmp_path / "a.wav").write_bytes(b"RIFF")
+    monkeypatch.setattr(workflow_runner, "ENABLE_FUSED_TEXT_AGENT", True)
+    monkeypatch.setattr(workflow_runner, "ENABLE_SEMANTIC_RETRIEVAL", False)
+    monkeypatch.setattr(
+        workflow_runner, "CheckpointStore", lambda: CheckpointStore(tmp_path / "checkpoints")
+    )
+    monkeypatch.setattr(
+        workflow_runner, "SummaryTreeStore", lambda: SummaryTreeStore(tmp_path / "summaries")
+    )
+    monkeypatch.setattr(
+        workflow_runner, "get_storage_backend", lambda: SQLiteStorageBackend(":memory:")
+    )
+    return _StubRunner("m1"), str(tmp_path / "a.wav")
+
+
+def test_fused_risk_is_assessed_before_reasoning(runner):
+    runner, audio_path = runner
+    context = runner.run(audio_path=audio_path)
+
+    # Documented trade-off: the fused call runs where EmotionAgent
+    # would, so its risk assessment never sees ReasoningAgent's
+    # conclusions, and RiskAgent itself does not run
+    assert "RiskAgent" not in runner.ran
+    assert runner.ran.index("TextAnalysisAgent") < runner.ran.index("ReasoningAgent")
+    assert isinstance(context["risk"], RiskAssessmentOutput)
+    assert context["risk"].metadata["fused_by"] == "TextAnalysisAgent"
+    # Each part carries the call's metadata; the call is charged once
+    assert context["emotion"].metadata["llm_usage"]["prompt_tokens"] == 100
+    assert runner.llm_tokens == 120
+
+
+def test_unfused_risk_runs_after_reasoning(runner, monkeypatch):
+    runner, audio_path = runner
+    # Too long to fuse: the separate agents run
+    monkeypatch.setattr(workflow_runner, "FUSED_TEXT_MAX_TOKENS", 0)
+
+    context = runner.run(audio_path=audio_path)
+
+    assert "TextAnalysisAgent" not in runner.ran
+    assert runner.ran.index("ReasoningAgent") < runner.ran.index("RiskAgent")
+    assert "fused_by" not in context["risk"].metadata
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+import src.rag.bm25_index as bm25_index
+from src.rag.bm25_index import BM25Index, get_bm25_index, invalidate_bm25_index, tokenize
+from src.rag.fusion import dedupe_passages, mmr, reciprocal_rank_fusion
+from src.rag.passages import Passage
+from src.schemas.agent_outputs import AudioAnalysisOutput, TranscriptChunk
+
+
+def _passages(*texts):
+    return [Passage(index=i, text=text) for i, text in enumerate(texts)]
+
+
+def _unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+# ----------------------------------------------------------------------
+# BM25
+# ----------------------------------------------------------------------
+
+def test_tokenize_drops_stopwords_and_possessives():
+    assert tokenize("The model's output, and THE GPU's memory") == [
+        "model", "output", "gpu", "memory",
+    ]
+
+
+def test_bm25_ranks_by_term_rarity_and_frequency():
+    index = BM25Index(_passages(
+        "budget review for the quarter",
+        "budget budget budget overrun",
+        "quarter results and the weather",
+        "weather report",
+    ))
+
+    ranked = [passage.index for _, passage in index.search("budget overrun", top_k=10)]
+    assert ranked == [1, 0]
+
+    # Passages sharing no query term are not returned
+    assert index.search("hiring plans", top_k=10) == []
+    assert len(index.search("budget quarter weather", top_k=2)) == 2
+
+
+def test_bm25_cache_follows_transcript():
+    first = get_bm25_index("m1", "budget review")
+    assert get_bm25_index("m1", "budget review") is first
+    assert get_bm25_index("m1", "budget review, re-transcribed") is not first
+
+    invalidate_bm25_index("m1")
+    assert get_bm25_index("m1", "budget review") is not first
+
+
+def test_transcript_version_covers_chunk_boundaries():
+    chunks = [
+        TranscriptChunk(text="budget", start_time=0, end_time=1),
+        TranscriptChunk(text="review", start_time=1, end_time=2),
+    ]
+    audio = AudioAnalysisOutput(
+        agent_name="AudioAgent",
+        media_id="m1",
+        success=True,
+        full_transcript="budget review",
+        transcript_chunks=chunks,
+    )
+    rechunked = audio.model_copy(
+        update={
+            "transcript_chunks": [
+                TranscriptChunk(text="budget review", start_time=0, end_time=2)
+            ]
+        }
+    )
+
+    assert audio.transcript_version() == audio.transcript_version()
+    assert audio.transcript_version() != rechunked.transcript_version()
+
+
+def test_bm25_cache_with_version_does_not_rehash(monkeypatch):
+    first = get_bm25_index("m2", "budget review", version="v1")
+
+    def rehash(*args):
+        raise AssertionError("transcript hashed per query")
+
+    monkeypatch.setattr(bm25_index, "transcript_digest", rehash)
+    assert get_bm25_index("m2", "budget review", version="v1") is first
+    assert get_bm25_index("m2", "budget review", version="v2") is not first
+
+
+# ----------------------------------------------------------------------
+# Fusion
+# ----------------------------------------------------------------------
+
+def test_rrf_rewards_agreement_between_rankings():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b", "d"]], k=60)
+
+    # Found by both lists, c and b beat a, which only one list ranks first
+    assert [doc_id for doc_id, _ in fused] == ["c", "b", "a", "d"]
+    scores = dict(fused)
+    assert scores["b"] == pytest.approx(2 / 62)
+    assert scores["a"] == pytest.approx(1 / 61)
+    assert scores["c"] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_dedupe_drops_repeated_text_and_overlapping_spans():
+    passages = [
+        Passage(index=0, text="Welcome back", start_time=0, end_time=10),
+        Passage(index=1, text="welcome   BACK", start_time=50, end_time=60),
+        Passage(index=2, text="overlap", start_time=4, end_time=12),
+        Passage(index=3, text="touching", start_time=8, end_time=20),
+        Passage(index=4, text="no timing"),
+    ]
+
+    assert dedupe_passages(passages, max_overlap=0.5) == [0, 3, 4]
+
+
+def test_mmr_trades_relevance_for_diversity():
+    query = _unit(1, 0, 0)
+    docs = np.stack([
+        _unit(1, 0.1, 0),     # most relevant
+        _unit(1, 0.12, 0),    # near-duplicate of the first
+        _unit(0.7, 0, 0.7),   # less relevant, different
+    ])
+
+    assert mmr(query, docs, top_k=2, lambda_=1.0) == [0, 1]
+    assert mmr(query, docs, top_k=2, lambda_=0.5) == [0, 2]
+    # top_k is capped at the number of documents
+    assert sorted(mmr(query, docs, top_k=10)) == [0, 1, 2]
+    assert mmr(query, docs[:0], top_k=3) == []
+
+
+def test_mmr_uses_given_relevance():
+    docs = np.stack([_unit(1, 0), _unit(0, 1)])
+    relevance = np.array([0.1, 0.9], dtype=np.float32)
+
+    assert mmr(_unit(1, 0), docs, top_k=1, relevance=relevance) == [1]
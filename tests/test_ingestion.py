@@ -0,0 +1,51 @@
+import os
+
+from src.ingestion.audio_extractor import AudioExtractor
+from src.ingestion.video_loader import VideoLoader, media_id_for_file
+
+
+def _video(path, content: bytes = b"frames"):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_media_id_follows_content(tmp_path):
+    first = _video(tmp_path / "a.mp4")
+    copy = _video(tmp_path / "b.mp4")
+    other = _video(tmp_path / "c.mp4", b"other frames")
+
+    assert media_id_for_file(first) == media_id_for_file(first)
+    assert media_id_for_file(first) == media_id_for_file(copy)
+    assert media_id_for_file(first) != media_id_for_file(other)
+
+
+def test_load_with_known_media_id_reuses_copy(tmp_path):
+    source = _video(tmp_path / "a.mp4")
+    loader = VideoLoader(workspace_dir=str(tmp_path / "workspace"))
+    media_id = media_id_for_file(source)
+
+    first = loader.load(source, media_id)
+    second = loader.load(source, media_id)
+
+    assert first == second == {
+        "media_id": media_id,
+        "video_path": str(tmp_path / "workspace" / f"{media_id}.mp4"),
+    }
+    assert os.listdir(tmp_path / "workspace") == [f"{media_id}.mp4"]
+
+
+def test_load_without_media_id_creates_new_media(tmp_path):
+    source = _video(tmp_path / "a.mp4")
+    loader = VideoLoader(workspace_dir=str(tmp_path / "workspace"))
+
+    assert loader.load(source)["media_id"] != loader.load(source)["media_id"]
+
+
+def test_extract_reuses_earlier_audio(tmp_path):
+    source = _video(tmp_path / "a.mp4")
+    audio_dir = tmp_path / "audio"
+    extractor = AudioExtractor(output_dir=str(audio_dir))
+    (audio_dir / "m1.wav").write_bytes(b"RIFF")
+
+    # Returns before moviepy is needed
+    assert extractor.extract(source, "m1") == str(audio_dir / "m1.wav")
@@ -0,0 +1,197 @@
+import time
+
+import pytest
+
+import src.jobs.handlers as handlers
+import src.jobs.job_queue as job_queue
+import src.jobs.worker as worker
+from src.ingestion.video_loader import VideoLoader, media_id_for_file
+from src.jobs.job_queue import FAILED, QUEUED, RUNNING, JobQueue
+from src.storage.db.sqlite_backend import SQLiteStorageBackend
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"))
+
+
+def _claim_order(queue, count):
+    return [queue.claim("w").payload["n"] for _ in range(count)]
+
+
+def test_claims_higher_priority_class_first(queue):
+    queue.submit("k", {"n": "batch"}, priority="batch")
+    queue.submit("k", {"n": "standard"}, priority="standard")
+    queue.submit("k", {"n": "interactive"}, priority="interactive")
+
+    assert _claim_order(queue, 3) == ["interactive", "standard", "batch"]
+    assert queue.claim("w") is None
+
+
+def test_claims_shortest_job_first_with_aging(queue):
+    queue.submit("k", {"n": "long"}, expected_seconds=3600)
+    queue.submit("k", {"n": "short"}, expected_seconds=60)
+    assert _claim_order(queue, 1) == ["short"]
+
+    # An hour of waiting outweighs the long job's extra cost
+    old = queue.submit("k", {"n": "old long"}, expected_seconds=3600)
+    queue.submit("k", {"n": "new short"}, expected_seconds=60)
+    queue._conn.execute(
+        "UPDATE jobs SET created_at = ? WHERE job_id = ?",
+        (time.time() - 7200, old),
+    )
+    assert _claim_order(queue, 1) == ["old long"]
+
+
+def test_claims_tenant_with_fewest_running_jobs(queue):
+    queue.submit("k", {"n": "a1"}, tenant="a")
+    queue.submit("k", {"n": "a2"}, tenant="a")
+    queue.submit("k", {"n": "b1"}, tenant="b")
+
+    assert _claim_order(queue, 3) == ["a1", "b1", "a2"]
+
+
+def test_tenant_running_cap(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_TENANT_MAX_RUNNING", 1)
+    queue.submit("k", {"n": "a1"}, tenant="a")
+    queue.submit("k", {"n": "a2"}, tenant="a")
+
+    first = queue.claim("w")
+    assert queue.claim("w") is None
+
+    queue.complete(first.job_id, "w", {})
+    assert _claim_order(queue, 1) == ["a2"]
+
+
+def test_tenant_llm_token_budget(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_TENANT_LLM_TOKENS_PER_HOUR", 1000)
+    for n in ("a1", "a2", "a3"):
+        queue.submit("k", {"n": n}, tenant="a")
+    queue.submit("k", {"n": "b1"}, tenant="b")
+    queue.submit("k", {"n": "b2"}, tenant="b")
+
+    job = queue.claim("w")
+    queue.complete(job.job_id, "w", {"llm_tokens": 400})
+    assert queue.get(job.job_id).llm_tokens == 400
+
+    # Tenant b has used fewer tokens, so it goes next
+    job = queue.claim("w")
+    assert job.tenant == "b"
+    queue.complete(job.job_id, "w", {"llm_tokens": 100})
+
+    job = queue.claim("w")
+    assert job.tenant == "b"
+    queue.complete(job.job_id, "w", {"llm_tokens": 100})
+
+    job = queue.claim("w")
+    assert job.payload["n"] == "a2"
+    queue.complete(job.job_id, "w", {"llm_tokens": 700})
+
+    # Over budget: a3 waits until the usage leaves the hour window
+    assert queue.claim("w") is None
+    queue._conn.execute(
+        "UPDATE llm_usage SET at = ? WHERE tenant = 'a'",
+        (time.time() - 4000,),
+    )
+    assert _claim_order(queue, 1) == ["a3"]
+
+
+def test_failed_attempts_count_against_token_budget(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_TENANT_LLM_TOKENS_PER_HOUR", 1000)
+    job_id = queue.submit("k", {"n": "a1"}, tenant="a", max_attempts=2)
+    queue.submit("k", {"n": "a2"}, tenant="a")
+
+    queue.claim("w")
+    queue.fail(job_id, "w", "boom", llm_tokens=600)
+    assert queue.get(job_id).status == QUEUED
+
+    # The retry is charged on top of the failed attempt
+    job = queue.claim("w")
+    assert job.job_id == job_id
+    queue.complete(job_id, "w", {"llm_tokens": 500})
+    assert queue.get(job_id).llm_tokens == 1100
+
+    assert queue.claim("w") is None
+
+
+def test_worker_charges_tokens_of_failed_handler(queue, monkeypatch):
+    def handler(job, report):
+        error = RuntimeError("storage went away")
+        error.llm_tokens = 250
+        raise error
+
+    monkeypatch.setitem(worker.HANDLERS, "k", handler)
+    job_id = queue.submit("k", {"n": 1}, max_attempts=1)
+
+    assert worker.JobWorker(queue=queue, worker_id="w").run_once()
+
+    job = queue.get(job_id)
+    assert (job.status, job.llm_tokens) == (FAILED, 250)
+    assert job.error == "RuntimeError: storage went away"
+
+
+def test_failed_job_retries_until_max_attempts(queue):
+    job_id = queue.submit("k", {"n": 1}, max_attempts=2)
+
+    queue.claim("w")
+    queue.fail(job_id, "w", "boom")
+    assert queue.get(job_id).status == QUEUED
+
+    assert queue.claim("w").attempts == 2
+    queue.fail(job_id, "w", "boom again")
+
+    job = queue.get(job_id)
+    assert job.status == FAILED
+    assert job.error == "boom again"
+    assert queue.claim("w") is None
+
+
+def test_reaps_jobs_of_dead_workers(queue):
+    job_id = queue.submit("k", {"n": 1}, max_attempts=2)
+    queue.claim("dead")
+    assert queue.reap_stale(timeout_seconds=60) == 0
+
+    queue._conn.execute(
+        "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ?",
+        (time.time() - 120, job_id),
+    )
+    assert queue.reap_stale(timeout_seconds=60) == 1
+    assert queue.get(job_id).status == QUEUED
+    # The dead worker no longer owns it
+    assert not queue.heartbeat(job_id, "dead")
+
+    job = queue.claim("alive")
+    assert (job.status, job.worker_id, job.attempts) == (RUNNING, "alive", 2)
+
+
+def test_process_video_retries_reuse_media(queue, tmp_path, monkeypatch):
+    video = tmp_path / "talk.mp4"
+    video.write_bytes(b"frames")
+    storage = SQLiteStorageBackend(":memory:")
+    analysed = []
+
+    class _Extractor:
+        def extract(self, video_path, media_id):
+            return str(tmp_path / f"{media_id}.wav")
+
+    monkeypatch.setattr(handlers, "ENABLE_VIDEO_AGENT", False)
+    monkeypatch.setattr(handlers, "AudioExtractor", _Extractor)
+    monkeypatch.setattr(handlers, "get_storage_backend", lambda: storage)
+    monkeypatch.setattr(
+        handlers,
+        "VideoLoader",
+        lambda: VideoLoader(workspace_dir=str(tmp_path / "workspace")),
+    )
+    monkeypatch.setattr(
+        handlers,
+        "analyse_media",
+        lambda job, report: analysed.append(job.payload["media_id"]) or {},
+    )
+
+    job_id = queue.submit(handlers.PROCESS_VIDEO, {"video_path": str(video), "title": None})
+    for _ in range(2):
+        handlers.process_video(queue.claim("w"), lambda *_: None)
+        queue.fail(job_id, "w", "worker died")
+
+    assert analysed == [media_id_for_file(str(video))] * 2
+    assert [m.media_id for m in storage.list_media()] == analysed[:1]
@@ -0,0 +1,116 @@
+import numpy as np
+
+from src.rag.bm25_index import get_bm25_index
+from src.rag.embeddings import EmbeddingCache, EmbeddingPipeline, HashingEmbeddingProvider
+from src.rag.local_vector_index import (
+    FlatVectorIndex,
+    HNSWVectorIndex,
+    LocalVectorStore,
+    build_local_vector_index,
+    get_local_vector_index,
+)
+from src.rag.passages import Passage
+from src.schemas.agent_outputs import TranscriptChunk, transcript_digest
+from config.config import RAG_PASSAGE_WORDS
+
+
+def _clustered(n: int, dims: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dims))
+    vectors = centers[rng.integers(clusters, size=n)] + 0.5 * rng.standard_normal((n, dims))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _passages(n: int):
+    return [Passage(index=i, text=f"passage {i}") for i in range(n)]
+
+
+def _recall_at_10(index, exact, queries) -> float:
+    hits = [
+        len(
+            {p.index for _, p in index.search(q, 10)}
+            & {p.index for _, p in exact.search(q, 10)}
+        )
+        / 10
+        for q in queries
+    ]
+    return float(np.mean(hits))
+
+
+def test_hnsw_recall_against_exact_search():
+    vectors = _clustered(800, 32, clusters=10)
+    passages = _passages(len(vectors))
+
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(len(vectors), size=50)]
+    queries = queries + 0.3 * rng.standard_normal(queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    hnsw = HNSWVectorIndex.build(vectors, passages)
+    exact = FlatVectorIndex(vectors, passages)
+
+    assert _recall_at_10(hnsw, exact, queries) >= 0.9
+
+
+def test_hnsw_neighbour_lists_stay_within_capacity():
+    vectors = _clustered(300, 16, clusters=5)
+    hnsw = HNSWVectorIndex.build(vectors, _passages(len(vectors)), m=4)
+
+    for layer, capacity in ((0, 8), (1, 4)):
+        if layer < len(hnsw.neighbors):
+            links = (hnsw.neighbors[layer] >= 0).sum(axis=1)
+            assert links.max() <= capacity
+
+
+def test_flat_index_below_threshold():
+    vectors = _clustered(10, 8, clusters=2)
+    index = build_local_vector_index(_passages(10), vectors, threshold=100)
+
+    assert index.kind == "flat"
+    best = index.search(vectors[3], 1)
+    assert best[0][1].index == 3
+
+
+def test_store_round_trip(tmp_path):
+    vectors = _clustered(200, 16, clusters=4)
+    passages = _passages(len(vectors))
+    hnsw = HNSWVectorIndex.build(vectors, passages, m=4)
+
+    store = LocalVectorStore(tmp_path)
+    store.save("m1", hnsw, "fp")
+
+    assert store.load("m1", "other") is None
+    loaded = store.load("m1", "fp")
+    assert loaded.kind == "hnsw"
+    assert [p.index for _, p in loaded.search(vectors[7], 5)] == [
+        p.index for _, p in hnsw.search(vectors[7], 5)
+    ]
+
+
+def test_index_follows_chunk_boundaries(tmp_path):
+    embedder = EmbeddingPipeline(
+        provider=HashingEmbeddingProvider(dims=32),
+        cache=EmbeddingCache(tmp_path / "cache.sqlite3"),
+    )
+    store = LocalVectorStore(tmp_path / "vectors")
+    # Segments longer than a passage, so each chunk is one passage
+    segments = [" ".join(f"{topic}{i}" for i in range(RAG_PASSAGE_WORDS)) for topic in "abcd"]
+    text = " ".join(segments)
+
+    def chunked(size):
+        return [
+            TranscriptChunk(text=" ".join(segments[i : i + size]), start_time=i, end_time=i + size)
+            for i in range(0, len(segments), size)
+        ]
+
+    built = []
+    for chunks in (chunked(1), chunked(2)):
+        version = transcript_digest(text, chunks)
+        vectors = get_local_vector_index("m1", text, chunks, embedder, store, version)
+        bm25 = get_bm25_index("m1", text, chunks, version)
+
+        # Same text, different chunking: both indexes follow it alike
+        assert [p.text for p in vectors.passages] == [p.text for p in bm25.passages]
+        built.append(len(vectors.passages))
+
+    assert built == [4, 2]
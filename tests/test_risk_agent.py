@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+import src.agents.risk_agent as risk_agent
+from src.agents.risk_agent import RiskAgent
+from src.processing.transcript_windower import TranscriptWindow
+
+
+def _verdict(level, *categories):
+    return json.dumps(
+        {
+            "risk_level": level,
+            "risk_categories": list(categories),
+            "explanation": f"{level} risk",
+            "recommended_actions": [],
+        }
+    )
+
+
+class _ScriptedRiskAgent(RiskAgent):
+    """
+    Answers each window (by its text) and the reduce step from
+    a script instead of calling the LLM.
+    """
+
+    def __init__(self, responses, windows):
+        super().__init__(media_id="m1", transcript_text="transcript")
+        self.responses = responses
+        self.scripted_windows = windows
+        self.reduce_inputs = []
+
+    def _windows(self):
+        return self.scripted_windows
+
+    def _chat_completion(self, messages, response_model=None, model=None):
+        content = "\n".join(message["content"] for message in messages)
+        if "Partial assessments" in content:
+            self.reduce_inputs.append(content)
+            return self.responses["reduce"]
+        for text, response in self.responses.items():
+            if text in content:
+                return response
+        raise AssertionError("unexpected request")
+
+
+@pytest.fixture(autouse=True)
+def no_client(monkeypatch):
+    monkeypatch.setattr(risk_agent, "get_client", lambda: None)
+
+
+def _windows(*texts):
+    return [TranscriptWindow(index=i, text=text) for i, text in enumerate(texts)]
+
+
+def test_unparsable_window_is_left_out_of_the_reduce():
+    agent = _ScriptedRiskAgent(
+        {
+            "window-a": _verdict("high", "safety"),
+            "window-b": "Sorry, I cannot help with that.",
+            "window-c": _verdict("medium", "legal"),
+            "reduce": _verdict("high", "safety", "legal"),
+        },
+        _windows("window-a", "window-b", "window-c"),
+    )
+
+    output = agent.run()
+
+    assert output.success
+    assert output.overall_risk_level == "high"
+    assert output.metadata["failed_windows"] == [1]
+    # Two real verdicts reach the reduce; no placeholder "low"
+    (reduce_input,) = agent.reduce_inputs
+    assert "Part 2:" in reduce_input and "Part 3:" not in reduce_input
+    assert "Risk level: low" not in reduce_input
+
+
+def test_single_remaining_verdict_skips_the_reduce():
+    agent = _ScriptedRiskAgent(
+        {
+            # Repairs to "{}", which states no risk level
+            "window-a": '{"risk_categories": ["saf',
+            "window-b": _verdict("high", "safety"),
+            "reduce": _verdict("low"),
+        },
+        _windows("window-a", "window-b"),
+    )
+
+    output = agent.run()
+
+    assert output.overall_risk_level == "high"
+    assert agent.reduce_inputs == []
+
+
+def test_fails_when_no_window_can_be_assessed():
+    agent = _ScriptedRiskAgent(
+        {"window-a": "no json", "window-b": "none here either", "reduce": _verdict("low")},
+        _windows("window-a", "window-b"),
+    )
+
+    output = agent.run()
+
+    assert not output.success
+
+
+def test_unparsable_single_window_fails_instead_of_reporting_low():
+    agent = _ScriptedRiskAgent({"window-a": "no json"}, _windows("window-a"))
+
+    output = agent.run()
+
+    assert not output.success
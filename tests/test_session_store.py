@@ -0,0 +1,157 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.storage.db.models import ChatSession
+from src.storage.db.redis_session_store import RedisSessionStore
+from src.storage.db.session_store import SQLiteSessionStore
+
+
+class _FakeRedis:
+    """
+    The redis-py subset RedisSessionStore uses, with a manual clock
+    for key expiry. Values are strings (decode_responses=True).
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.data = {}
+        self.expires_at = {}
+
+    def _live(self, key):
+        if key in self.expires_at and self.expires_at[key] <= self.now:
+            self.data.pop(key, None)
+            self.expires_at.pop(key)
+        return self.data.get(key)
+
+    def get(self, key):
+        return self._live(key)
+
+    def set(self, key, value):
+        # Like Redis, SET drops any TTL
+        self.data[key] = value
+        self.expires_at.pop(key, None)
+
+    def hset(self, key, mapping):
+        fields = self._live(key) or {}
+        fields.update(mapping)
+        self.data[key] = fields
+
+    def hgetall(self, key):
+        return dict(self._live(key) or {})
+
+    def expire(self, key, seconds):
+        if self._live(key) is not None:
+            self.expires_at[key] = self.now + seconds
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.expires_at.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def store(request):
+    if request.param == "sqlite":
+        return SQLiteSessionStore(":memory:")
+    return RedisSessionStore(client=_FakeRedis(), ttl_seconds=60)
+
+
+def _messages(*texts):
+    return [{"role": "user", "content": text} for text in texts]
+
+
+def test_session_round_trip(store):
+    session = ChatSession(session_id="s1", media_id="m1", created_at=datetime(2024, 5, 1, 12))
+    store.register_session(session)
+
+    assert store.get_session("s1") == session
+    assert store.get_session("unknown") is None
+
+
+def test_history_round_trip(store):
+    assert store.get("s1") == []
+    assert store.get_summary("s1") is None
+
+    store.save("s1", _messages("hi"))
+    store.save_turn("s1", _messages("hi", "more"), summary="greeting")
+
+    assert store.get("s1") == _messages("hi", "more")
+    assert store.get_summary("s1") == "greeting"
+
+
+def test_save_turn_without_summary_keeps_previous_one(store):
+    store.save_turn("s1", _messages("a"), summary="first summary")
+    store.save_turn("s1", _messages("a", "b"))
+
+    assert store.get("s1") == _messages("a", "b")
+    assert store.get_summary("s1") == "first summary"
+
+    store.save_turn("s1", _messages("c"), summary="second summary")
+    assert store.get_summary("s1") == "second summary"
+
+
+def test_clear(store):
+    store.register_session(ChatSession(session_id="s1", media_id="m1"))
+    store.save_turn("s1", _messages("a"), summary="summary")
+
+    store.clear("s1")
+
+    assert store.get_session("s1") is None
+    assert store.get("s1") == []
+    assert store.get_summary("s1") is None
+
+
+def test_sqlite_history_is_shared_across_threads(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    thread = threading.Thread(target=store.save_turn, args=("s1", _messages("a"), "s"))
+    thread.start()
+    thread.join()
+
+    assert store.get("s1") == _messages("a")
+
+
+def test_redis_sessions_expire_when_idle():
+    client = _FakeRedis()
+    store = RedisSessionStore(client=client, ttl_seconds=60)
+    store.register_session(ChatSession(session_id="s1", media_id="m1"))
+    store.save_turn("s1", _messages("a"), summary="summary")
+
+    # A turn refreshes the TTL of every key of the session
+    client.now = 50
+    store.save_turn("s1", _messages("a", "b"))
+    client.now = 100
+    assert store.get("s1") == _messages("a", "b")
+    assert store.get_summary("s1") == "summary"
+    assert store.get_session("s1").media_id == "m1"
+
+    client.now = 111
+    assert store.get("s1") == []
+    assert store.get_summary("s1") is None
+    assert store.get_session("s1") is None
+
+
+def test_redis_ttl_zero_keeps_sessions():
+    client = _FakeRedis()
+    store = RedisSessionStore(client=client, ttl_seconds=0)
+    store.save_turn("s1", _messages("a"), summary="summary")
+
+    client.now = 10 ** 9
+    assert store.get("s1") == _messages("a")
+    assert client.expires_at == {}
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+
+import src.jobs.stage_worker as stage_worker
+from src.jobs.stage_broker import DONE, FAILED, LEASED, PENDING, LocalStageBroker
+from src.jobs.stage_worker import StageWorker
+from src.storage.artifact_store import ArtifactStore
+
+
+@pytest.fixture
+def broker():
+    return LocalStageBroker(max_attempts=2)
+
+
+def test_publish_is_idempotent(broker):
+    assert broker.publish("i1", "k", {"n": 1})
+    assert not broker.publish("i1", "k", {"n": 2})
+
+    assert broker.lease("w", ["k"]).payload == {"n": 1}
+    assert broker.lease("w", ["k"]) is None
+
+
+def test_leases_kinds_in_given_order(broker):
+    broker.publish("a", "slow", {})
+    broker.publish("b", "fast", {})
+
+    assert broker.lease("w", ["fast", "slow"]).item_id == "b"
+    assert broker.lease("w", ["fast", "slow"]).item_id == "a"
+
+
+def test_expired_lease_is_leased_again(broker):
+    broker.publish("i1", "k", {})
+    first = broker.lease("w1", ["k"], lease_seconds=0)
+
+    second = broker.lease("w2", ["k"])
+    assert (second.item_id, second.attempts) == ("i1", 2)
+    assert second.lease_token != first.lease_token
+    assert broker.status("i1").status == LEASED
+
+
+def test_renewed_lease_is_kept(broker):
+    broker.publish("i1", "k", {})
+    item = broker.lease("w1", ["k"], lease_seconds=0.05)
+
+    assert broker.renew(item, lease_seconds=60)
+    time.sleep(0.1)
+    assert broker.lease("w2", ["k"]) is None
+
+
+def test_stale_token_cannot_renew_or_fail(broker):
+    broker.publish("i1", "k", {})
+    stale = broker.lease("w1", ["k"], lease_seconds=0)
+    current = broker.lease("w2", ["k"])
+
+    assert not broker.renew(stale)
+    broker.fail(stale, "late failure")
+
+    status = broker.status("i1")
+    assert (status.status, status.error) == (LEASED, "lease expired")
+    assert broker.renew(current)
+
+
+def test_first_completion_wins(broker):
+    broker.publish("i1", "k", {})
+    stale = broker.lease("w1", ["k"], lease_seconds=0)
+    current = broker.lease("w2", ["k"])
+
+    # The expired worker finishes first; the current lease is moot
+    assert broker.complete(stale, {"by": "w1"})
+    assert not broker.complete(current, {"by": "w2"})
+    assert not broker.renew(current)
+
+    status = broker.status("i1")
+    assert (status.status, status.result) == (DONE, {"by": "w1"})
+
+
+def test_completed_item_waiting_for_retry_is_not_leased(broker):
+    broker.publish("i1", "k", {})
+    stale = broker.lease("w1", ["k"], lease_seconds=0)
+    assert broker.status("i1").status == PENDING
+
+    broker.complete(stale, {})
+    assert broker.lease("w2", ["k"]) is None
+
+
+def test_fails_after_max_attempts(broker):
+    broker.publish("i1", "k", {})
+
+    broker.fail(broker.lease("w", ["k"]), "boom")
+    assert broker.status("i1").status == PENDING
+
+    # The second attempt's lease expires instead
+    broker.lease("w", ["k"], lease_seconds=0)
+    status = broker.status("i1")
+    assert (status.status, status.attempts, status.error) == (FAILED, 2, "lease expired")
+    assert status.finished
+    assert broker.lease("w", ["k"]) is None
+
+
+def test_worker_records_results_and_failures(broker, tmp_path, monkeypatch):
+    def square(item, artifacts):
+        if item.payload["n"] < 0:
+            raise ValueError("negative")
+        return {"square": item.payload["n"] ** 2}
+
+    monkeypatch.setitem(stage_worker.STAGE_HANDLERS, "square", square)
+    worker = StageWorker(
+        broker=broker,
+        artifacts=ArtifactStore(tmp_path),
+        kinds=["square"],
+        worker_id="w",
+    )
+    broker.publish("ok", "square", {"n": 3})
+    broker.publish("bad", "square", {"n": -1})
+
+    while worker.run_once():
+        pass
+
+    assert broker.status("ok").result == {"square": 9}
+    failed = broker.status("bad")
+    assert (failed.status, failed.attempts) == (FAILED, 2)
+    assert failed.error == "ValueError: negative"
@@ -0,0 +1,86 @@
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from src.agents.structured_output import (
+    parse_structured,
+    repair_candidates,
+    response_format_for,
+)
+
+
+class _Topic(BaseModel):
+    name: str
+    score: Optional[float] = None
+
+
+class _Topics(BaseModel):
+    summary: str
+    topics: List[_Topic]
+
+
+def test_parses_valid_json_directly():
+    result = parse_structured('{"summary": "s", "topics": [{"name": "a"}]}', _Topics)
+    assert result == _Topics(summary="s", topics=[_Topic(name="a")])
+
+
+def test_strips_fences_and_prose():
+    content = (
+        "Here is the analysis:\n"
+        '```json\n{"summary": "s", "topics": []}\n```'
+    )
+    assert parse_structured(content, _Topics).summary == "s"
+
+    content = 'Sure! {"summary": "s", "topics": [],} Hope that helps.'
+    assert parse_structured(content, _Topics).topics == []
+
+
+def test_closes_truncated_string_and_containers():
+    content = '{"summary": "cut off mid-sent'
+    assert next(repair_candidates(content)) == '{"summary": "cut off mid-sent"}'
+
+    content = '{"summary": "s", "topics": [{"name": "a", "score": 0.5}, {"name": "b"'
+    result = parse_structured(content, _Topics)
+    assert [topic.name for topic in result.topics] == ["a", "b"]
+
+
+def test_falls_back_to_last_complete_element():
+    # Closing the dangling key alone still fails validation
+    content = '{"summary": "s", "topics": [{"name": "a"}, {"score": 0.9, "na'
+    result = parse_structured(content, _Topics)
+    assert [topic.name for topic in result.topics] == ["a"]
+
+
+def test_dangling_key_becomes_null():
+    content = '{"name": "a", "score":'
+    assert parse_structured(content, _Topic) == _Topic(name="a", score=None)
+
+
+def test_escaped_quotes_stay_inside_strings():
+    content = '{"summary": "he said \\"stop\\", then'
+    assert next(repair_candidates(content)) == '{"summary": "he said \\"stop\\", then"}'
+
+    # A trailing backslash would escape the closing quote
+    content = '{"summary": "path C:\\'
+    assert next(repair_candidates(content)) == '{"summary": "path C:"}'
+
+
+def test_raises_without_json():
+    with pytest.raises(ValueError, match="No JSON object"):
+        parse_structured("I could not analyse this.", _Topics)
+
+    with pytest.raises(ValidationError):
+        parse_structured('{"summary": 1', _Topics)
+
+
+def test_response_format_is_strict():
+    schema = response_format_for(_Topics)["json_schema"]["schema"]
+    topic = schema["$defs"]["_Topic"]
+
+    assert schema["required"] == ["summary", "topics"]
+    assert schema["additionalProperties"] is False
+    # Optional fields are required but stay nullable, without defaults
+    assert topic["required"] == ["name", "score"]
+    assert "default" not in topic["properties"]["score"]
+    assert "title" not in topic